@@ -4,11 +4,13 @@
 #
 # 28-Feb-13 JDK  Handle RuntimeException if Calc spreadsheet is closed.
 # 04-Mar-13 JDK  Added skipFirstRow parameter.
+# 17-Oct-26 JDK  Added outputTable().
 
 """
 Manage outputting to Calc.
 """
 import logging
+import time
 from com.sun.star.uno import RuntimeException
 
 from lingt.app import exceptions
@@ -16,39 +18,84 @@ from lingt.utils import util
 
 logger = logging.getLogger("lingt.access.spreadsheet_output")
 
+# When writing a table in blocks, aim for each block to take about this long,
+# so that the progress bar keeps moving without many extra calls.
+SECONDS_PER_BLOCK = 0.5
+ROWS_FIRST_BLOCK = 2000
+MIN_ROWS_PER_BLOCK = 100
+
 class SpreadsheetOutput:
     """Sends output to the Calc spreadsheet."""
     def __init__(self, calcUnoObjs):
         self.unoObjs = calcUnoObjs
 
     def outputToColumn(self, colLetter, stringList, skipFirstRow=True):
-        """Takes a list of strings."""
+        """Takes a list of strings.
+        All rows are written with one call, which is much faster than
+        writing each cell or a few rows at a time.
+        """
         logger.debug(util.funcName('begin'))
+        row1 = 2 if skipFirstRow else 1
+        self.outputRows(colLetter, stringList, row1)
+        logger.debug(util.funcName('end'))
 
-        chunkSize = 25  # make this value bigger or smaller for optimization
-        for i1 in range(0, len(stringList), chunkSize):
-            i2 = i1 + chunkSize - 1
-            if i2 >= len(stringList):
-                i2 = len(stringList) - 1
+    def outputRows(self, colLetter, stringList, row1):
+        """Write a list of strings to the column starting at row1.
+        Row numbers start from 1 as shown in Calc.
+        """
+        if not stringList:
+            return
+        row2 = row1 + len(stringList) - 1
+        rangeName = "%s%d:%s%d" % (colLetter, row1, colLetter, row2)
+        logger.debug(rangeName)
+        data = tuple((strval,) for strval in stringList)
+        try:
+            oRange = self.unoObjs.sheet.getCellRangeByName(rangeName)
+            oRange.setDataArray(data)
+        except RuntimeException:
+            raise exceptions.DocAccessError()
 
-            data = []
-            for i in range(i1, i2 + 1):
-                data.append((stringList[i],))
-            if skipFirstRow:
-                offset = 2  # start at second row
-            else:
-                offset = 1
-            row1 = str(i1 + offset)
-            row2 = str(i2 + offset)
-            rangeName = colLetter + row1 + ":" + colLetter + row2
-            logger.debug(rangeName)
-            logger.debug(repr(data))
-            try:
-                oRange = self.unoObjs.sheet.getCellRangeByName(rangeName)
-                oRange.setDataArray(tuple(data))
-            except RuntimeException:
-                raise exceptions.DocAccessError()
-        logger.debug(util.funcName('end'))
+    def outputTable(self, rowTuples, row1, progressCallback=None):
+        """Write rows that all have the same number of columns,
+        starting at column A.  Row numbers start from 1 as shown in Calc.
+
+        If there is no callback, all rows are written with one call.
+        Otherwise they are written in blocks sized by how long the previous
+        block took, and the callback is given the number of rows written
+        after each block.
+        """
+        if not rowTuples:
+            return
+        numCols = len(rowTuples[0])
+        if progressCallback is None:
+            blockSize = len(rowTuples)
+        else:
+            blockSize = ROWS_FIRST_BLOCK
+        row_i = 0
+        while row_i < len(rowTuples):
+            block = tuple(rowTuples[row_i : row_i + blockSize])
+            startTime = time.perf_counter()
+            self._setDataArray(block, row1 + row_i, numCols)
+            elapsed = time.perf_counter() - startTime
+            row_i += len(block)
+            if progressCallback is not None:
+                progressCallback(row_i)
+            if elapsed > 0:
+                blockSize = max(
+                    MIN_ROWS_PER_BLOCK,
+                    int(len(block) * SECONDS_PER_BLOCK / elapsed))
+
+    def _setDataArray(self, data, row1, numCols):
+        """Row numbers start from 1.
+        The RuntimeException is kept as the cause of DocAccessError.
+        """
+        logger.debug("Writing %d rows starting at row %d", len(data), row1)
+        try:
+            oRange = self.unoObjs.sheet.getCellRangeByPosition(
+                0, row1 - 1, numCols - 1, row1 + len(data) - 2)
+            oRange.setDataArray(data)
+        except RuntimeException as exc:
+            raise exceptions.DocAccessError() from exc
 
     def outputString(self, colLetter, row, strval):
         """This will probably work fine for numbers too."""
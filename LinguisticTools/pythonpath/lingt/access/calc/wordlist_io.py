@@ -6,12 +6,12 @@
 # 01-Mar-13 JDK  Fixed bug: 0-length list was selecting two (A2:A1).
 # 23-Jul-15 JDK  Refactor outputList().
 # 25-Aug-15 JDK  Fixed bug: %d does not accept a string.
+# 17-Oct-26 JDK  Write the whole list in a few large blocks.
 
 """
 Word list input and output for Calc.
 """
 import logging
-from com.sun.star.uno import RuntimeException
 
 from lingt.access.calc.spreadsheet_output import SpreadsheetOutput
 from lingt.access.calc.spreadsheet_reader import SpreadsheetReader
@@ -62,53 +62,40 @@ class WordlistIO:
         logger.debug(util.funcName('end'))
 
     def _outputList(self, wordList):
+        outputter = SpreadsheetOutput(self.listDoc)
         headingRow = 0     # first row
         numberFormat = 0     # General format
-        for colNum, heading in enumerate(self.colOrder.getTitles()):
-            cell = self.sheet.getCellByPosition(colNum, headingRow)
-            cell.setFormula("")
-            cell.setPropertyValue("NumberFormat", numberFormat)
-            cell.setString(theLocale.getText(heading))
+        titles = self.colOrder.getTitles()
+        headingRange = self.sheet.getCellRangeByPosition(
+            0, headingRow, len(titles) - 1, headingRow)
+        headingRange.setPropertyValue("NumberFormat", numberFormat)
+        headingRange.setDataArray((
+            tuple(theLocale.getText(heading) for heading in titles),))
 
         cellFreeze = self.sheet.getCellByPosition(0, 1)
         self.listDoc.controller.select(cellFreeze)
         self.unoObjs.dispatcher.executeDispatch(
             self.listDoc.frame, ".uno:FreezePanes", "", 0, ())
 
-        CHUNK_SIZE = 25  # make this value bigger or smaller for optimization
-        #CHUNK_SIZE = 1  # useful for debugging
-        for word_i1 in range(0, len(wordList), CHUNK_SIZE):
-            word_i2 = word_i1 + CHUNK_SIZE - 1
-            if word_i2 >= len(wordList):
-                word_i2 = len(wordList) - 1
-            self._fillInData(wordList, word_i1, word_i2)
-
-    def _fillInData(self, wordList, word_i1, word_i2):
-        data = []
-        for word_i in range(word_i1, word_i2 + 1):
-            word = wordList[word_i]
-            colOrd = self.colOrder  # shorthand variable name
-            colOrd.resetRowData()
-            colOrd.setRowVal('colWord', word.text)
-            colOrd.setRowVal('colOccur', word.occurrences)
-            colOrd.setRowVal('colOk', word.isCorrect_str())
-            colOrd.setRowVal('colChange', word.correction)
-            colOrd.setRowVal('colSrc', word.sources_str())
-            data.append(colOrd.getRowTuple())
-
-        row1 = word_i1 + 2  # start at second row, so index 0 is row 2
-        row2 = word_i2 + 2
-        col2 = chr(ord('A') + len(self.colOrder.COLUMNS) - 1)
-        rangeName = "A%d:%s%d" % (row1, col2, row2)
-        logger.debug("Adding %d rows to range %s", len(data), rangeName)
-        #logger.debug(repr(data))
-        oRange = self.sheet.getCellRangeByName(rangeName)
+        rowTuples = [self._rowTuple(word) for word in wordList]
+        logger.debug("Adding %d rows", len(rowTuples))
         try:
-            oRange.setDataArray(tuple(data))
-        except RuntimeException as exc:
+            outputter.outputTable(
+                rowTuples, 2, self.progressRanges.update)
+        except exceptions.DocAccessError as exc:
             raise exceptions.FileAccessError(
-                "There was a problem while writing the list.\n\n%s", exc)
-        self.progressRanges.update(word_i1)
+                "There was a problem while writing the list.\n\n%s",
+                exc.__cause__ or exc)
+
+    def _rowTuple(self, word):
+        colOrd = self.colOrder  # shorthand variable name
+        colOrd.resetRowData()
+        colOrd.setRowVal('colWord', word.text)
+        colOrd.setRowVal('colOccur', word.occurrences)
+        colOrd.setRowVal('colOk', word.isCorrect_str())
+        colOrd.setRowVal('colChange', word.correction)
+        colOrd.setRowVal('colSrc', word.sources_str())
+        return colOrd.getRowTuple()
 
     def readList(self):
         """Expects input spreadsheet to have columns generated by
@@ -0,0 +1,236 @@
+# -*- coding: Latin-1 -*-
+#
+# This file created Oct 17 2026
+
+"""
+Keep parsed linguistic examples on disk so that unchanged data files do not
+need to be parsed again in each new session.
+
+Cache files are stored in a folder in the LibreOffice user profile, one for
+each set of data files.  Each cache file records the data file sizes and
+modification times, along with any settings that affect how the files are
+read.  If anything recorded has changed, the files are simply parsed again
+and the cache file is replaced.
+
+Only plain example fields are stored, as JSON, so loading a cache file
+cannot run any code.  The least recently used files are removed when there
+are more than MAX_CACHE_FILES.
+
+This module exports:
+    ExampleCache
+    fileSignature()
+"""
+import collections
+import glob
+import hashlib
+import json
+import logging
+import os
+
+from lingt.app.data import lingex_structs
+from lingt.utils import util
+
+logger = logging.getLogger("lingt.access.example_cache")
+
+# Change this whenever the structure of the cached data changes.
+CACHE_VERSION = 2
+
+CACHE_FOLDER_NAME = "LOLT Example Cache"
+MAX_CACHE_FILES = 20
+
+PHON_FIELDS = ('refText', 'phonetic', 'phonemic', 'gloss')
+MORPH_FIELDS = ('text1', 'text2', 'gloss', 'pos')
+
+
+def fileSignature(filepath):
+    """Returns a tuple that changes whenever the file is modified,
+    or None if the file cannot be accessed.
+    """
+    try:
+        stat = os.stat(filepath)
+    except OSError:
+        return None
+    return os.path.abspath(filepath), stat.st_size, stat.st_mtime_ns
+
+
+class ExampleCache:
+    """Read examples using a FileReader, or from the cache if the reader's
+    cache key has not changed since the last time it was read.
+    """
+    def __init__(self, fileReader, cacheFolder=None):
+        """:param fileReader: a reader such as InterlinReader or PhonReader
+        that implements getCacheKey()
+        :param cacheFolder: defaults to a folder in the user profile
+        """
+        self.fileReader = fileReader
+        self.cacheKey = fileReader.getCacheKey()
+        self.cacheFolder = cacheFolder
+        if self.cacheKey is not None and cacheFolder is None:
+            self.cacheFolder = util.getUserFolder(
+                fileReader.unoObjs, CACHE_FOLDER_NAME)
+            if self.cacheFolder is None:
+                self.cacheKey = None
+
+    def read(self):
+        """Returns a tuple of three values from the reader:
+        examples dict, suggestions, and duplicate ref numbers.
+        Warnings shown while reading the files are shown again when the
+        examples come from the cache.
+        """
+        if self.cacheKey is not None:
+            cached = self._load()
+            if cached is not None:
+                result, warnings = cached
+                logger.debug("Read %d examples from cache.", len(result[0]))
+                self.fileReader.showWarnings(warnings)
+                return result
+        examplesDict = self.fileReader.read()
+        result = (
+            examplesDict,
+            self.fileReader.getSuggestions(),
+            self.fileReader.getDuplicateRefNumbers())
+        if self.cacheKey is not None:
+            self._store(result, self.fileReader.getWarnings())
+        return result
+
+    def getCacheFilepath(self):
+        """Only call this if the cache key is not None."""
+        source, dummy_details = self.cacheKey
+        keyString = repr((CACHE_VERSION, source))
+        digest = hashlib.sha1(keyString.encode('utf-8')).hexdigest()
+        return os.path.join(self.cacheFolder, digest + ".json")
+
+    def _keyString(self):
+        return repr((CACHE_VERSION, self.cacheKey))
+
+    def _load(self):
+        """Returns the cached result and warnings, or None if they could
+        not be loaded.
+        """
+        filepath = self.getCacheFilepath()
+        if not os.path.exists(filepath):
+            return None
+        if not (util.isOwnedByUser(self.cacheFolder) and
+                util.isOwnedByUser(filepath)):
+            logger.warning("Ignoring cache file %s of another user.", filepath)
+            return None
+        try:
+            with open(filepath, 'r', encoding='utf-8') as infile:
+                stored = json.load(infile)
+            if stored['key'] != self._keyString():
+                logger.debug("Cache key does not match.")
+                return None
+            result = (
+                _examplesFromJson(stored['kind'], stored['examples']),
+                list(stored['suggestions']),
+                set(stored['duplicates']))
+            warnings = [
+                (message, tuple(args))
+                for message, args in stored['warnings']]
+        except (OSError, ValueError, KeyError, TypeError) as exc:
+            logger.warning("Discarding bad cache file %s: %s", filepath, exc)
+            self._delete(filepath)
+            return None
+        try:
+            # Mark as recently used so that it is not pruned.
+            os.utime(filepath)
+        except OSError:
+            pass
+        return result, warnings
+
+    def _store(self, result, warnings):
+        """Write to a temporary file first so that an interrupted write
+        does not leave a partial cache file behind.
+        """
+        examplesDict, suggestions, duplicates = result
+        kind, examples = _examplesToJson(examplesDict)
+        stored = {
+            'key': self._keyString(),
+            'kind': kind,
+            'examples': examples,
+            'suggestions': list(suggestions),
+            'duplicates': sorted(duplicates),
+            'warnings': [
+                (message, list(args)) for message, args in warnings],
+            }
+        filepath = self.getCacheFilepath()
+        temppath = filepath + ".tmp"
+        try:
+            os.makedirs(self.cacheFolder, mode=0o700, exist_ok=True)
+            with open(temppath, 'w', encoding='utf-8') as outfile:
+                json.dump(stored, outfile)
+            os.replace(temppath, filepath)
+        except (OSError, TypeError, ValueError) as exc:
+            logger.warning("Could not write cache file %s: %s", filepath, exc)
+            self._delete(temppath)
+            return
+        self._prune()
+
+    def _prune(self):
+        """Remove the least recently used cache files."""
+        filepaths = glob.glob(os.path.join(self.cacheFolder, "*.json"))
+        if len(filepaths) <= MAX_CACHE_FILES:
+            return
+        filepaths.sort(key=_modifiedTime, reverse=True)
+        for filepath in filepaths[MAX_CACHE_FILES:]:
+            logger.debug("Removing old cache file %s", filepath)
+            self._delete(filepath)
+
+    @staticmethod
+    def _delete(filepath):
+        try:
+            os.remove(filepath)
+        except OSError:
+            pass
+
+
+def _modifiedTime(filepath):
+    try:
+        return os.path.getmtime(filepath)
+    except OSError:
+        return 0
+
+
+def _examplesToJson(examplesDict):
+    """Returns the kind of examples and a list of [key, fields] pairs."""
+    kind = 'gram'
+    examples = []
+    for key, ex in examplesDict.items():
+        if isinstance(ex, lingex_structs.LingPhonExample):
+            kind = 'phon'
+            fields = [getattr(ex, name) for name in PHON_FIELDS]
+        else:
+            fields = [
+                ex.refText,
+                ex.freeTrans,
+                [[word.text1, word.text2,
+                  [[getattr(morph, name) for name in MORPH_FIELDS]
+                   for morph in word.morphList]]
+                 for word in ex.wordList]]
+        examples.append([key, fields])
+    return kind, examples
+
+
+def _examplesFromJson(kind, examples):
+    """Inverse of _examplesToJson()."""
+    examplesDict = collections.OrderedDict()
+    for key, fields in examples:
+        if kind == 'phon':
+            ex = lingex_structs.LingPhonExample()
+            for name, value in zip(PHON_FIELDS, fields):
+                setattr(ex, name, value)
+        else:
+            ex = lingex_structs.LingGramExample()
+            ex.refText, ex.freeTrans, words = fields
+            for text1, text2, morphs in words:
+                word = lingex_structs.LingGramWord()
+                word.text1 = text1
+                word.text2 = text2
+                for morphFields in morphs:
+                    morph = lingex_structs.LingGramMorph()
+                    for name, value in zip(MORPH_FIELDS, morphFields):
+                        setattr(morph, name, value)
+                    word.morphList.append(morph)
+                ex.wordList.append(word)
+        examplesDict[key] = ex
+    return examplesDict
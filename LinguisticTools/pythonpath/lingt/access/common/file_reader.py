@@ -17,6 +17,7 @@
 # 09-Nov-12 JDK  Generalize for other file types besides XML.
 # 22-Jul-15 JDK  read() can close progressBar in finally clause.
 # 22-Jun-16 JDK  Move logger to a module variable.
+# 17-Oct-26 JDK  Allow reading without UNO objects.
 
 """
 Interface to read XML or other files.
@@ -39,14 +40,21 @@ class FileReader:
     SUPPORTED_FORMATS = []  # list of tuples of name, text description
 
     def __init__(self, unoObjs):
+        """:param unoObjs: may be None when reading in a worker process,
+        in which case there is no message box or progress bar
+        """
         if self.__class__ is FileReader:
             # The base class should not be instantiated.
             raise NotImplementedError()
         self.unoObjs = unoObjs
-        self.msgbox = MessageBox(unoObjs)
-        self.progressBar = ProgressBar(unoObjs, "Loading data...")
+        self.msgbox = None
+        self.progressBar = None
+        if unoObjs is not None:
+            self.msgbox = MessageBox(unoObjs)
+            self.progressBar = ProgressBar(unoObjs, "Loading data...")
         self.data = None  # typically a list or dict
         self.dom = None
+        self.warnings = []  # tuples of (message, args)
         self.filepath = ""
 
     @classmethod
@@ -60,6 +68,7 @@ class FileReader:
             self.progressBar.show()
             self.progressBar.updateBeginning()
             self.progressBar.updatePercent(20)
+        self.warnings = []
         self._initData()
         try:
             self._read()
@@ -88,6 +97,28 @@ class FileReader:
             raise exceptions.DataNotFoundError(
                 "Did not find any data in file %s", self.filepath)
 
+    def getCacheKey(self):
+        """For use with example_cache.ExampleCache.
+        Returns a tuple (source, details).  The source identifies which
+        files are read, and details should change whenever the data that
+        would be read changes.
+        Derived classes that do not support caching can return None.
+        """
+        return None
+
+    def getWarnings(self):
+        """Returns the warnings shown while reading, so that
+        ExampleCache can show them again when reading from the cache.
+        """
+        return self.warnings
+
+    def showWarnings(self, warnings):
+        """:param warnings: list of (message, args) from getWarnings()"""
+        for message, args in warnings:
+            self.warnings.append((message, args))
+            if self.msgbox:
+                self.msgbox.display(message, *args)
+
     def getSuggestions(self):
         """Get suggested ref numbers.  Intended for linguistic examples only,
         so derived classes are not required to override this method.
@@ -0,0 +1,86 @@
+# -*- coding: Latin-1 -*-
+#
+# This file created Oct 17 2026
+
+"""
+Run functions in worker processes, so that several files can be handled
+at the same time.
+
+Worker processes are always started with the "spawn" method.  Forking is
+not safe here, because when running inside Office it would copy the whole
+soffice process along with its UNO connections.  Spawning requires a
+python interpreter, but inside Office sys.executable is usually the Office
+program itself.  If no interpreter can be found, the caller should do the
+work in this process instead.
+
+Functions passed to the workers must be defined at module level, and
+their arguments must not refer to any UNO objects.
+
+This module exports:
+    pythonInterpreter()
+    startWorkers()
+    getWorkerResult()
+"""
+import concurrent.futures
+import logging
+import multiprocessing
+import os
+import sys
+
+logger = logging.getLogger("lingt.access.workers")
+
+
+def pythonInterpreter():
+    """Returns the path of a python interpreter that matches this process,
+    or None if there is none.
+    The Windows build of Office includes python.exe in its program folder,
+    but sys.executable there is soffice.bin.
+    """
+    executable = sys.executable or ""
+    candidates = [executable]
+    if executable:
+        folder = os.path.dirname(executable)
+        candidates.extend(
+            os.path.join(folder, name)
+            for name in ("python.exe", "python%d.%d" % sys.version_info[:2]))
+    for candidate in candidates:
+        name = os.path.basename(candidate).lower()
+        if name.startswith("python") and os.path.isfile(candidate):
+            return candidate
+    return None
+
+
+def startWorkers(func, argsList, initializer=None, initargs=()):
+    """Returns a list of futures, one for each tuple of arguments,
+    or None if worker processes could not be started.
+    """
+    interpreter = pythonInterpreter()
+    if interpreter is None:
+        logger.debug("No python interpreter for worker processes.")
+        return None
+    try:
+        context = multiprocessing.get_context("spawn")
+        if interpreter != sys.executable:
+            context.set_executable(interpreter)
+        executor = concurrent.futures.ProcessPoolExecutor(
+            max_workers=min(len(argsList), os.cpu_count() or 1),
+            mp_context=context,
+            initializer=initializer, initargs=initargs)
+        futures = [executor.submit(func, *args) for args in argsList]
+        executor.shutdown(wait=False)
+        return futures
+    except Exception as exc:
+        logger.warning("Could not start worker processes: %s", exc)
+        return None
+
+
+def getWorkerResult(future):
+    """Returns None if the worker did not finish successfully,
+    for example if it could not import a module or raised an exception.
+    The caller should then do the work in this process.
+    """
+    try:
+        return future.result()
+    except Exception as exc:
+        logger.warning("Worker process failed: %s", exc)
+        return None
@@ -17,6 +17,8 @@
 # 01-Oct-15 JDK   Try to load AddConverter().
 # 08-Oct-15 JDK   Added ErrStatus class.
 # 16-Nov-15 JDK   Raise exceptions rather than returning False.
+# 17-Oct-26 JDK   Convert many strings at once if it gives the same results.
+# 17-Oct-26 JDK   Remember results for each version of the mapping file.
 
 """
 Access SIL Encoding Converters.
@@ -26,20 +28,45 @@ On Linux the library is libecdriver.so
 This module exports:
     ConverterSettings
     SEC_wrapper
+    ConversionMemo
+    theMemo
+    useSavedMemo()
     ProcessTypeFlags
     ConvType
 """
+import collections
 import ctypes
+import json
 import logging
 import os
 import platform
+import re
 
+from lingt.access.common.example_cache import fileSignature
 from lingt.access.writer.uservars import Syncable
 from lingt.app import exceptions
 from lingt.utils import util
 
 logger = logging.getLogger("lingt.access.sec_wrapper")
 
+# Size in characters of the buffer for receiving converted strings.
+# The buffer is made larger if the result does not fit.
+MIN_OUTPUT_SIZE = 10000
+MAX_OUTPUT_SIZE = 64 * 1024 * 1024
+
+# For SEC_wrapper.convert_many().  Most converters leave newlines unchanged.
+BATCH_SEPARATOR = "\n"
+BATCH_MAX_CHARS = 100000
+# Number of strings converted both ways to check that batching gives the
+# same results as converting each string separately.
+BATCH_VERIFY_SIZE = 20
+
+# Number of results to remember in ConversionMemo.
+MEMO_MAX_SIZE = 50000
+MEMO_FOLDER_NAME = "LOLT Conversion Memo"
+MEMO_FILENAME = "memo.json"
+DESCRIPTION_SIZE = 4096
+
 
 class ConverterSettings(Syncable):
     def __init__(self, userVars):
@@ -98,6 +125,8 @@ class SEC_wrapper:
         self.funcCleanup = None
         self.loaded = False
         self.config = ConverterSettings(userVars)
+        self.canBatch = None  # for convert_many(), None if not yet verified
+        self.mappingSignature = None  # for theMemo
 
     def __del__(self):
         if self.loaded and self.funcCleanup is not None:
@@ -187,6 +216,11 @@ class SEC_wrapper:
             self.config.convName = bufConverterName.value.decode("utf-8")
         self.config.forward = c_forward.value
         self.config.normForm = c_normForm.value
+        self.canBatch = None
+        # The user may have changed the mapping since it was last picked.
+        theMemo.forget(self.config.convName)
+        self.mappingSignature = self._getMappingSignature(
+            getStringParam(self.config.convName))
         logger.debug(util.funcName('end'))
 
     def setConverter(self, newConfig=None):
@@ -210,6 +244,11 @@ class SEC_wrapper:
         status = self.funcInitConverter(c_convName, c_forward, c_normForm)
         verifyStatusOk(status)
         self.config = newConfig
+        self.canBatch = None
+        self.mappingSignature = self._getMappingSignature(c_convName)
+        if self.mappingSignature is None:
+            # The mapping may have changed since results were remembered.
+            theMemo.forget(newConfig.convName)
         logger.debug(util.funcName('end'))
 
     def addConverter(self, mappingName, converterSpec, conversionType,
@@ -258,6 +297,7 @@ class SEC_wrapper:
             c_convName, c_convSpec, c_convType, c_leftEnc, c_rightEnc,
             c_processType)
         verifyStatusOk(status)
+        theMemo.forget(mappingName)
         logger.debug(util.funcName('end'))
 
     def convert(self, sInput):
@@ -266,26 +306,309 @@ class SEC_wrapper:
         if not self.config.convName:
             raise exceptions.LogicError("No converter was specified.")
         logger.debug("Using conv name %r", self.config.convName)
-        c_convName = getStringParam(self.config.convName)
         logger.debug(repr(sInput))
+        sOutput = theMemo.get(self.memoKey(), sInput)
+        if sOutput is None:
+            c_convName = getStringParam(self.config.convName)
+            sOutput = self._convertString(c_convName, sInput)
+            theMemo.put(self.memoKey(), sInput, sOutput)
+        logger.debug(repr(sOutput))
+        logger.debug(util.funcName('end'))
+        return sOutput
+
+    def convert_many(self, inputs):
+        """Convert a list of strings with as few calls to ECDriver as
+        possible.  Strings are joined with BATCH_SEPARATOR and converted
+        together.
+
+        Converters with rules that look across line breaks may give
+        different results than converting each string separately.
+        So the first time, some of the strings are converted both ways,
+        and if the results differ, then this converter never batches.
+        Also if the converter does not give back the same number of
+        separators, then that batch is converted one string at a time.
+
+        Results already in theMemo are not converted again.
+
+        :param inputs: list of strings
+        :returns: list of converted unicode strings in the same order
+        """
+        logger.debug(util.funcName('begin', args=len(inputs)))
+        if not self.config.convName:
+            raise exceptions.LogicError("No converter was specified.")
+        memoKey = self.memoKey()
+        results = {}
+        for sInput in inputs:
+            if sInput not in results:
+                results[sInput] = theMemo.get(memoKey, sInput)
+        toConvert = [
+            sInput for sInput, sOutput in results.items() if sOutput is None]
+        for sInput, sOutput in zip(toConvert, self._convertMany(toConvert)):
+            results[sInput] = sOutput
+            theMemo.put(memoKey, sInput, sOutput)
+        logger.debug(util.funcName('end'))
+        return [results[sInput] for sInput in inputs]
+
+    def memoKey(self):
+        """Identifies the converter for theMemo."""
+        return self.config.attrs(), self.mappingSignature
+
+    def _getMappingSignature(self, c_convName):
+        """The converter description includes its identifier, which for
+        converters such as TECkit is the path of the mapping file.
+        :returns: a tuple that changes when the mapping file is modified,
+            or None if the mapping cannot be identified
+        """
+        if self.funcDescription is None or c_convName is None:
+            return None
+        bufDescription = createBuffer(DESCRIPTION_SIZE)
+        status = self.funcDescription(
+            c_convName, bufDescription, ctypes.c_int(DESCRIPTION_SIZE))
+        if status != ErrStatus.NoError:
+            return None
+        description = bufDescription.value
+        if platform.system() != "Windows":
+            description = description.decode("utf-8", errors='replace')
+        match = re.search(r"Identifier: '([^']*)'", description)
+        if not match:
+            logger.debug("Could not identify mapping of %s.", c_convName)
+            return None
+        identifier = match.group(1)
+        # Converters that are not from a file, such as ICU transliterators,
+        # are identified by name only.
+        return fileSignature(identifier) or (identifier,)
+
+    def _convertMany(self, inputs):
+        c_convName = getStringParam(self.config.convName)
+        outputs = []
+        for batch in makeBatches(inputs):
+            if len(batch) > 1 and self.canBatch is None:
+                sample = batch[:BATCH_VERIFY_SIZE]
+                outputs.extend(self._verifyBatching(c_convName, sample))
+                batch = batch[len(sample):]
+            results = None
+            if len(batch) > 1 and self.canBatch:
+                results = self._convertBatch(c_convName, batch)
+                if results is None:
+                    self.canBatch = False
+            if results is None:
+                results = [self._convertString(c_convName, sInput)
+                           for sInput in batch]
+            outputs.extend(results)
+        return outputs
+
+    def _convertBatch(self, c_convName, batch):
+        """:returns: list of results, or None if the converter did not
+        give back the same number of separators
+        """
+        sOutput = self._convertString(
+            c_convName, BATCH_SEPARATOR.join(batch))
+        results = sOutput.split(BATCH_SEPARATOR)
+        if len(results) != len(batch):
+            logger.debug("Separator not preserved by converter.")
+            return None
+        return results
+
+    def _verifyBatching(self, c_convName, sample):
+        """Set self.canBatch by comparing the results of converting the
+        sample together and separately.
+        :returns: list of results of converting separately
+        """
+        batchResults = self._convertBatch(c_convName, sample)
+        results = [
+            self._convertString(c_convName, sInput) for sInput in sample]
+        self.canBatch = batchResults == results
+        if not self.canBatch:
+            logger.debug(
+                "Converting together gives different results, "
+                "so strings will be converted one at a time.")
+        return results
+
+    def _convertString(self, c_convName, sInput):
+        """Call ECDriver.  If the output may not have fit in the buffer,
+        then try again with a larger buffer.
+        """
         c_input = getStringParam(sInput)
         if c_input is None:
             raise exceptions.DataNotFoundError("No conversion result.")
-        # ECDriver will truncate the result if we go over this amount.
-        c_outSize = ctypes.c_int(10000)
-        bufOutput = createBuffer(c_outSize.value)
-        logger.debug("Calling ConvertString using %s.", self.config.convName)
-        status = self.funcConvertString(
-            c_convName, c_input, bufOutput, c_outSize)
+        # ECDriver will truncate the result if we go over this amount,
+        # so leave plenty of room for output that is longer than the input.
+        outSize = max(MIN_OUTPUT_SIZE, len(sInput) * 4 + 1)
+        while True:
+            c_outSize = ctypes.c_int(outSize)
+            bufOutput = createBuffer(outSize)
+            logger.debug(
+                "Calling ConvertString using %s.", self.config.convName)
+            status = self.funcConvertString(
+                c_convName, c_input, bufOutput, c_outSize)
+            sOutput = bufOutput.value
+            bufferFilled = (
+                status in (ErrStatus.OutputBufferFull,
+                           ErrStatus.NotEnoughBuffer)
+                or (status == ErrStatus.NoError
+                    and len(sOutput) >= outSize - 1))
+            if not bufferFilled:
+                break
+            if outSize >= MAX_OUTPUT_SIZE:
+                logger.warning("Conversion result may be truncated.")
+                if status == ErrStatus.OutputBufferFull:
+                    status = ErrStatus.NoError
+                break
+            outSize = min(outSize * 2, MAX_OUTPUT_SIZE)
+            logger.debug("Trying again with buffer size %d.", outSize)
         verifyStatusOk(status)
-        sOutput = bufOutput.value
         if platform.system() != "Windows":
             sOutput = sOutput.decode("utf-8")
-        logger.debug(repr(sOutput))
-        logger.debug(util.funcName('end'))
         return sOutput
 
 
+class ConversionMemo:
+    """Remember recent conversion results so that the same string does not
+    need to be converted more than once.
+    Keys are SEC_wrapper.memoKey() and input string.
+    The memo key includes the modification time of the mapping file, so
+    results are not reused after the mapping file is changed.
+    When full, the least recently used results are discarded.
+    """
+    def __init__(self, maxSize=MEMO_MAX_SIZE):
+        self.maxSize = maxSize
+        self.results = collections.OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.loadedFromDisk = False
+        self.filepath = None
+
+    def get(self, memoKey, sInput):
+        """:returns: converted string, or None if not found"""
+        key = memoKey, sInput
+        sOutput = self.results.get(key)
+        if sOutput is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.results.move_to_end(key)
+        return sOutput
+
+    def put(self, memoKey, sInput, sOutput):
+        key = memoKey, sInput
+        self.results[key] = sOutput
+        self.results.move_to_end(key)
+        while len(self.results) > self.maxSize:
+            self.results.popitem(last=False)
+
+    def forget(self, convName):
+        """Remove all results for the specified converter name."""
+        for key in list(self.results):
+            (attrs, dummy_signature), dummy_input = key
+            if attrs[0] == convName:
+                del self.results[key]
+
+    def clear(self):
+        self.results.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def logStats(self):
+        logger.info(
+            "Conversion memo: %d hits, %d misses, %d results stored.",
+            self.hits, self.misses, len(self.results))
+
+    def load(self, filepath):
+        """Read results saved from a previous session.
+        The file is a JSON list of [attrs, signature, input, output]
+        entries.
+        A file that cannot be read is ignored.
+        """
+        self.loadedFromDisk = True
+        self.filepath = filepath
+        if not os.path.exists(filepath):
+            return
+        if not util.isOwnedByUser(filepath):
+            logger.warning("Ignoring %s of another user.", filepath)
+            return
+        results = collections.OrderedDict()
+        try:
+            with open(filepath, 'r', encoding='utf-8') as infile:
+                for attrs, signature, sInput, sOutput in json.load(infile):
+                    memoKey = tuple(attrs), tuple(signature)
+                    results[memoKey, sInput] = sOutput
+        except (OSError, ValueError, TypeError) as exc:
+            logger.warning("Could not read %s: %s", filepath, exc)
+            return
+        results.update(self.results)
+        self.results = results
+        while len(self.results) > self.maxSize:
+            self.results.popitem(last=False)
+        logger.debug("Loaded %d results.", len(self.results))
+
+    def save(self):
+        """Write results to the file they were loaded from.
+        Results of converters whose mapping could not be identified are
+        not saved, because they may not be correct in a later session.
+        """
+        if self.filepath is None:
+            return
+        temppath = self.filepath + ".tmp"
+        entries = [
+            [attrs, signature, sInput, sOutput]
+            for ((attrs, signature), sInput), sOutput in self.results.items()
+            if signature is not None]
+        try:
+            with open(temppath, 'w', encoding='utf-8') as outfile:
+                json.dump(entries, outfile)
+            os.replace(temppath, self.filepath)
+        except (OSError, TypeError, ValueError) as exc:
+            logger.warning("Could not write %s: %s", self.filepath, exc)
+
+
+# Shared by all SEC_wrapper objects.
+theMemo = ConversionMemo()
+
+
+def useSavedMemo(userVars, unoObjs):
+    """Load results from previous sessions if the user has turned on
+    this option.  It is off unless this hidden user variable is set to 1
+    manually.  The results are saved in the LibreOffice user profile.
+    :returns: True if theMemo should be saved after converting
+    """
+    varname = 'SaveConversions'
+    if userVars.isEmpty(varname):
+        userVars.store(varname, "0")  # make sure it exists
+        return False
+    if not userVars.getInt(varname):
+        return False
+    if not theMemo.loadedFromDisk:
+        folder = util.getUserFolder(unoObjs, MEMO_FOLDER_NAME)
+        if folder is None:
+            return False
+        theMemo.load(os.path.join(folder, MEMO_FILENAME))
+    return True
+
+
+def makeBatches(inputs):
+    """Split inputs into lists that can each be converted in one call.
+    Strings that contain the separator must be converted by themselves.
+    """
+    batch = []
+    batchLen = 0
+    for sInput in inputs:
+        if BATCH_SEPARATOR in sInput:
+            if batch:
+                yield batch
+                batch = []
+                batchLen = 0
+            yield [sInput]
+            continue
+        if batch and batchLen + len(sInput) > BATCH_MAX_CHARS:
+            yield batch
+            batch = []
+            batchLen = 0
+        batch.append(sInput)
+        batchLen += len(sInput) + len(BATCH_SEPARATOR)
+    if batch:
+        yield batch
+
+
 class ErrStatus:
     """Possible values for error codes.
     Values taken from ECInterfaces.cs.
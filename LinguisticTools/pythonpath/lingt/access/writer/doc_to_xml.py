@@ -3,14 +3,27 @@
 # This file created June 22 2015 by Jim Kornelsen
 #
 # 16-Dec-15 JDK  Fixed bug: pass proper arguments to OdtConverter.
+# 17-Oct-26 JDK  Read and write zip members in memory instead of a folder.
+# 17-Oct-26 JDK  Read and change several files in worker processes.
 
 """
 Does the following so that ODT files can be read and modified as XML:
 - Save files such as .rtf and .doc into .odt format.
-- Unzip .odt XML files into a (temporary) folder inside destination folder.
-- Zip back into .odt
+- Read content.xml and styles.xml from the .odt file into memory.
+- Write a new .odt with the changed XML files, copying the other files
+  such as images from the original.
 Actual reading and modifying of the XML is done in the odt_converter module.
+
+When there are several files, the XML can be read and changed in worker
+processes, because that does not require UNO.  Saving into .odt format is
+always done in this process.
+
+This module exports:
+    DocToXml
+    readAll()
+    changeAll()
 """
+import copy
 import logging
 import os
 import shutil
@@ -20,6 +33,7 @@ import uno
 from com.sun.star.task import ErrorCodeIOException
 from com.sun.star.util import CloseVetoException
 
+from lingt.access.common import workers
 from lingt.access.writer import doc_reader
 from lingt.access.xml.odt_converter import OdtReader, OdtChanger
 from lingt.app import exceptions
@@ -27,6 +41,13 @@ from lingt.utils import util
 
 logger = logging.getLogger("lingt.access.DocToXml")
 
+# Files in the .odt that may be changed.
+XML_FILENAMES = ('content.xml', 'styles.xml')
+
+# Starting worker processes takes some time,
+# so only do it when there are enough files.
+PARALLEL_MIN_FILES = 4
+
 class DocToXml:
 
     SUPPORTED_FORMATS = [
@@ -41,8 +62,7 @@ class DocToXml:
         self.scopeType = scopeType
         self.progressRange = progressRange
         self.progressRange_partNum = 0
-        self.tempDir = ""
-        self.tempBaseDir = ""
+        self.tempBaseDir = os.path.join(self.outdir, 'LOLT Converted Files')
         self.odt_reader = None
 
     def read(self):
@@ -51,66 +71,42 @@ class DocToXml:
         Tries to overcome several zipfile reading exceptions that may occur.
         """
         logger.debug(util.funcName('begin'))
-        try:
-            self.make_temp_dir()
-        except exceptions.FileAccessError as exc:
-            self.msgbox.displayExc(exc)
-            return list()
         data = None
         self.progressRange_partNum = 0
         try:
             data = self.readFile()
-        except zipfile.BadZipFile as exc:
+        except (zipfile.BadZipFile, exceptions.FileAccessError) as exc:
+            if not needsOdtConversion(exc):
+                raise exc
             logger.warning(exc)
             self.convert_to_odt()
             data = self.readFile()
-        except exceptions.FileAccessError as exc:
-            if exc.msg.startswith("Error reading file"):
-                logger.warning(exc)
-                self.convert_to_odt()
-                data = self.readFile()
-            else:
-                raise exc
         except FileNotFoundError as exc:
             raise exceptions.FileAccessError(str(exc))
-        #self.cleanup()
         logger.debug(util.funcName('end'))
         return data
 
     def make_temp_dir(self):
-        """Make temporary directory to extract .odt file contents."""
-        self.tempBaseDir = os.path.join(self.outdir, 'LOLT Converted Files')
+        """Make temporary directory to save converted .odt files."""
         if not os.path.exists(self.tempBaseDir):
             try:
                 os.makedirs(self.tempBaseDir)
             except OSError:
                 raise exceptions.FileAccessError(
                     "Could not create temporary folder %s", self.tempBaseDir)
-        MAX_FOLDERS = 1000
-        for folderNum in range(1, MAX_FOLDERS):
-            tempDirCandidate = os.path.join(self.tempBaseDir, "%03d" % folderNum)
-            if not os.path.exists(tempDirCandidate):
-                self.tempDir = tempDirCandidate
-                break
-        if not self.tempDir:
-            raise exceptions.FileAccessError(
-                "Too many temporary folders in %s.", self.tempBaseDir)
-        try:
-            os.mkdir(self.tempDir)
-        except OSError:
-            raise exceptions.FileAccessError(
-                "Could not create temporary folder %s", self.tempDir)
 
     def incrementProgressPart(self):
         self.progressRange_partNum += 1
         self.progressRange.updatePart(self.progressRange_partNum)
 
     def readFile(self):
-        with zipfile.ZipFile(self.fileconfig.filepath, 'r') as zipper:
-            zipper.extractall(self.tempDir)
+        """Only the XML files are read.  The other files in the .odt are
+        copied from the original when writing changes.
+        """
+        xmlFiles = loadXmlFiles(self.fileconfig.filepath)
         self.incrementProgressPart()
         self.odt_reader = OdtReader(
-            self.tempDir, self.scopeType, self.unoObjs)
+            None, self.scopeType, self.unoObjs, xmlFiles)
         return self.odt_reader.read()
 
     def convert_to_odt(self):
@@ -119,6 +115,7 @@ class DocToXml:
         self.incrementProgressPart()
         basename = os.path.basename(self.fileconfig.filepath)
         name, dummy_ext = os.path.splitext(basename)
+        self.make_temp_dir()
         newpath = os.path.join(self.tempBaseDir, name + "_converted.odt")
         if os.path.exists(newpath):
             logger.warning("File already exists: %s", newpath)
@@ -147,10 +144,15 @@ class DocToXml:
         self.incrementProgressPart()
         logger.debug(util.funcName('end'))
 
-    def makeChanges(self, fontChanges):
+    def makeChanges(self, fontChanges, resultFilepath=None):
+        """Returns the number of changes made.
+        :param resultFilepath: where to write the changed file,
+            or None to choose a new name in the destination folder
+        """
         logger.debug(util.funcName('begin'))
         if not self.odt_reader:
-            logger.warning("No odt_reader.")
+            # The file was read in a worker process.
+            self.readFile()
         changer = OdtChanger(self.odt_reader, fontChanges)
         numChanges = changer.makeChanges()
         if numChanges == 0:
@@ -158,45 +160,196 @@ class DocToXml:
 
         ## Zip the XML files back into a single ODT file
 
-        resultFilepath = ""
-        MAX_TRIES = 1000
-        for fileNum in range(1, MAX_TRIES):
-            basename, extension = os.path.splitext(
-                os.path.basename(self.fileconfig.filepath))
-            filename = "%s_%03d%s" % (basename, fileNum, extension)
-            resultCandidate = os.path.join(self.outdir, filename)
-            if not os.path.exists(resultCandidate):
-                resultFilepath = resultCandidate
-                break
+        if resultFilepath is None:
+            resultFilepath = self.getResultFilepath()
         if not resultFilepath:
-            self.msgbox.display(
-                "Too many files named like %s.", resultCandidate)
             return 0
         logger.debug("Writing to file %s", resultFilepath)
-        zipper = zipfile.ZipFile(resultFilepath, 'w')
-        for abs_path, rel_path in paths_to_all_files(self.tempDir):
-            zipper.write(abs_path, rel_path)
-        zipper.close()
+        try:
+            write_odt(
+                self.fileconfig.filepath, resultFilepath,
+                self.odt_reader.xmlFiles)
+        except (OSError, zipfile.BadZipFile) as exc:
+            raise exceptions.FileAccessError(
+                "Error writing file %s\n\n%s", resultFilepath, exc)
         logger.debug(util.funcName('end'))
         return numChanges
 
-    def cleanup(self):
-        try:
-            if self.tempDir:
-                shutil.rmtree(self.tempDir)
-                #os.rmdir(self.tempDir)
-        except OSError:
-            logger.warning("Failed to delete %s", self.tempDir)
+    def getResultFilepath(self, reserved=()):
+        """Returns a path in the destination folder that is not yet used,
+        or an empty string if there are too many similar names.
+        :param reserved: paths that will be used by other files
+        """
+        MAX_TRIES = 1000
+        basename, extension = os.path.splitext(
+            os.path.basename(self.fileconfig.filepath))
+        for fileNum in range(1, MAX_TRIES):
+            filename = "%s_%03d%s" % (basename, fileNum, extension)
+            resultCandidate = os.path.join(self.outdir, filename)
+            if (not os.path.exists(resultCandidate)
+                    and resultCandidate not in reserved):
+                return resultCandidate
+        self.msgbox.display("Too many files named like %s.", resultCandidate)
+        return ""
 
 
-def paths_to_all_files(infolder):
-    """Gets all files in the tree of the given directory.
-    Returns list of tuples (absoulte path, path relative to infolder).
+def needsOdtConversion(exc):
+    """Returns True if the exception from reading a file means that it
+    should be saved into .odt format and then read again.
     """
-    results = []
-    for root, dummy_dirs, filenames in os.walk(infolder):
-        for filename in filenames:
-            abs_path = os.path.join(root, filename)
-            rel_path = os.path.relpath(abs_path, infolder)
-            results.append((abs_path, rel_path))
-    return results
+    if isinstance(exc, zipfile.BadZipFile):
+        return True
+    return (isinstance(exc, exceptions.FileAccessError)
+            and exc.msg.startswith("Error reading file"))
+
+
+def loadXmlFiles(filepath):
+    """Returns a dict of the contents of the .odt XML files that may be
+    changed, keyed by name.
+    Raises zipfile.BadZipFile if the file is not in .odt format.
+    """
+    xmlFiles = {}
+    with zipfile.ZipFile(filepath, 'r') as zipper:
+        names = zipper.namelist()
+        for filename in XML_FILENAMES:
+            if filename in names:
+                xmlFiles[filename] = zipper.read(filename)
+    return xmlFiles
+
+
+def write_odt(srcpath, destpath, xmlFiles):
+    """Copy the .odt file at srcpath to destpath, replacing the contents
+    of any files in xmlFiles.
+    Members keep their original order and compression,
+    so for example the mimetype file stays first and uncompressed.
+    """
+    with zipfile.ZipFile(srcpath, 'r') as zipIn, \
+            zipfile.ZipFile(destpath, 'w') as zipOut:
+        for info in zipIn.infolist():
+            outInfo = zipfile.ZipInfo(info.filename, info.date_time)
+            outInfo.compress_type = info.compress_type
+            outInfo.external_attr = info.external_attr
+            if info.filename in xmlFiles:
+                zipOut.writestr(outInfo, xmlFiles[info.filename])
+            else:
+                with zipIn.open(info) as fileIn, \
+                        zipOut.open(outInfo, 'w') as fileOut:
+                    shutil.copyfileobj(fileIn, fileOut)
+
+
+def readAll(fileEditors):
+    """Yields the data read by each DocToXml object, in order.
+    If there are enough files, they are read in worker processes.
+    Any file that could not be read there, for example because it needs to
+    be saved into .odt format first, is then read in this process.
+    """
+    futures = None
+    if canUseWorkers(fileEditors):
+        futures = workers.startWorkers(
+            scanOdt,
+            [(fileEditor.fileconfig.filepath, fileEditor.scopeType)
+             for fileEditor in fileEditors])
+    if futures is None:
+        for fileEditor in fileEditors:
+            yield fileEditor.read()
+        return
+    for fileEditor, future in zip(fileEditors, futures):
+        data = workers.getWorkerResult(future)
+        if data is None:
+            data = fileEditor.read()
+        yield data
+
+
+def changeAll(fileEditors, styleChanges):
+    """Yields the number of changes made to each file, in order.
+    If there are enough files, they are changed in worker processes.
+    """
+    futures = None
+    if canUseWorkers(fileEditors):
+        resultFilepaths = []
+        for fileEditor in fileEditors:
+            resultFilepaths.append(
+                fileEditor.getResultFilepath(resultFilepaths))
+        futures = workers.startWorkers(
+            rewriteOdt,
+            [(fileEditor.fileconfig.filepath, resultFilepath,
+              fileEditor.scopeType)
+             for fileEditor, resultFilepath in zip(
+                 fileEditors, resultFilepaths)],
+            initializer=setWorkerStyleChanges,
+            initargs=([styleChangeForWorker(styleChange)
+                       for styleChange in styleChanges],))
+    if futures is None:
+        for fileEditor in fileEditors:
+            yield fileEditor.makeChanges(styleChanges)
+        return
+    for fileEditor, resultFilepath, future in zip(
+            fileEditors, resultFilepaths, futures):
+        if not resultFilepath:
+            yield 0
+            continue
+        numChanges = workers.getWorkerResult(future)
+        if numChanges is None:
+            numChanges = fileEditor.makeChanges(styleChanges, resultFilepath)
+        yield numChanges
+
+
+def canUseWorkers(fileEditors):
+    """Worker processes need a python interpreter, which may not be
+    available when running inside Office.
+    """
+    if len(fileEditors) < PARALLEL_MIN_FILES or (os.cpu_count() or 1) < 2:
+        return False
+    return workers.pythonInterpreter() is not None
+
+
+def styleChangeForWorker(styleChange):
+    """Returns a copy without UNO objects such as user variables,
+    so that it can be sent to a worker process.
+    """
+    newChange = copy.copy(styleChange)
+    newChange.userVars = None
+    newChange.converter = None
+    newChange.styleItem = copy.copy(styleChange.styleItem)
+    newChange.styleItem.change = None
+    newChange.styleItem.inputData = []
+    return newChange
+
+
+# Set in each worker process, so that the changes are only sent once to
+# each process rather than once for each file.
+workerStyleChanges = []
+
+def setWorkerStyleChanges(styleChanges):
+    global workerStyleChanges
+    workerStyleChanges = styleChanges
+
+
+def scanOdt(filepath, scopeType):
+    """Returns a list of ProcessingStyleItem,
+    or None if the file could not be read without UNO.
+    This is called in a worker process.
+    """
+    try:
+        reader = OdtReader(None, scopeType, None, loadXmlFiles(filepath))
+        return reader.read()
+    except (exceptions.LingtError, zipfile.BadZipFile, OSError) as exc:
+        logger.debug("Could not read %s in worker: %s", filepath, exc)
+        return None
+
+
+def rewriteOdt(srcpath, destpath, scopeType):
+    """Returns the number of changes made,
+    or None if the file could not be changed without UNO.
+    This is called in a worker process.
+    """
+    try:
+        reader = OdtReader(None, scopeType, None, loadXmlFiles(srcpath))
+        reader.read()
+        numChanges = OdtChanger(reader, workerStyleChanges).makeChanges()
+        if numChanges > 0:
+            write_odt(srcpath, destpath, reader.xmlFiles)
+        return numChanges
+    except (exceptions.LingtError, zipfile.BadZipFile, OSError) as exc:
+        logger.debug("Could not change %s in worker: %s", srcpath, exc)
+        return None
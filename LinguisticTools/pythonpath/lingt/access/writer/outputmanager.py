@@ -24,6 +24,7 @@ from com.sun.star.uno import RuntimeException
 
 from lingt.access.writer.frames import InterlinFrames
 from lingt.access.writer.tables import OuterTable, InterlinTables
+from lingt.access.writer.textwidth import TextWidths
 from lingt.app import exceptions
 from lingt.app.data import lingex_structs
 from lingt.ui.common.messagebox import MessageBox
@@ -191,6 +192,7 @@ class InterlinMgr(ExampleManager):
     def __init__(self, unoObjs, styles):
         ExampleManager.__init__(self, unoObjs, styles)
         self.outerTable = None
+        self.textWidths = TextWidths(unoObjs, styles)
 
     def setConfig(self, config):
         """config should be of type lingex_structs.InterlinOutputSettings."""
@@ -198,7 +200,6 @@ class InterlinMgr(ExampleManager):
 
     def insertEx(self, ex, updatingEx):
         """ex is of type LingGramExample"""
-        oVC = self.unoObjs.viewcursor   # shorthand variable name
         self.outerTable = OuterTable(
             self.unoObjs, self.config, self.exnumRanges, updatingEx,
             self.styles)
@@ -209,42 +210,30 @@ class InterlinMgr(ExampleManager):
         logger.debug("Adding %d words.", len(ex.wordList))
         if self.config.methodTables:
             interlinTables = InterlinTables(
-                self.config, self.outerTable, self.unoObjs)
-            for word in ex.wordList:
-                interlinTables.addWordData(word)
+                self.config, self.outerTable, self.unoObjs, self.textWidths)
+            interlinTables.addWords(ex.wordList)
             interlinTables.cleanupMarkers()
             self.outerTable.resize()
         elif self.config.methodFrames:
-            frame_count = 0
             interlinFrames = InterlinFrames(
                 self.config, self.outerTable, self.unoObjs)
-            insertedNewlineRanges = []
-            for word in ex.wordList:
-                frame_count = self._addFrameData(
-                    word, interlinFrames, frame_count, insertedNewlineRanges)
-            if len(ex.wordList) == 1:
-                interlinFrames.insertInnerTempSpace(useOuterTable=True)
-
-            ## Now remove the extra newlines we inserted
-
-            logger.debug("Removing any extra newlines.")
+            # Inserting a lot of frames in one paragraph is very slow if
+            # the paragraph gets laid out again after each frame, so lay
+            # out all of the frames together after they are inserted.
+            self.unoObjs.document.addActionLock()
+            try:
+                for word in ex.wordList:
+                    self._addFrameData(word, interlinFrames)
+                if len(ex.wordList) == 1:
+                    interlinFrames.insertInnerTempSpace(useOuterTable=True)
+            finally:
+                self.unoObjs.document.removeActionLock()
             self.outerTable.resize()
-            originalRange = oVC.getStart()
-            for txtRange in insertedNewlineRanges:
-                oVC.gotoRange(txtRange, False)
-                # Note: IsAutoHeight of the outer table should be True
-                # before calling uno:SwBackspace.
-                self.unoObjs.dispatcher.executeDispatch(
-                    self.unoObjs.frame, ".uno:SwBackspace", "", 0, ())
-            oVC.gotoRange(originalRange, False)
 
         self._addFT_and_ref(ex)
 
-    def _addFrameData(self, word, interlinFrames, frame_count,
-                      insertedNewlineRanges):
-        INSERT_AFTER = 30  # insert a newline after so many frames
+    def _addFrameData(self, word, interlinFrames):
         interlinFrames.createOuterFrame()
-        frame_count += 1
         logger.debug("Adding %d morphemes.", len(word.morphList))
         isFirstMorph = True
         for morph in word.morphList:
@@ -253,20 +242,9 @@ class InterlinMgr(ExampleManager):
             wordOneMorph.text2 = word.text2
             wordOneMorph.morph = morph
             interlinFrames.insertInnerFrameData(wordOneMorph, isFirstMorph)
-            frame_count += 1
             isFirstMorph = False
         if len(word.morphList) == 1:
             interlinFrames.insertInnerTempSpace(useOuterTable=False)
-        if frame_count >= INSERT_AFTER:
-            ## Insert a newline because if there are a lot of
-            ## frames without newlines, then inserting frames
-            ## becomes very slow.
-            logger.debug("Temporarily adding a newline.")
-            self.outerTable.text.insertControlCharacter(
-                self.outerTable.cursor, PARAGRAPH_BREAK, 0)
-            insertedNewlineRanges.append(self.outerTable.cursor.getEnd())
-            frame_count = 0
-        return frame_count
 
     def _addFT_and_ref(self, ex):
         """
@@ -32,6 +32,8 @@ Performs searches for data in the writer document.
 """
 import logging
 import re
+from com.sun.star.beans import UnknownPropertyException
+from com.sun.star.uno import RuntimeException
 
 from lingt.access.common import iteruno
 from lingt.access.writer.traveler import VCLocation
@@ -58,30 +60,20 @@ class ExampleSearch:
         """Find a #abc123 tag in the document that should be replaced."""
         logger.debug(util.funcName('begin'))
 
-        ## Set up the search
-
-        if self.search is None:
-            self.search = self.unoObjs.document.createSearchDescriptor()
-            self.search.SearchRegularExpression = True
-            self.search.SearchString = \
-                r"#[a-zA-Z0-9][a-zA-Z0-9\._\-]*[a-zA-Z0-9][:space:]*"
-
         ## Do the search
 
         found = None
         if startFromBeginning:
-            found = self.unoObjs.document.findFirst(self.search)
+            found = self.unoObjs.document.findFirst(self._refNumberSearch())
         else:
             found = self.unoObjs.document.findNext(
-                self.unoObjs.viewcursor.getEnd(), self.search)
+                self.unoObjs.viewcursor.getEnd(), self._refNumberSearch())
 
         ## Results
 
         if found:
             logger.debug("Found %s.", found.String)
-            self.unoObjs.controller.select(found)
-            self.foundSomething = True
-            self.foundString = found.String
+            self.selectFound(found)
         else:
             if self.foundSomething:
                 message = "No more reference numbers found."
@@ -99,6 +91,32 @@ class ExampleSearch:
                 self.msgbox.display(message)
             self.foundString = None
 
+    def findAllRefNumbers(self):
+        """Find all #abc123 tags in the document with a single search.
+        Returns a list of the ranges found, in document order.
+        """
+        logger.debug(util.funcName('begin'))
+        selsFound = self.unoObjs.document.findAll(self._refNumberSearch())
+        foundRanges = list(iteruno.byIndex(selsFound))
+        logger.debug("Found %d ref numbers.", len(foundRanges))
+        if not foundRanges:
+            self.msgbox.display("Did not find a reference number.")
+        return foundRanges
+
+    def selectFound(self, found):
+        """Select a range that was found, and remember its string."""
+        self.unoObjs.controller.select(found)
+        self.foundSomething = True
+        self.foundString = found.String
+
+    def _refNumberSearch(self):
+        if self.search is None:
+            self.search = self.unoObjs.document.createSearchDescriptor()
+            self.search.SearchRegularExpression = True
+            self.search.SearchString = \
+                r"#[a-zA-Z0-9][a-zA-Z0-9\._\-]*[a-zA-Z0-9][:space:]*"
+        return self.search
+
     def findRefCharStyle(self, charStyleName, startFromBeginning,
                          findingAll=False):
         """Find text set to reference character style.  Probably it is there
@@ -276,21 +294,34 @@ class AbbrevSearch:
         logger.debug("AbbrevSearch init() finished")
 
     def findOccurrences(self, abbrevList):
-        """Modifies abbrevList."""
+        """Modifies abbrevList.
+        Rather than searching the document once for each abbreviation,
+        read the text once and count all abbreviations in it.
+        """
         progressBar = ProgressBar(self.unoObjs, "Searching for occurrences...")
         progressBar.show()
         progressBar.updateBeginning()
-        progressRange = ProgressRange(ops=len(abbrevList), pbar=progressBar)
-        for itemPos in range(0, len(abbrevList)):
-            search = self.unoObjs.document.createSearchDescriptor()
-            search.SearchString = abbrevList[itemPos].abbrevText
-            search.SearchCaseSensitive = False
-            search.SearchWords = True
-
-            selectionsFound = self.unoObjs.document.findAll(search)
-            occurrences = selectionsFound.getCount()
+        counter = WholeWordCounter(
+            [abbrevList[itemPos].abbrevText
+             for itemPos in range(0, len(abbrevList))])
+        readRange = ProgressRange(
+            start=20, stop=70, ops=paragraphCount(self.unoObjs.document),
+            pbar=progressBar)
+        paragraphStrings = []
+        for parString in documentStrings(self.unoObjs):
+            paragraphStrings.append(parString)
+            if len(paragraphStrings) % PARAGRAPHS_PER_BATCH == 0:
+                readRange.update(len(paragraphStrings))
+        numBatches = -(-len(paragraphStrings) // PARAGRAPHS_PER_BATCH)
+        progressRange = ProgressRange(
+            start=70, stop=90, ops=numBatches, pbar=progressBar)
+        for batchNum in range(0, numBatches):
+            batchStart = batchNum * PARAGRAPHS_PER_BATCH
+            counter.countIn("\n".join(
+                paragraphStrings[batchStart:batchStart + PARAGRAPHS_PER_BATCH]))
+            progressRange.update(batchNum)
+        for itemPos, occurrences in enumerate(counter.getCounts()):
             abbrevList.setOccurrences(itemPos, occurrences)
-            progressRange.update(itemPos)
         progressBar.updateFinishing()
         progressBar.close()
 
@@ -371,3 +402,94 @@ class AbbrevSearch:
             logger.debug("Adding to alreadyAskedList")
             self.alreadyAskedList.append(word.lower())
             self.possibilities.append(word)
+
+
+PARAGRAPHS_PER_BATCH = 200
+
+class WholeWordCounter:
+    """Count case-insensitive whole word occurrences of several strings,
+    like a findAll() for each string with SearchWords set.
+
+    Strings that are a single word are counted in one pass by a compiled
+    alternation pattern.  Other strings such as "PL.AN" may overlap with
+    each other, so each one is counted separately.
+    """
+    WORD = re.compile(r"\w+")
+
+    def __init__(self, searchStrings):
+        self.searchStrings = searchStrings
+        self.counts = dict()
+        self.otherPatterns = dict()
+        singleWords = set()
+        for searchString in searchStrings:
+            key = searchString.lower()
+            if not key or key in self.counts:
+                continue
+            self.counts[key] = 0
+            if self.WORD.fullmatch(key):
+                singleWords.add(key)
+            else:
+                self.otherPatterns[key] = re.compile(
+                    r"(?<!\w)" + re.escape(key) + r"(?!\w)")
+        self.singleWordPattern = None
+        if singleWords:
+            self.singleWordPattern = re.compile(
+                r"(?<!\w)(?:" +
+                "|".join(re.escape(word) for word in sorted(
+                    singleWords, key=len, reverse=True)) +
+                r")(?!\w)")
+
+    def countIn(self, text):
+        text = text.lower()
+        if self.singleWordPattern:
+            for word in self.singleWordPattern.findall(text):
+                self.counts[word] += 1
+        for key, pattern in self.otherPatterns.items():
+            self.counts[key] += len(pattern.findall(text))
+
+    def getCounts(self):
+        """Returns a list of counts in the order of the search strings."""
+        return [self.counts.get(searchString.lower(), 0)
+                for searchString in self.searchStrings]
+
+
+def paragraphCount(document):
+    """Returns the number of paragraphs according to the document
+    statistics, which is useful to show progress.
+    """
+    try:
+        return max(1, document.getPropertyValue("ParagraphCount"))
+    except (RuntimeException, UnknownPropertyException):
+        return 1
+
+def documentStrings(unoObjs):
+    """Yields the text of each paragraph in the document, including
+    tables, frames, footnotes and endnotes.
+    """
+    for oPar in iteruno.byEnum(unoObjs.text):
+        for parString in _paragraphStrings(oPar):
+            yield parString
+    for oFrame in iteruno.byIndex(unoObjs.document.getTextFrames()):
+        for oPar in iteruno.byEnum(oFrame):
+            for parString in _paragraphStrings(oPar):
+                yield parString
+    for notes in (unoObjs.document.getFootnotes(),
+                  unoObjs.document.getEndnotes()):
+        for oNote in iteruno.byIndex(notes):
+            for oPar in iteruno.byEnum(oNote):
+                for parString in _paragraphStrings(oPar):
+                    yield parString
+
+def _paragraphStrings(oPar):
+    """Tables may be nested.
+    The text of a paragraph does not include frames anchored in it,
+    so they are read separately.
+    """
+    if oPar.supportsService("com.sun.star.text.Paragraph"):
+        yield oPar.getString()
+    elif oPar.supportsService("com.sun.star.text.TextTable"):
+        for cellName in oPar.getCellNames():
+            oCell = oPar.getCellByName(cellName)
+            for oPar2 in iteruno.byEnum(oCell):
+                for parString in _paragraphStrings(oPar2):
+                    yield parString
@@ -15,6 +15,8 @@
 # 17-Feb-17 JDK  Word Line 1 and 2 instead of Orthographic and Text.
 # 01-Mar-17 JDK  Fixed bugs caused by new way of incrementing rows.
 # 03-May-18 JDK  Align description of constant 2540 with LO code.
+# 17-Oct-26 JDK  Create each inner table with all of its words at once.
+# 17-Oct-26 JDK  Predict words per line from font widths and page width.
 
 """
 Create TextTables for interlinear data.
@@ -24,8 +26,8 @@ import logging
 from com.sun.star.lang import IndexOutOfBoundsException
 from com.sun.star.table import BorderLine
 
+from lingt.access.writer.textwidth import pageTextWidth
 from lingt.app import exceptions
-from lingt.app.data import lingex_structs
 from lingt.ui.common.messagebox import MessageBox
 from lingt.utils import util
 
@@ -33,6 +35,10 @@ logger = logging.getLogger("lingt.access.Tables")
 
 INCHES_TO_MM100 = 2540  # convert inches to hundredths of millimeters
 
+# Space between the text and the edge of a table cell.
+# This is the default in Writer, 0.10 cm on each side.
+CELL_PADDING = 2 * 100
+
 class OuterTable:
     """Table for numbering that contains frames or smaller tables where the
     data is.
@@ -151,125 +157,98 @@ class InterlinTables:
     """Inner tables that contain word data.
     These are used in place of lingt.access.writer.frames.
     """
-    def __init__(self, config, outerTable, unoObjs):
-        """config should be of type outputmanager.InterlinSettings."""
+    def __init__(self, config, outerTable, unoObjs, textWidths=None):
+        """config should be of type outputmanager.InterlinSettings.
+        :param textWidths: a textwidth.TextWidths object to predict where
+            lines wrap, or None to check the document after optimizing
+        """
         self.config = config
         self.outerTable = outerTable
         self.unoObjs = unoObjs
         self.msgbox = MessageBox(unoObjs)
-        self.wrappingManager = WrappingManager(config, outerTable, unoObjs)
-
-    def addWordData(self, word):
-        """Add columns for one word, many morphemes.
-        Creates another line (a new inner table) if word does not fit on
-        current line.
+        self.wrappingManager = WrappingManager(
+            config, outerTable, unoObjs, textWidths)
+
+    def addWords(self, words):
+        """Add columns for all words of an example.
+        The contents of each column are worked out before any tables are
+        created, and then each line (inner table) is built with all of
+        its words at once.
         """
         logger.debug(util.funcName('begin'))
-        for dummy_which_line in ("current", "wrap to another"):
-            morphRow_startCol = self.wrappingManager.prepareWordColumns(
-                len(word.morphList))
-            for morph_i, morph in enumerate(word.morphList):
-                self._insertMorphColumnData(
-                    word, morph, morphRow_startCol, morph_i)
-            if self.wrappingManager.fit_word_on_line():
-                logger.debug(util.funcName('return'))
-                return
-            logger.debug("Wrapping to next line.")
-        raise exceptions.LogicError("Word failed to fit properly.")
-
-    def _insertMorphColumnData(self, word, morph, morphRow_startCol, morph_i):
-        """Add interlinear data for a single column."""
-        wordOneMorph = lingex_structs.LingGramWord()
-        wordOneMorph.text1 = word.text1
-        wordOneMorph.text2 = word.text2
-        wordOneMorph.morph = morph
-        self._insertColumnData(
-            wordOneMorph, morphRow_startCol + morph_i, (morph_i == 0))
-        self.wrappingManager.innerTable.lastColFilled = True
-
-    def _insertColumnData(self, word, morphRow_col, isFirstMorph):
-        """Add interlinear data for a single column.
-        Expects word.morph to be set.
-        Requires self.wrappingManager.innerTable.
-        """
-        wordRow_col = self.wrappingManager.wordRow_col()
-        if word.morph is None:
-            logger.error("Expected a single morph to be set.")
-            return
-        logger.debug(
-            "Adding data '%s' to word col %d, morph col %d",
-            word.morph.gloss, wordRow_col, morphRow_col)
-        row = 0
-
-        # Word Line 1 and 2
-        row = self._insertWordData(
-            self.config.showWordLine1, wordRow_col, row, 'word1', word.text1,
-            isFirstMorph)
-        row = self._insertWordData(
-            self.config.showWordLine2, wordRow_col, row, 'word2', word.text2,
-            isFirstMorph)
-
-        # Morphemes Line 1 and 2
-        row = self._insertMorphData(
-            self.config.showMorphLine1, morphRow_col, row, 'morph1',
-            word.morph.text1)
-        row = self._insertMorphData(
-            self.config.showMorphLine2, morphRow_col, row, 'morph2',
-            word.morph.text2)
-
-        # Gloss
-        if self.config.POS_aboveGloss:
-            row += 1
-        self._insertCellData(morphRow_col, row, 'gloss', word.morph.gloss)
-        if self.config.POS_aboveGloss:
-            row -= 1
-        else:
-            row += 1
-
-        # Part of Speech
-        if self.config.showPartOfSpeech:
-            self._insertCellData(morphRow_col, row, 'pos', word.morph.pos)
+        layouts = [WordLayout(word, self.config) for word in words]
+        self.wrappingManager.addLines(layouts)
         logger.debug(util.funcName('end'))
 
-    def _insertWordData(self, show_line, col, row, paraStyleKey, strData,
-                        isFirstMorph):
-        if show_line:
-            if isFirstMorph:
-                self._insertCellData(col, row, paraStyleKey, strData)
-            return row + 1
-        return row
-
-    def _insertMorphData(self, show_line, col, row, paraStyleKey, strData):
-        if show_line:
-            self._insertCellData(col, row, paraStyleKey, strData)
-            return row + 1
-        return row
-
-    def _insertCellData(self, col, row, paraStyleKey, strData):
-        try:
-            cellInner = self.wrappingManager.innerTable.table.getCellByPosition(
-                col, row)
-        except IndexOutOfBoundsException:
-            raise exceptions.ContentError(
-                "Could not get column %d, row %d of table %s.",
-                col, row, self.wrappingManager.innerTable.table.getName())
-        cellcursorInner = cellInner.createTextCursor()
-        self.outerTable.styles.requireParaStyle(paraStyleKey)
-        cellcursorInner.setPropertyValue(
-            "ParaStyleName", self.outerTable.styles.styleNames[paraStyleKey])
-        cellInner.insertString(cellcursorInner, strData, 0)
-
     def cleanupMarkers(self):
         self.wrappingManager.cleanupMarkers()
 
 
+class WordLayout:
+    """The strings to put in each cell of the columns for one word."""
+    def __init__(self, word, config):
+        """:param word: a lingex_structs.LingGramWord"""
+        self.wordStrings = []  # one for each word row
+        if config.showWordLine1:
+            self.wordStrings.append(word.text1)
+        if config.showWordLine2:
+            self.wordStrings.append(word.text2)
+        self.morphStrings = []  # for each morph, one for each morph row
+        for morph in word.morphList:
+            strings = []
+            if config.showMorphLine1:
+                strings.append(morph.text1)
+            if config.showMorphLine2:
+                strings.append(morph.text2)
+            if config.showPartOfSpeech and config.POS_aboveGloss:
+                strings.extend((morph.pos, morph.gloss))
+            elif config.showPartOfSpeech:
+                strings.extend((morph.gloss, morph.pos))
+            else:
+                strings.append(morph.gloss)
+            self.morphStrings.append(strings)
+        if not self.morphStrings:
+            self.morphStrings.append([""] * len(morphRowKeys(config)))
+
+    def numMorphs(self):
+        return len(self.morphStrings)
+
+
+def wordRowKeys(config):
+    """Paragraph style keys of the rows that have one cell per word."""
+    keys = []
+    if config.showWordLine1:
+        keys.append('word1')
+    if config.showWordLine2:
+        keys.append('word2')
+    return keys
+
+def morphRowKeys(config):
+    """Paragraph style keys of the rows that have one cell per morpheme."""
+    keys = []
+    if config.showMorphLine1:
+        keys.append('morph1')
+    if config.showMorphLine2:
+        keys.append('morph2')
+    if config.showPartOfSpeech and config.POS_aboveGloss:
+        keys.extend(('pos', 'gloss'))
+    elif config.showPartOfSpeech:
+        keys.extend(('gloss', 'pos'))
+    else:
+        keys.append('gloss')
+    return keys
+
+
 class WrappingManager:
-    """Adds or removes columns and inner tables for best fit."""
-    def __init__(self, config, outerTable, unoObjs):
+    """Decides how many words fit on each line, with one inner table for
+    each line.
+    """
+    def __init__(self, config, outerTable, unoObjs, textWidths=None):
         """config should be of type outputmanager.InterlinSettings."""
         self.config = config
         self.outerTable = outerTable
         self.unoObjs = unoObjs
+        self.textWidths = textWidths
         self.msgbox = MessageBox(unoObjs)
         self.updatingEx = False
 
@@ -277,57 +256,129 @@ class WrappingManager:
         self.markers = []  # marked locations in text
         self.numRows = 0
 
-    def prepareWordColumns(self, num_morphs):
-        """Create all new column(s) needed for all morphs of a word."""
-        if self.innerTable is None:
-            # This is needed for the first word of the example.
-            self.createInnerTable()
-
-        return self.innerTable.prepareWordColumns(num_morphs)
-
-    def fit_word_on_line(self):
-        """Check if the word fits on the current line, or whether
-        we need to move the word to a new table instead.
-
-        Returns True if the word fits.
-        If not, then prepareColumn() should be called again.
+    def addLines(self, layouts):
+        """Create as many inner tables as needed for the words.
+        :param layouts: list of WordLayout
         """
-        if not self.innerTable.doesWordFit():
-            # Delete the column for the word we just added
-            self.innerTable.deleteWordColumns()
-            self.createInnerTable()
-            return False
-        return True
-
-    def wordRow_col(self):
-        return self.innerTable.wordRow_col()
-
-    def createInnerTable(self):
+        # The prediction may be off by a word or so either way, so it is
+        # only used as the place to start searching.
+        # Lines are often about the same length, so if there is no
+        # prediction, first try as many words as fit on the previous line.
+        wordsToTry = len(layouts)
+        start = 0
+        while start < len(layouts):
+            lineLayouts = layouts[start:]
+            numWords = self._fillLine(
+                lineLayouts,
+                self.predictWordsThatFit(lineLayouts) or wordsToTry)
+            start += numWords
+            wordsToTry = numWords
+
+    def predictWordsThatFit(self, layouts):
+        """Use font measurements to decide how many words fit on the
+        next line, without needing to check the document.
+        Returns None if the text could not be measured.
+        """
+        if self.textWidths is None:
+            return None
+        lineWidth = pageTextWidth(self.unoObjs, self.outerTable.cursor)
+        if lineWidth is None:
+            return None
+        if self.config.makeOuterTable:
+            lineWidth *= (100 - self.config.numberingColumnWidth) / 100
+        elif self.config.insertNumbering and self.innerTable is None:
+            numberingWidth = self.textWidths.getWidth('numP', "(xxxx)")
+            if numberingWidth is None:
+                return None
+            lineWidth -= numberingWidth + CELL_PADDING
+        numWords = 0
+        widthSoFar = 0
+        for layout in layouts:
+            wordWidth = self._wordWidth(layout)
+            if wordWidth is None:
+                return None
+            widthSoFar += wordWidth
+            if widthSoFar > lineWidth and numWords > 0:
+                break
+            numWords += 1
+        logger.debug("Predicted %d words on the line.", numWords)
+        return numWords
+
+    def _wordWidth(self, layout):
+        """Width of all columns for the word, including cell padding."""
+        wordStringsWidth = self._maxWidth(
+            wordRowKeys(self.config), layout.wordStrings)
+        morphsWidth = 0
+        for strings in layout.morphStrings:
+            morphWidth = self._maxWidth(morphRowKeys(self.config), strings)
+            if morphWidth is None or wordStringsWidth is None:
+                return None
+            morphsWidth += morphWidth + CELL_PADDING
+        return max(wordStringsWidth + CELL_PADDING, morphsWidth)
+
+    def _maxWidth(self, styleKeys, strings):
+        """Width of the widest string, or None if any could not be measured.
+        """
+        maxWidth = 0
+        for styleKey, strData in zip(styleKeys, strings):
+            width = self.textWidths.getWidth(styleKey, strData)
+            if width is None:
+                return None
+            maxWidth = max(maxWidth, width)
+        return maxWidth
+
+    def _fillLine(self, layouts, wordsToTry):
+        """Search for the largest number of words that fit on the line.
+        Starting from wordsToTry, take growing steps in one direction until
+        the answer is passed, and then narrow it down by halves.
+        Words are added or removed in bulk, and the table is optimized and
+        checked once for each number that is tried.
+        Returns the number of words that were put on the line.
+        """
+        numWords = min(wordsToTry, len(layouts))
+        self.createInnerTable(layouts[:numWords])
+        mostThatFit = 0
+        leastThatWrap = len(layouts) + 1
+        step = 1
+        while True:
+            if self.innerTable.doWordsFit():
+                mostThatFit = numWords
+            else:
+                leastThatWrap = numWords
+            if leastThatWrap - mostThatFit <= 1:
+                break
+            if mostThatFit > 0 and leastThatWrap <= len(layouts):
+                numWords = (mostThatFit + leastThatWrap) // 2
+            elif mostThatFit > 0:
+                numWords = min(mostThatFit + step, len(layouts))
+            else:
+                numWords = max(leastThatWrap - step, 1)
+            step *= 2
+            self.innerTable.setNumWords(numWords, layouts)
+        if numWords != mostThatFit:
+            self.innerTable.setNumWords(mostThatFit, layouts)
+            self.innerTable.optimize()
+        logger.debug("Put %d words on the line.", mostThatFit)
+        return mostThatFit
+
+    def createInnerTable(self, layouts):
         """Create a new inner table."""
         logger.debug("Preparing to create inner table.")
-        self.numRows = countRowsToShow((
-            self.config.showWordLine1,
-            self.config.showWordLine2,
-            self.config.showMorphLine1,
-            self.config.showMorphLine2,
-            self.config.showPartOfSpeech))
-        self.numRows += 1  # There's always a gloss row.
+        self.numRows = (
+            len(wordRowKeys(self.config)) + len(morphRowKeys(self.config)))
         firstInnerTable = False
         if self.innerTable is None:
             firstInnerTable = True
         self.innerTable = InnerTable(
             self.unoObjs, self.config, self.outerTable, self)
-        self.innerTable.create(self.markers)
 
         ## Insert numbering if not already done outside of this table
 
         if (self.config.insertNumbering and not self.config.makeOuterTable
                 and firstInnerTable):
             self.innerTable.hasNumbering = True
-            # Add an empty column.  This is needed in order to resize the
-            # numbering column correctly.
-            logger.debug("Adding empty column column after numbering...")
-            self.innerTable.insertNewColumn(40)
+        self.innerTable.create(self.markers, layouts)
+        if self.innerTable.hasNumbering:
             self.outerTable.insertNumberInTable(
                 self.innerTable.table, isInnerTable=True)
 
@@ -355,6 +406,10 @@ class WrappingManager:
 class InnerTable:
     """Attributes for one inner table, which is the part of an interlinearized
     sentence that fits on one line.
+
+    Word rows have one cell for each word, and the cells of the morpheme
+    rows below are split to give one for each morpheme.
+    If there are no word rows, then there is one column for each morpheme.
     """
     def __init__(self, unoObjs, config, outerTable, wrappingManager):
         self.unoObjs = unoObjs
@@ -362,23 +417,29 @@ class InnerTable:
         self.outerTable = outerTable
         self.wrappingManager = wrappingManager
         self.table = None
-        self.wordRow_cols = 1  # counts merged word columns
-        self.morphRow_cols = 1  # count of all inserted columns
-        self.lastColFilled = False  # table starts with an empty column
-        self.numColumnsAdded = 0
+        self.wordRow_cols = 0  # number of columns in word rows
+        self.morphRow_cols = 0  # number of columns in morpheme rows
+        self.layouts = []  # WordLayout for each word in the table
+        self.numWordRows = len(wordRowKeys(config))
+        self.splitCells = False
         # Typically numbering is in the outer table, but the inner table may
         # contain numbering if there is no outer table.
         self.hasNumbering = False
 
-    def create(self, markers):
-        """Create a new inner TextTable."""
+    def create(self, markers, layouts):
+        """Create a new inner TextTable with columns for the words."""
         logger.debug("Preparing to create inner table.")
 
         ## Create the table
 
+        numLeadingCols = 0
+        if self.hasNumbering:
+            numLeadingCols = 1
         table = self.unoObjs.document.createInstance(
             "com.sun.star.text.TextTable")
-        table.initialize(self.wrappingManager.numRows, 1)  # one column
+        table.initialize(
+            self.wrappingManager.numRows,
+            numLeadingCols + self._numColsNeeded(layouts))
         self.outerTable.text.insertTextContent(
             self.outerTable.cursor, table, False)
 
@@ -398,69 +459,123 @@ class InnerTable:
             "Created inner table %s with %d rows.",
             table.getName(), self.wrappingManager.numRows)
         self.table = table
-        self.wordRow_cols = 1
-        self.morphRow_cols = 1
-        self.lastColFilled = False
-
-    def prepareWordColumns(self, num_morphs):
-        """Create all new column(s) needed for all morphs of a word."""
-        if self.lastColFilled:
-            self.insertNewColumn(100)
-        morphRow_startCol = self.morphRow_cols - 1
-        if num_morphs > 1:
-            # Split up the column for all morphemes.
-            self._splitColumn(num_morphs, morphRow_startCol)
-        self.numColumnsAdded = num_morphs
-        return morphRow_startCol
-
-    def doesWordFit(self):
-        """Check if the word fits on the current line, or whether
-        we need to move the word to a new table instead.
-        Returns True if the word fits.
+        self.wordRow_cols = numLeadingCols
+        self.morphRow_cols = numLeadingCols
+        self._fillWords(layouts)
+
+    def _numColsNeeded(self, layouts):
+        """Number of columns to insert for the words, before any cells
+        are split.
         """
-        self.optimize()
+        if self.numWordRows == 0:
+            return sum(layout.numMorphs() for layout in layouts)
+        return len(layouts)
 
-        firstDataCol = 0
-        if self.hasNumbering:
-            firstDataCol = 1
-        if self.wordRow_col() > firstDataCol:
+    def setNumWords(self, numWords, layouts):
+        """Add or remove words at the end of the table.
+        :param layouts: all words that could go in this table
+        """
+        numWordsBefore = len(self.layouts)
+        if numWords > numWordsBefore:
+            layoutsToAdd = layouts[numWordsBefore:numWords]
+            logger.debug(
+                "Inserting %d columns at index %d",
+                self._numColsNeeded(layoutsToAdd), self.wordRow_cols)
+            self.table.getColumns().insertByIndex(
+                self.wordRow_cols, self._numColsNeeded(layoutsToAdd))
+            self._fillWords(layoutsToAdd)
+        elif numWords < numWordsBefore:
+            self._removeWords(numWordsBefore - numWords)
+
+    def _fillWords(self, layouts):
+        """Put the words in the empty columns at the end of the table."""
+        startWordCol = self.wordRow_cols
+        startMorphCol = self.morphRow_cols
+        numNewCols = self._numColsNeeded(layouts)
+        self.wordRow_cols += numNewCols
+        self.morphRow_cols += numNewCols
+        if self.numWordRows > 0:
+            # Go from right to left so that the words on the left are
+            # still in one column each.
+            for word_i in reversed(range(len(layouts))):
+                numMorphs = layouts[word_i].numMorphs()
+                if numMorphs > 1:
+                    self._splitColumn(numMorphs, startMorphCol + word_i)
+        self.layouts.extend(layouts)
+
+        wordRows = [[] for dummy in range(self.numWordRows)]
+        morphRows = [[] for dummy in morphRowKeys(self.config)]
+        for layout in layouts:
+            for row, strData in zip(wordRows, layout.wordStrings):
+                row.append(strData)
+            for strings in layout.morphStrings:
+                for row, strData in zip(morphRows, strings):
+                    row.append(strData)
+        if self.splitCells:
+            self._setCellStrings(wordRows, startWordCol, 0)
+            self._setCellStrings(morphRows, startMorphCol, self.numWordRows)
+        else:
+            # All rows have the same number of columns, so set them at once.
+            cellRange = self.table.getCellRangeByPosition(
+                startWordCol, 0, self.wordRow_cols - 1,
+                self.wrappingManager.numRows - 1)
+            cellRange.setDataArray(tuple(
+                tuple(row) for row in wordRows + morphRows))
+        self._setParaStyles(wordRowKeys(self.config), startWordCol, 0)
+        self._setParaStyles(
+            morphRowKeys(self.config), startMorphCol, self.numWordRows)
+
+    def _setCellStrings(self, rows, startCol, startRow):
+        for row_i, row in enumerate(rows, startRow):
+            for col_i, strData in enumerate(row, startCol):
+                self._getCell(col_i, row_i).setString(strData)
+
+    def _setParaStyles(self, styleKeys, startCol, startRow):
+        """Set the style of each row with a cursor that selects all of
+        the new cells in the row.
+        """
+        for row_i, paraStyleKey in enumerate(styleKeys, startRow):
+            if row_i < self.numWordRows:
+                endCol = self.wordRow_cols - 1
+            else:
+                endCol = self.morphRow_cols - 1
+            self.outerTable.styles.requireParaStyle(paraStyleKey)
+            oTextTableCurs = self.table.createCursorByCellName(
+                self._getCell(startCol, row_i).CellName)
+            oTextTableCurs.gotoCellByName(
+                self._getCell(endCol, row_i).CellName, True)
+            oTextTableCurs.setPropertyValue(
+                "ParaStyleName",
+                self.outerTable.styles.styleNames[paraStyleKey])
+
+    def _getCell(self, col, row):
+        try:
+            return self.table.getCellByPosition(col, row)
+        except IndexOutOfBoundsException:
+            raise exceptions.ContentError(
+                "Could not get column %d, row %d of table %s.",
+                col, row, self.table.getName())
+
+    def doWordsFit(self):
+        """Check if the words fit on the current line, or whether
+        some of them need to move to a new table instead.
+        A single word always fits.
+        """
+        self.optimize()
+        if len(self.layouts) > 1:
             if hasWrappingText(
                     self.table, self.unoObjs, self.outerTable.styles):
                 return False
         return True
 
-    def wordRow_col(self):
-        """The most recent column for the word row.
-        If there are no word rows, then returns the first morpheme column of
-        the most recent word.
-        """
-        word_rows = countRowsToShow((
-            self.config.showWordLine1,
-            self.config.showWordLine2))
-        if word_rows == 0:
-            return self.wordRow_cols - self.numColumnsAdded
-        return self.wordRow_cols - 1
-
-    def insertNewColumn(self, percentWidth):
-        """Param is percent of page width."""
-        logger.debug("Inserting a column at index %d", self.wordRow_cols)
-        oCols = self.table.getColumns()
-        self.table.RelativeWidth = percentWidth
-        oCols.insertByIndex(self.wordRow_cols, 1)   # add column
-        self.wordRow_cols += 1
-        self.morphRow_cols += 1
-
     def _splitColumn(self, numCols, startCol):
-        """Split up the column."""
+        """Split up the morpheme rows of a column."""
         numNewCols = numCols - 1
-        word_rows = countRowsToShow((
-            self.config.showWordLine1,
-            self.config.showWordLine2))
         logger.debug(
             "Splitting for %d new morph cols at %d, %d",
-            numNewCols, startCol, word_rows)
+            numNewCols, startCol, self.numWordRows)
         cell1 = self.table.getCellByPosition(
-            startCol, word_rows)
+            startCol, self.numWordRows)
         cell2 = self.table.getCellByPosition(
             startCol, self.wrappingManager.numRows - 1)
         oTextTableCurs = self.table.createCursorByCellName(
@@ -469,28 +584,21 @@ class InnerTable:
         bHorizontal = False
         oTextTableCurs.splitRange(numNewCols, bHorizontal)
         self.morphRow_cols += numNewCols
-        if word_rows == 0:
-            self.wordRow_cols += numNewCols
+        self.splitCells = True
 
-    def deleteWordColumns(self):
-        """Deletes the columns that were recently added.
+    def _removeWords(self, numWords):
+        """Deletes the columns of the last words in the table.
         Deleting 1 word column may delete several morph columns.
         """
-        wordCol = self.wordRow_col()
-        logger.debug("Deleting word col(s) at %d", wordCol)
-        oWordCols = self.table.getColumns()
-        if ((self.config.showWordLine1 or self.config.showWordLine2)
-                and self.config.separateMorphColumns):
-            oWordCols.removeByIndex(wordCol, 1)
-            self.wordRow_cols -= 1
-        else:
-            logger.debug("deleting %d columns", self.numColumnsAdded)
-            oWordCols.removeByIndex(wordCol, self.numColumnsAdded)
-            self.wordRow_cols -= self.numColumnsAdded
-        self.morphRow_cols -= self.numColumnsAdded
-
-        ## Resize the current table to fix it
-        self.optimize()
+        oCols = self.table.getColumns()
+        for dummy in range(numWords):
+            layout = self.layouts.pop()
+            numCols = self._numColsNeeded([layout])
+            wordCol = self.wordRow_cols - numCols
+            logger.debug("Deleting %d col(s) at %d", numCols, wordCol)
+            oCols.removeByIndex(wordCol, numCols)
+            self.wordRow_cols -= numCols
+            self.morphRow_cols -= layout.numMorphs()
 
     def optimize(self):
         """Shrink the table to fit the text."""
@@ -604,10 +712,3 @@ def hasWrappingText(table, unoObjs, styles):
                 return True
     logger.debug("No wrapping text found.")
     return False
-
-def countRowsToShow(rowShowVars):
-    """User variables specify whether to show or hide certain rows.
-    Count how many rows to show.
-    Value will be true if row should be shown.
-    """
-    return len([val for val in rowShowVars if val])
@@ -60,6 +60,7 @@ class TextChanger:
         self.progressBar = progressBar
         self.msgboxFour = FourButtonDialog(unoObjs)
         self.secCall = None
+        self.convertedValues = {}  # keys input strings, values converted
         self.styleType = ""
         self.newStyleName = ""
         self.newFont = None
@@ -83,6 +84,10 @@ class TextChanger:
 
     def doChanges(self, ranges, askEach):
         """
+        When not asking about each change, the text of all ranges is
+        converted up front.  When asking, each range is converted only when
+        it is reached, so that no time is spent on conversions that the
+        user cancels.
         :arg ranges: list of search.TxtRange objects
         :returns: number of changes made
         """
@@ -93,6 +98,13 @@ class TextChanger:
         if self.unoObjs.viewcursor:
             originalRange = self.unoObjs.viewcursor.getStart()
         rangeLastChanged = None
+        self.convertedValues = {}
+        if not askEach:
+            try:
+                self.convertRanges(ranges)
+            except exceptions.FileAccessError as exc:
+                logger.exception(exc)
+                return self.numChanges, self.numStyleChanges
         progressRange = ProgressRange(
             start=40, stop=90, ops=len(ranges), pbar=self.progressBar)
 
@@ -130,6 +142,24 @@ class TextChanger:
         logger.debug(util.funcName('end'))
         return self.numChanges, self.numStyleChanges
 
+    def convertRanges(self, ranges):
+        """Convert the text of all ranges at once, which is much faster
+        than calling the converter for each range.
+        """
+        self.convertedValues = {}
+        if self.secCall is None:
+            return
+        inputList = []
+        for txtRange in ranges:
+            try:
+                inputList.append(txtRange.sel.getString())
+            except (RuntimeException, IllegalArgumentException):
+                # It will be converted later by convertString() if possible.
+                logger.warning("Failed to get text range.")
+        inputList = list(dict.fromkeys(inputList))
+        self.convertedValues = dict(
+            zip(inputList, self.secCall.convert_many(inputList)))
+
     def changeTextRange(self, txtRange):
         logger.debug(util.funcName('begin'))
         oSel = txtRange.sel
@@ -173,7 +203,10 @@ class TextChanger:
 
         changedText = False
         if self.secCall is not None:
-            outValue = self.secCall.convert(inValue)
+            if inValue in self.convertedValues:
+                outValue = self.convertedValues[inValue]
+            else:
+                outValue = self.secCall.convert(inValue)
             changedText = True
             if outValue == inValue:
                 changedText = False
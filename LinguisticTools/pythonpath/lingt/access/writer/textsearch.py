@@ -7,11 +7,14 @@
 # 07-Oct-15 JDK  Fixed bug: Attribute fontName instead of font.
 # 14-Oct-15 JDK  Fixed bug: selFormatting cannot be local to one method.
 # 16-Nov-15 JDK  Fixed bug: addRangesForCursor() should add ranges.
+# 17-Oct-26 JDK  Read the formatting of each text portion in one call.
 """
 Writer document searches such as by font or full document.
 """
 import logging
 import re
+from com.sun.star.lang import IllegalArgumentException
+from com.sun.star.uno import RuntimeException
 
 from lingt.access.common import iteruno
 from lingt.access.writer.traveler import Traveler
@@ -21,6 +24,20 @@ from lingt.utils import util
 
 logger = logging.getLogger("lingt.access.TextSearch")
 
+# Text portion types that do not need to end a run of formatting.
+ZERO_WIDTH_PORTIONS = ["Bookmark", "ReferenceMark", "SoftPageBreak"]
+
+# Read these for each text portion with a single getPropertyValues() call.
+SECTION_PROPERTIES = (
+    "CharStyleName",
+    "CharFontName",
+    "CharFontNameComplex",
+    "CharFontNameAsian",
+    "CharLocale",
+    "CharLocaleComplex",
+    "CharLocaleAsian",
+    )
+
 
 class TextSearchSettings:
     """A structure to hold settings for TextSearch."""
@@ -166,11 +183,11 @@ class TextSearch:
         For example, "Standard", not "Default Style".
         """
         logger.debug(util.funcName('begin', args=self.config.style))
-        for simpleTextSection in self.docEnum.documentSections():
-            if simpleTextSection.CharStyleName == self.config.style:
+        for section in self.docEnum.formattedSections():
+            if section.charStyleName == self.config.style:
                 logger.debug("Found style %s", self.config.style)
                 # TextPortions include the TextRange service.
-                self.ranger.addRange(simpleTextSection)
+                self.ranger.addRange(section.textRange)
 
     def scopeComplexFont(self):
         """Similar to character styles,
@@ -178,18 +195,18 @@ class TextSearch:
         buggy, so we enumerate instead.
         """
         logger.debug(util.funcName('begin'))
-        for simpleTextSection in self.docEnum.documentSections():
+        for section in self.docEnum.formattedSections():
             if self.config.fontType == "Complex":
-                sectionFont = simpleTextSection.CharFontNameComplex
+                sectionFont = section.fontNameComplex
             elif self.config.fontType == "Asian":
-                sectionFont = simpleTextSection.CharFontNameAsian
+                sectionFont = section.fontNameAsian
             else:
                 raise exceptions.LogicError(
                     "Unexpected font type %s.", self.config.fontType)
             if sectionFont == self.config.fontName:
                 logger.debug("Found font %s", self.config.fontName)
                 # TextPortions include the TextRange service.
-                self.ranger.addRange(simpleTextSection)
+                self.ranger.addRange(section.textRange)
 
     def scopeLocale(self):
         """This is similar to searching for a character style."""
@@ -197,12 +214,10 @@ class TextSearch:
         lang = self.config.lang
         if not lang:
             raise exceptions.ChoiceProblem("No locale was specified.")
-        for simpleTextSection in self.docEnum.documentSections():
-            if (simpleTextSection.CharLocale.Language == lang or
-                    simpleTextSection.CharLocaleComplex.Language == lang or
-                    simpleTextSection.CharLocaleAsian.Language == lang):
+        for section in self.docEnum.formattedSections():
+            if lang in section.languages:
                 # TextPortions include the TextRange service.
-                self.ranger.addRange(simpleTextSection)
+                self.ranger.addRange(section.textRange)
 
     def scopeSFMs(self):
         sfm_str = re.sub(r'\\', r'', self.config.SFMs)
@@ -274,6 +289,13 @@ class DocumentEnumerator:
         """
         return self.textSectionsForParEnum(self.unoObjs.text)
 
+    def formattedSections(self):
+        """Like documentSections(), but returns FormattedSection objects,
+        which are faster to check than reading each property separately.
+        """
+        return [FormattedSection(textPortion)
+                for textPortion in self.documentSections()]
+
     def textSectionsForParEnum(self, oParEnumerator):
         """Get text sections for all paragraphs that are enumerated by the
         given object.
@@ -341,6 +363,22 @@ class DocumentEnumerator:
         return textSections
 
 
+class FormattedSection:
+    """A text portion along with its formatting."""
+    def __init__(self, textPortion):
+        """:param textPortion: a text portion from DocumentEnumerator"""
+        self.textRange = textPortion
+        (self.charStyleName,
+         self.fontName,
+         self.fontNameComplex,
+         self.fontNameAsian,
+         locale,
+         localeComplex,
+         localeAsian) = textPortion.getPropertyValues(SECTION_PROPERTIES)
+        self.languages = (
+            locale.Language, localeComplex.Language, localeAsian.Language)
+
+
 class TxRanger:
     """Walker for sections and ranges of text."""
     def __init__(self, unoObjs, checkForFormatting):
@@ -366,6 +404,64 @@ class TxRanger:
             self.addRange(oSel)
             logger.debug(util.funcName('return'))
             return
+        if inTableOrFrame(oSel):
+            # Enumerating here would give the entire table or paragraph,
+            # not just the selection.
+            self.addRangesByCharacter(oSel)
+            return
+        try:
+            simpleTextRanges = self.rangesByPortion(oSel)
+        except (RuntimeException, IllegalArgumentException) as exc:
+            logger.warning("Could not enumerate text portions: %s", exc)
+            self.addRangesByCharacter(oSel)
+            return
+        logger.debug(util.funcName('end'))
+        self.addRangeList(simpleTextRanges)
+
+    def rangesByPortion(self, oSel):
+        """Enumerate paragraphs and text portions, which is much faster than
+        moving one character at a time.
+        Adjacent portions with the same formatting are joined,
+        and the result is clipped to the selection.
+        :returns: list of ranges that have only one formatting
+        """
+        oText = oSel.getText()
+        selStart = oSel.getStart()
+        selEnd = oSel.getEnd()
+        if oText.compareRegionStarts(selEnd, selStart) > 0:
+            logger.debug("start of selection is on the right")
+            selStart, selEnd = selEnd, selStart
+        selCursor = oText.createTextCursorByRange(selStart)
+        selCursor.gotoRange(selEnd, True)
+        simpleTextRanges = []
+        for oPar in iteruno.byEnum(selCursor):
+            if oPar.supportsService("com.sun.star.text.Paragraph"):
+                for runStart, runEnd in formattingRuns(oPar):
+                    if oText.compareRegionStarts(runStart, selStart) > 0:
+                        runStart = selStart
+                    if oText.compareRegionEnds(runEnd, selEnd) < 0:
+                        runEnd = selEnd
+                    if oText.compareRegionStarts(runStart, runEnd) <= 0:
+                        # nothing selected in this run
+                        continue
+                    cursor = oText.createTextCursorByRange(runStart)
+                    cursor.gotoRange(runEnd, True)
+                    simpleTextRanges.extend(splitIntoChunks(cursor))
+            else:
+                # A table or frame that is entirely within the selection.
+                docEnum = DocumentEnumerator(self.unoObjs)
+                for oTextPortion in docEnum.textSectionsOfPar(oPar):
+                    cursor = oTextPortion.getText().createTextCursorByRange(
+                        oTextPortion)
+                    simpleTextRanges.extend(splitIntoChunks(cursor))
+        return simpleTextRanges
+
+    def addRangesByCharacter(self, oSel):
+        """Move the view cursor through the selection one character at a time
+        to check for formatting changes.  This is slow but works in places
+        such as table cells where enumerating does not.
+        """
+        logger.debug(util.funcName('begin'))
         simpleTextRanges = []  # ranges that have only one formatting
         self.traveler = Traveler(self.unoObjs)
         self.traveler.createCursors(oSel)
@@ -498,6 +594,67 @@ class Chunker:
         return self.stringLen >= self.MAX_STRING_LENGTH
 
 
+def inTableOrFrame(oSel):
+    """These attributes are mentioned in TextRangeContentProperties."""
+    try:
+        return bool(oSel.TextTable or oSel.TextFrame)
+    except AttributeError:
+        return True
+
+
+def formattingRuns(oPar):
+    """Generator to get the start and end of each run of text in the
+    paragraph that has the same formatting.
+    Other portions such as fields and frames end the run,
+    except for ones that take up no space.
+    """
+    runStart = None
+    runEnd = None
+    runFormatting = None
+    for oTextPortion in iteruno.byEnum(oPar):
+        portionType = oTextPortion.TextPortionType
+        if portionType == "Text":
+            portionFormatting = Formatting(oTextPortion)
+            if (runFormatting is not None
+                    and portionFormatting.sameCharForm(runFormatting)):
+                runEnd = oTextPortion.getEnd()
+                continue
+            if runStart is not None:
+                yield runStart, runEnd
+            runStart = oTextPortion.getStart()
+            runEnd = oTextPortion.getEnd()
+            runFormatting = portionFormatting
+        elif portionType not in ZERO_WIDTH_PORTIONS:
+            if runStart is not None:
+                yield runStart, runEnd
+            runStart = None
+            runFormatting = None
+    if runStart is not None:
+        yield runStart, runEnd
+
+
+def splitIntoChunks(cursor):
+    """Split the range of a cursor if it is longer than
+    Chunker.MAX_STRING_LENGTH.
+    :returns: list of ranges
+    """
+    maxLen = Chunker.MAX_STRING_LENGTH
+    stringLen = len(cursor.getString())
+    if stringLen <= maxLen:
+        return [cursor]
+    logger.debug("Splitting string of length %d", stringLen)
+    oText = cursor.getText()
+    chunks = []
+    chunkCursor = oText.createTextCursorByRange(cursor.getStart())
+    for dummy_chunkNum in range((stringLen - 1) // maxLen):
+        chunkCursor.goRight(maxLen, True)
+        chunks.append(oText.createTextCursorByRange(chunkCursor))
+        chunkCursor.collapseToEnd()
+    chunkCursor.gotoRange(cursor.getEnd(), True)
+    chunks.append(chunkCursor)
+    return chunks
+
+
 class TxtRange:
     """A structure to store one range of text."""
     def __init__(self):
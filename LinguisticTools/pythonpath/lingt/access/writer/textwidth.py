@@ -0,0 +1,136 @@
+# -*- coding: Latin-1 -*-
+#
+# This file created Oct 17 2026
+
+"""
+Estimate how much room strings will take up in the document, based on the
+fonts of paragraph styles.  This is used to decide where interlinear lines
+wrap before any tables are created.
+
+This module exports:
+    TextWidths
+    pageTextWidth()
+"""
+import logging
+
+from com.sun.star.awt import FontDescriptor
+from com.sun.star.container import NoSuchElementException
+from com.sun.star.uno import RuntimeException
+
+from lingt.utils import letters
+
+logger = logging.getLogger("lingt.access.textwidth")
+
+POINTS_PER_INCH = 72
+MM100_PER_METER = 100000
+INCHES_PER_METER = 39.37
+
+# Fonts are measured at a larger size than shown on the screen,
+# because widths are rounded to whole pixels.
+MEASURING_SCALE = 10
+
+# Font property names for each font type.
+FONT_PROPERTIES = {
+    letters.TYPE_STANDARD : (
+        "CharFontName", "CharHeight", "CharWeight", "CharPosture"),
+    letters.TYPE_COMPLEX : (
+        "CharFontNameComplex", "CharHeightComplex", "CharWeightComplex",
+        "CharPostureComplex"),
+    letters.TYPE_CJK : (
+        "CharFontNameAsian", "CharHeightAsian", "CharWeightAsian",
+        "CharPostureAsian"),
+    }
+
+
+class TextWidths:
+    """Measure strings using the fonts of paragraph styles.
+    Each unique string is measured only once.
+    """
+    def __init__(self, unoObjs, styles):
+        """:param styles: a DocumentStyles object"""
+        self.unoObjs = unoObjs
+        self.styles = styles
+        self.device = None
+        self.pixelsPerPoint = 0
+        self.mm100PerPixel = 0
+        self.fonts = dict()  # keys are (styleKey, fontType)
+        self.widths = dict()  # keys are (styleKey, string)
+        self.working = True
+
+    def getWidth(self, styleKey, strData):
+        """Returns the width in hundredths of millimeters,
+        or None if it could not be measured.
+        """
+        key = (styleKey, strData)
+        if key not in self.widths:
+            self.widths[key] = self._measure(styleKey, strData)
+        return self.widths[key]
+
+    def _measure(self, styleKey, strData):
+        if not strData:
+            return 0
+        if not self.working:
+            return None
+        font = self._getFont(styleKey, stringFontType(strData))
+        if font is None:
+            return None
+        return (font.getStringWidth(strData) * self.mm100PerPixel
+                / MEASURING_SCALE)
+
+    def _getFont(self, styleKey, fontType):
+        key = (styleKey, fontType)
+        if key in self.fonts:
+            return self.fonts[key]
+        font = None
+        try:
+            if self.device is None:
+                self._createDevice()
+            paraStyles = self.styles.families.getByName("ParagraphStyles")
+            styleObj = paraStyles.getByName(self.styles.styleNames[styleKey])
+            fontName, height, weight, posture = styleObj.getPropertyValues(
+                FONT_PROPERTIES[fontType])
+            fontDescriptor = FontDescriptor()
+            fontDescriptor.Name = fontName
+            fontDescriptor.Height = round(
+                height * self.pixelsPerPoint * MEASURING_SCALE)
+            fontDescriptor.Weight = weight
+            fontDescriptor.Slant = posture
+            font = self.device.getFont(fontDescriptor)
+        except (NoSuchElementException, RuntimeException, KeyError) as exc:
+            logger.warning("Could not get font for %s: %s", styleKey, exc)
+            self.working = False
+        self.fonts[key] = font
+        return font
+
+    def _createDevice(self):
+        toolkit = self.unoObjs.smgr.createInstanceWithContext(
+            "com.sun.star.awt.Toolkit", self.unoObjs.ctx)
+        self.device = toolkit.createScreenCompatibleDevice(0, 0)
+        deviceInfo = self.device.getInfo()
+        self.pixelsPerPoint = (
+            deviceInfo.PixelPerMeterY / INCHES_PER_METER / POINTS_PER_INCH)
+        self.mm100PerPixel = MM100_PER_METER / deviceInfo.PixelPerMeterX
+
+
+def stringFontType(strData):
+    """Returns the font type of the first character that has a type."""
+    for c in strData:
+        fontType = letters.getFontType(c)
+        if fontType in FONT_PROPERTIES:
+            return fontType
+    return letters.TYPE_STANDARD
+
+
+def pageTextWidth(unoObjs, cursor):
+    """Returns the width between the page margins in hundredths of
+    millimeters for the page where the cursor is, or None if it could not
+    be determined.
+    """
+    try:
+        pageStyles = unoObjs.document.getStyleFamilies().getByName(
+            "PageStyles")
+        pageStyle = pageStyles.getByName(cursor.PageStyleName)
+        return pageStyle.Width - pageStyle.LeftMargin - pageStyle.RightMargin
+    except (NoSuchElementException, RuntimeException, AttributeError) as exc:
+        logger.warning("Could not get page width: %s", exc)
+        return None
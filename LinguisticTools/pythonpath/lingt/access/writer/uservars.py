@@ -24,12 +24,17 @@
 # 30-Jul-18 JDK  Added prefix for Drawing documents.
 # 16-Jun-20 JDK  Added getWithDefault().
 # 23-Jul-20 JDK  User defined document props instead of Writer master fields.
+# 17-Oct-26 JDK  Read all properties at once and keep them in memory.
 
 """
 Store persistent settings in user defined properties of a document.
 
 User defined properties can be managed manually by going to
 File -> Properties -> Custom Properties.
+
+All properties of a document are read with one call when a UserVars object
+is created, and then read from memory.  Values are written to the document
+only when they change.
 """
 import logging
 from com.sun.star.beans.PropertyAttribute import REMOVEABLE
@@ -72,6 +77,7 @@ class UserVars:
         self.otherLogger = otherLogger
         oDocProps = oDoc.getDocumentProperties()
         self.userProps = oDocProps.getUserDefinedProperties()
+        self.cache = theCaches.get(self.userProps)
 
     def userPropsInfo(self):
         return self.userProps.getPropertySetInfo()
@@ -89,21 +95,13 @@ class UserVars:
             stringVal = ""
         else:
             stringVal = str(val)
-        if self.userPropsInfo().hasPropertyByName(varName):
-            self.userProps.setPropertyValue(varName, stringVal)
-        else:
-            self.userProps.addProperty(varName, REMOVEABLE, stringVal)
+        self.cache.store(varName, stringVal)
 
     def get(self, baseVarName):
         """Returns the value of a user variable as a string"""
         varName = self.getVarName(baseVarName)
         self.otherLogger.debug("getUserVar %s", varName)
-        if self.userPropsInfo().hasPropertyByName(varName):
-            stringVal = self.userProps.getPropertyValue(varName)
-            #self.otherLogger.debug("getUserVar =%s", stringVal)
-            return stringVal
-        else:
-            return ""
+        return self.cache.values.get(varName, "")
 
     def getWithDefault(self, varName, defaultVal):
         """Returns default value if user var is empty."""
@@ -137,8 +135,7 @@ class UserVars:
         """
         varName = self.VAR_PREFIX + varName
         self.otherLogger.debug("delUserVar %s", varName)
-        if self.userPropsInfo().hasPropertyByName(varName):
-            self.userProps.removeProperty(varName)
+        if self.cache.delete(varName):
             self.otherLogger.debug("Property deleted")
             return True
         else:
@@ -150,6 +147,68 @@ class UserVars:
         return self
 
 
+class PropertyCache:
+    """The user defined properties of one document, kept in memory.
+    Changes are written to the document right away, but only if the value
+    is different from what the document already has.
+    """
+    def __init__(self, userProps):
+        self.userProps = userProps
+        self.values = dict()
+
+    def load(self):
+        """Read all properties with a single call."""
+        self.values = {
+            propVal.Name: propVal.Value
+            for propVal in self.userProps.getPropertyValues()}
+        logger.debug("Loaded %d user properties.", len(self.values))
+
+    def store(self, varName, stringVal):
+        if varName in self.values:
+            if self.values[varName] == stringVal:
+                return
+            self.userProps.setPropertyValue(varName, stringVal)
+        else:
+            self.userProps.addProperty(varName, REMOVEABLE, stringVal)
+        self.values[varName] = stringVal
+
+    def delete(self, varName):
+        """Returns True if the property existed."""
+        if varName not in self.values:
+            return False
+        self.userProps.removeProperty(varName)
+        del self.values[varName]
+        return True
+
+
+class PropertyCaches:
+    """Keep the caches of recently used documents, so that all UserVars
+    objects of a document share the same values.
+    """
+    MAX_DOCUMENTS = 8
+
+    def __init__(self):
+        self.caches = []  # most recently used last
+
+    def get(self, userProps):
+        """Properties are read again from the document each time,
+        in case they were changed manually since the last time.
+        """
+        for cache in self.caches:
+            if cache.userProps == userProps:
+                self.caches.remove(cache)
+                break
+        else:
+            cache = PropertyCache(userProps)
+            if len(self.caches) >= self.MAX_DOCUMENTS:
+                del self.caches[0]
+        self.caches.append(cache)
+        cache.load()
+        return cache
+
+theCaches = PropertyCaches()
+
+
 def setHasSettings(userVars):
     """Sets HasSettings. Returns True if HasSettings was set previously."""
     varname = "HasSettings"
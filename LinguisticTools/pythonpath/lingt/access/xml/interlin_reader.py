@@ -14,6 +14,7 @@
 # 04-Mar-17 JDK  Added class ToolboxBaseline.
 # 13-Dec-17 JDK  Use collections.OrderedDict for display in a list.
 # 24-Jun-20 JDK  Remember duplicate ref numbers.
+# 17-Oct-26 JDK  Parse several large files in worker processes.
 
 """
 Read interlinear examples, typically used for grammar writeups.
@@ -21,9 +22,10 @@ Read interlinear examples, typically used for grammar writeups.
 import logging
 import os
 import re
-import xml.dom.minidom
-import xml.parsers.expat
+import xml.etree.ElementTree as ET
 
+from lingt.access.common.example_cache import fileSignature
+from lingt.access.common import workers
 from lingt.access.common.file_reader import FileReader
 from lingt.access.writer.uservars import GrammarTags
 from lingt.access.xml import xmlutil
@@ -35,6 +37,10 @@ from lingt.utils import util
 
 logger = logging.getLogger("lingt.access.interlin_reader")
 
+# Starting worker processes takes some time, so only do it when there is
+# enough data for the speedup to be worth it.
+PARALLEL_MIN_BYTES = 2 * 1024 * 1024
+
 
 class InterlinReader(FileReader):
     SUPPORTED_FORMATS = [
@@ -51,8 +57,6 @@ class InterlinReader(FileReader):
         self.suggestions = []  # list of example ref numbers
         self.duplicate_refnums = set()
         self.generateRefIDs = False
-        self.prefix = ""
-        self.use_segnum = False
 
     def getSuggestions(self):
         return self.suggestions
@@ -60,6 +64,29 @@ class InterlinReader(FileReader):
     def getDuplicateRefNumbers(self):
         return self.duplicate_refnums
 
+    def getCacheKey(self):
+        """Returns None if caching should not be used."""
+        if self.generateRefIDs:
+            # Generated IDs depend on what has been read previously.
+            return None
+        filepaths = []
+        fileKeys = []
+        for fileItem in self.config.fileList:
+            signature = fileSignature(fileItem.filepath)
+            if signature is None:
+                return None
+            filepaths.append(signature[0])
+            fileKeys.append((signature, fileItem.prefix, fileItem.use_segnum))
+        fieldTags = GrammarTags(self.userVars).loadUserVars()
+        source = ('interlin', tuple(filepaths))
+        details = (
+            tuple(fileKeys),
+            self.config.separateMorphColumns,
+            self.config.get_showMorphemeBreaks(),
+            self.config.SFM_baseline_word1,
+            tuple(sorted(fieldTags.items())))
+        return source, details
+
     def _initData(self):
         # Dictionary of examples keyed by lowercase ref number.
         # Examples are of type lingex_structs.LingGramExample.
@@ -75,37 +102,87 @@ class InterlinReader(FileReader):
         progressRange.partSize = 3
         self.suggestions = []
         self.duplicate_refnums = set()
-        list_index = 1   # 1-based index of current element in list
+        fieldTags = GrammarTags(self.userVars).loadUserVars()
+        parseSettingsList = []
         for fileItem in self.config.fileList:
-            logger.debug("Parsing file %s", fileItem.filepath)
-            self.prefix = fileItem.prefix
-            self.use_segnum = fileItem.use_segnum
-            self.dom = None
             if not os.path.exists(fileItem.filepath):
                 raise exceptions.FileAccessError(
                     "Cannot find file %s", fileItem.filepath)
-            try:
-                self.dom = xml.dom.minidom.parse(fileItem.filepath)
-            except (xml.parsers.expat.ExpatError, IOError) as exc:
-                raise exceptions.FileAccessError(
-                    "Error reading file %s\n\n%s",
-                    fileItem.filepath, str(exc).capitalize())
-            logger.debug("Parse finished.")
-            progressRange.updatePart(1)
-            filetype = self.get_filetype(fileItem.filepath, self.dom)
-            progressRange.updatePart(2)
-
-            prevLen = len(self.data)
-            if filetype == "toolbox":
-                ToolboxXML(self).read()
-            elif filetype == "fieldworks":
-                FieldworksXML(self).read()
-            logger.debug("Read %d examples.", len(self.data))
-            if len(self.data) == prevLen:
-                raise exceptions.DataNotFoundError(
-                    "Did not find any data in file %s", fileItem.filepath)
-            progressRange.update(list_index)
-            list_index += 1
+            parseSettingsList.append(FileParseSettings(
+                fileItem, self.get_filetype(fileItem.filepath),
+                self.config, fieldTags))
+        progressRange.updatePart(1)
+        parsers = self._startParsing(parseSettingsList)
+        try:
+            list_index = 1   # 1-based index of current element in list
+            for settings, parser in zip(parseSettingsList, parsers):
+                logger.debug("Parsing file %s", settings.filepath)
+                examples = self._getParsedExamples(settings, parser)
+                prevLen = len(self.data)
+                self._addExamples(settings, examples)
+                if settings.filetype == "toolbox":
+                    warning = ToolboxBaseline(settings).words_not_found(
+                        self.data, self.userVars)
+                    if warning:
+                        self.showWarnings([warning])
+                logger.debug("Read %d examples.", len(self.data))
+                if len(self.data) == prevLen:
+                    raise exceptions.DataNotFoundError(
+                        "Did not find any data in file %s", settings.filepath)
+                progressRange.update(list_index)
+                list_index += 1
+        finally:
+            for parser in parsers:
+                parser.cancel()
+
+    def _startParsing(self, parseSettingsList):
+        """Returns a list of futures, one for each file.
+        If there are several large files and worker processes can be
+        used, then the files are parsed in parallel.
+        Otherwise each file gets parsed when its result is requested.
+        """
+        if canParseInParallel(parseSettingsList):
+            futures = workers.startWorkers(
+                parseFile, [(settings,) for settings in parseSettingsList])
+            if futures is not None:
+                return futures
+        return [SerialParser(settings) for settings in parseSettingsList]
+
+    @staticmethod
+    def _getParsedExamples(settings, parser):
+        try:
+            if isinstance(parser, SerialParser):
+                return parser.result()
+            examples = workers.getWorkerResult(parser)
+            if examples is None:
+                # Parse it here to raise any error.
+                return parseFile(settings)
+            return examples
+        except (ET.ParseError, IOError) as exc:
+            raise exceptions.FileAccessError(
+                "Error reading file %s\n\n%s",
+                settings.filepath, str(exc).capitalize())
+
+    def _addExamples(self, settings, examples):
+        """Merge examples of one file into self.data.
+        This is always done in file order, so that generated ref numbers
+        and detected duplicates do not depend on how the files were parsed.
+        """
+        addedSuggestion = False
+        for ex in examples:
+            if (not ex.refText and self.generateRefIDs
+                    and settings.filetype == "toolbox"):
+                InterlinReader.autoRefID += 1
+                ex.refText = settings.prefix + str(InterlinReader.autoRefID)
+            if ex.refText:
+                key = ex.refText.lower()
+                if key in self.data:
+                    self.duplicate_refnums.add(key)
+                else:
+                    self.data[key] = ex
+                    if not addedSuggestion:
+                        self.suggestions.append(ex.refText)
+                        addedSuggestion = True
 
     def grabWords(self, thingsToGrab):
         """Return values in a flat list of words."""
@@ -129,30 +206,30 @@ class InterlinReader(FileReader):
         logger.debug("got %d words", len(words))
         return words
 
-    def get_filetype(self, filepath, dom):
-        """Note to developer: Try to make it so that this function
+    def get_filetype(self, filepath):
+        """Determines file type by looking at the first few elements,
+        without parsing the entire file.
+
+        Note to developer: Try to make it so that this function
         can never silently fail, even if for example a JPEG file is attempted.
         """
         logger.debug(util.funcName('begin'))
         filetype = ""
-        if dom is None:
-            raise exceptions.FileAccessError("Error with file: %s", filepath)
-        docElem = dom.documentElement
-        docElemChild = None
-        if docElem.hasChildNodes():
-            if len(docElem.childNodes) >= 2:
-                docElemChild = docElem.childNodes[1]
-            else:
-                docElemChild = docElem.childNodes[0]
-        if not docElemChild:
+        try:
+            docTag, docChildTag = xmlutil.peekDocTags(filepath)
+        except (ET.ParseError, IOError) as exc:
+            raise exceptions.FileAccessError(
+                "Error reading file %s\n\n%s",
+                filepath, str(exc).capitalize())
+        if not docChildTag:
             raise exceptions.FileAccessError(
                 "File does not seem to be from Toolbox or FieldWorks: %s",
                 filepath)
-        elif (docElem.nodeName == "database"
-              and re.match(r"[a-zA-Z0-9]+Group", docElemChild.nodeName)):
+        elif (docTag == "database"
+              and re.match(r"[a-zA-Z0-9]+Group", docChildTag)):
             filetype = "toolbox"
-        elif (docElem.nodeName == "document"
-              and docElemChild.nodeName == "interlinear-text"):
+        elif (docTag == "document"
+              and docChildTag == "interlinear-text"):
             filetype = "fieldworks"
         else:
             raise exceptions.FileAccessError(
@@ -162,91 +239,142 @@ class InterlinReader(FileReader):
         return filetype
 
 
+class FileParseSettings:
+    """Everything needed to parse one file.
+    This does not refer to any UNO objects, so it can be passed to
+    another process.
+    """
+    def __init__(self, fileItem, filetype, config, fieldTags):
+        """:param config: type fileitemlist.InterlinInputSettings"""
+        self.filepath = fileItem.filepath
+        self.filetype = filetype
+        self.prefix = fileItem.prefix
+        self.use_segnum = fileItem.use_segnum
+        self.separateMorphColumns = config.separateMorphColumns
+        self.showMorphemeBreaks = config.get_showMorphemeBreaks()
+        self.SFM_baseline_word1 = config.SFM_baseline_word1
+        self.fieldTags = dict(fieldTags)
+
+
+def parseFile(settings):
+    """Returns a list of lingex_structs.LingGramExample in file order.
+    This may be called in a worker process.
+    Raises ET.ParseError or IOError.
+    """
+    if settings.filetype == "toolbox":
+        return ToolboxXML(settings).read()
+    return FieldworksXML(settings).read()
+
+
+def canParseInParallel(parseSettingsList):
+    """Worker processes need a python interpreter, which may not be
+    available when running inside Office.
+    """
+    if len(parseSettingsList) < 2 or (os.cpu_count() or 1) < 2:
+        return False
+    if workers.pythonInterpreter() is None:
+        return False
+    totalBytes = sum(
+        os.path.getsize(settings.filepath) for settings in parseSettingsList)
+    return totalBytes >= PARALLEL_MIN_BYTES
+
+
+class SerialParser:
+    """Has the same interface as the futures used for parallel parsing,
+    but parses in the current process when the result is requested.
+    """
+    def __init__(self, settings):
+        self.settings = settings
+
+    def result(self):
+        return parseFile(self.settings)
+
+    def cancel(self):
+        pass
+
+
 class ToolboxXML:
     """Toolbox XML seems to follow this rule:
     If a marker has children, then it occurs within a group named after
     itself, and it is the first item.
     If there are other things associated with it,
     then they will also be in the group.
+
+    The file is read incrementally, one ref number group at a time.
     """
-    def __init__(self, mainReader):
-        self.dom = mainReader.dom
-        self.data = mainReader.data
-        self.suggestions = mainReader.suggestions
-        self.duplicate_refnums = mainReader.duplicate_refnums
-        self.baseline = ToolboxBaseline(mainReader)
-        self.config = mainReader.config
-        self.generateRefIDs = mainReader.generateRefIDs
-        self.prefix = mainReader.prefix
-        self.fieldTags = GrammarTags(mainReader.userVars).loadUserVars()
+    def __init__(self, settings):
+        """:param settings: type FileParseSettings"""
+        self.settings = settings
+        self.baseline = ToolboxBaseline(settings)
+        self.prefix = settings.prefix
+        self.fieldTags = settings.fieldTags
+        self.examples = []
         self.ex = None  # the current example
 
     def read(self):
+        """Returns a list of examples.
+        Raises ET.ParseError or IOError.
+        """
         logger.debug("reading toolbox XML file")
-        addedSuggestion = False
-        sentences = self.dom.getElementsByTagName(
-            self.fieldTags['ref'] + "Group")
-        for sentence in sentences:
-            self.ex = lingex_structs.LingGramExample()
-            self.handleSentence(sentence)
-            if self.ex.refText:
-                key = self.ex.refText.lower()
-                if key in self.data:
-                    self.duplicate_refnums.add(key)
-                else:
-                    self.data[key] = self.ex
-                    if not addedSuggestion:
-                        self.suggestions.append(self.ex.refText)
-                        addedSuggestion = True
-        self.baseline.verify_words_found()
+        self.examples = []
+        groupTag = self.fieldTags['ref'] + "Group"
+        with open(self.settings.filepath, 'rb') as infile:
+            for topGroup in xmlutil.iterparseTopElements(infile, groupTag):
+                # Nested groups are unusual, but read them in document
+                # order just as for non-nested groups.
+                for sentence in topGroup.iter(groupTag):
+                    self.ex = lingex_structs.LingGramExample()
+                    self.handleSentence(sentence)
+                    self.examples.append(self.ex)
+        return self.examples
 
     def handleSentence(self, sentence):
-        self.ex.refText = xmlutil.getTextByTagName(
+        self.ex.refText = xmlutil.getEtreeTextByTagName(
             sentence, self.fieldTags['ref'])
-        self.ex.freeTrans = xmlutil.getTextByTagName(
+        self.ex.freeTrans = xmlutil.getEtreeTextByTagName(
             sentence, self.fieldTags['ft'])
-        words = sentence.getElementsByTagName(self.baseline.word_group)
-        orthoText = xmlutil.getTextByTagName(sentence, self.baseline.ortho_tag)
+        words = xmlutil.getEtreeElementsByTagName(
+            sentence, self.baseline.word_group)
+        orthoText = xmlutil.getEtreeTextByTagName(
+            sentence, self.baseline.ortho_tag)
         orthoWords = orthoText.split()
         for word in words:
             self.handleWord(word, len(words), orthoText, orthoWords)
-        if not self.ex.refText and self.generateRefIDs:
-            InterlinReader.autoRefID += 1
-            self.ex.refText = str(InterlinReader.autoRefID)
+        # If there is no ref number, one may be generated when merging.
         if self.ex.refText and self.prefix:
             self.ex.refText = self.prefix + self.ex.refText
 
     def handleWord(self, word, num_words, orthoText, orthoWords):
-        wordText = xmlutil.getTextByTagName(word, self.baseline.word_tag)
+        wordText = xmlutil.getEtreeTextByTagName(word, self.baseline.word_tag)
         orthoWord = ""
         if orthoWords:
             if num_words == 1:
                 orthoWord = orthoText
             else:
                 orthoWord = orthoWords.pop(0)
-        morphemes = word.getElementsByTagName(self.baseline.morph_group)
+        morphemes = xmlutil.getEtreeElementsByTagName(
+            word, self.baseline.morph_group)
         mergedMorphemes = MergedMorphemes()
         for morpheme in morphemes:
             morph = lingex_structs.LingGramMorph()
-            morph.text1 = xmlutil.getTextByTagName(
+            morph.text1 = xmlutil.getEtreeTextByTagName(
                 morpheme, self.fieldTags['morph1'])
-            morph.text2 = xmlutil.getTextByTagName(
+            morph.text2 = xmlutil.getEtreeTextByTagName(
                 morpheme, self.fieldTags['morph2'])
-            morph.gloss = xmlutil.getTextByTagName(
+            morph.gloss = xmlutil.getEtreeTextByTagName(
                 morpheme, self.fieldTags['gloss'])
-            morph.pos = xmlutil.getTextByTagName(
+            morph.pos = xmlutil.getEtreeTextByTagName(
                 morpheme, self.fieldTags['pos'])
-            if self.config.separateMorphColumns:
+            if self.settings.separateMorphColumns:
                 ## store each morpheme separately
                 self.ex.appendMorphObj(morph)
             else:
                 ## merge the morphemes
                 mergedMorphemes.add(morph)
-        if not self.config.separateMorphColumns:
+        if not self.settings.separateMorphColumns:
             self.ex.appendMorphObj(
-                mergedMorphemes.getMorph(
-                    self.config.get_showMorphemeBreaks()))
-        if self.config.SFM_baseline_word1:
+                mergedMorphemes.getMorph(self.settings.showMorphemeBreaks))
+        if self.settings.SFM_baseline_word1:
             self.ex.appendWord(wordText, orthoWord)
         else:
             self.ex.appendWord(orthoWord, wordText)
@@ -255,12 +383,10 @@ class ToolboxXML:
 class ToolboxBaseline:
     """Baseline means which words the morphemes are grouped by."""
 
-    def __init__(self, mainReader):
-        self.msgbox = mainReader.msgbox
-        self.userVars = mainReader.userVars
-        self.config = mainReader.config
-        self.fieldTags = GrammarTags(mainReader.userVars).loadUserVars()
-        self.data = mainReader.data
+    def __init__(self, settings):
+        """:param settings: type FileParseSettings"""
+        self.SFM_baseline_word1 = settings.SFM_baseline_word1
+        self.fieldTags = settings.fieldTags
         self.word_group = ''
         self.morph_group = ''
         self.word_tag = ''
@@ -268,7 +394,7 @@ class ToolboxBaseline:
         self._determine_tags()
 
     def _determine_tags(self):
-        if self.config.SFM_baseline_word1:
+        if self.SFM_baseline_word1:
             word_tag = 'word1'
             morph_tag = 'morph1'
             ortho_tag = 'word2'
@@ -281,25 +407,29 @@ class ToolboxBaseline:
         self.word_tag = self.fieldTags[word_tag]
         self.ortho_tag = self.fieldTags[ortho_tag]
 
-    def verify_words_found(self):
-        if not len(self.data):
-            return
-        for ex in self.data.values():
+    def words_not_found(self, data, userVars):
+        """:param data: examples read so far
+        :returns: a warning as (message, args) if the examples have no
+            words, otherwise None
+        """
+        if not len(data):
+            return None
+        for ex in data.values():
             if len(ex.wordList):
-                return
-        if self.config.SFM_baseline_word1:
+                return None
+        if self.SFM_baseline_word1:
             current_wordline = 1
             other_wordline = 2
         else:
             current_wordline = 2
             other_wordline = 1
-        self.msgbox.display(
+        return (
             "Could not find any words in '%s'.  "
             "Try changing %s%d to use a different marker, "
             "or change %s to 'WordLine%d'.",
-            self.word_group,
-            self.userVars.getVarName("SFMarker_Word"), current_wordline,
-            self.userVars.getVarName("SFM_Baseline"), other_wordline)
+            (self.word_group,
+             userVars.getVarName("SFMarker_Word"), current_wordline,
+             userVars.getVarName("SFM_Baseline"), other_wordline))
 
 
 def singleMorphemeWord(word):
@@ -307,77 +437,91 @@ def singleMorphemeWord(word):
     attributes instead of morpheme-level.
     """
     morph = lingex_structs.LingGramMorph()
-    items = word.getElementsByTagName("item")
-    for item in items:
-        if item.attributes is None:
-            continue
-        itemType = item.getAttribute("type")
+    for item in word.iter("item"):
+        itemType = item.get("type")
         if itemType == "gls":
             if morph.gloss and not morph.text1:
                 morph.text1 = morph.gloss
-            morph.gloss = xmlutil.getElemText(item)
+            morph.gloss = xmlutil.getEtreeText(item)
         elif itemType == "msa":
-            morph.pos = xmlutil.getElemText(item)
+            morph.pos = xmlutil.getEtreeText(item)
     return morph
 
 class FieldworksXML:
-    """Parse Fieldworks XML file and store interlinear examples."""
-    def __init__(self, mainReader):
-        self.dom = mainReader.dom
-        self.data = mainReader.data
-        self.suggestions = mainReader.suggestions
-        self.duplicate_refnums = mainReader.duplicate_refnums
-        self.config = mainReader.config
-        self.prefix = mainReader.prefix
-        self.use_segnum = mainReader.use_segnum
+    """Parse Fieldworks XML file and store interlinear examples.
+    The file is read incrementally, one phrase at a time, so that large
+    exports do not need to be loaded into memory all at once.
+    """
+    def __init__(self, settings):
+        """:param settings: type FileParseSettings"""
+        self.settings = settings
+        self.prefix = settings.prefix
+        self.use_segnum = settings.use_segnum
+        self.examples = []
         self.ex = None  # the current example
 
     def read(self):
+        """Returns a list of examples.
+        Raises ET.ParseError or IOError.
+        """
         logger.debug("reading fieldworks XML file")
-        paragraphs = self.dom.getElementsByTagName("paragraph")
+        self.examples = []
         refTextPara = 1
-        addedSuggestion = False
-        for paragraph in paragraphs:
-            sentences = paragraph.getElementsByTagName("phrase")
-            refTextSent = 1
-            for sentence in sentences:
-                self.ex = lingex_structs.LingGramExample()
-                if not self.use_segnum:
-                    self.ex.refText = "%s" % refTextPara
-                    if sentences.length > 1:
-                        self.ex.refText += ".%s" % refTextSent
-                self.handleSentence(sentence)
-                if self.ex.refText:
-                    key = self.ex.refText.lower()
-                    if key in self.data:
-                        self.duplicate_refnums.add(key)
-                    else:
-                        self.data[key] = self.ex
-                        if not addedSuggestion:
-                            self.suggestions.append(self.ex.refText)
-                            addedSuggestion = True
-                refTextSent += 1
-            refTextPara += 1
+        paraExamples = []  # examples of the current paragraph
+        parents = []
+        with open(self.settings.filepath, 'rb') as infile:
+            for event, elem in ET.iterparse(
+                    infile, events=("start", "end")):
+                if event == "start":
+                    parents.append(elem)
+                    if elem.tag == "paragraph":
+                        paraExamples = []
+                    continue
+                parents.pop()
+                if elem.tag == "phrase" and "paragraph" in (
+                        parent.tag for parent in parents):
+                    self.ex = lingex_structs.LingGramExample()
+                    self.handleSentence(elem)
+                    paraExamples.append(self.ex)
+                elif elem.tag == "paragraph":
+                    self.addParagraph(paraExamples, refTextPara)
+                    refTextPara += 1
+                else:
+                    continue
+                # Finished with this element, so discard it.
+                elem.clear()
+                if parents:
+                    parents[-1].remove(elem)
+        return self.examples
+
+    def addParagraph(self, paraExamples, refTextPara):
+        """Number the examples of a paragraph.
+        Ref numbers depend on how many phrases are in the paragraph,
+        so this is done after the entire paragraph has been read.
+        """
+        refTextSent = 1
+        for ex in paraExamples:
+            if not self.use_segnum:
+                ex.refText = "%s" % refTextPara
+                if len(paraExamples) > 1:
+                    ex.refText += ".%s" % refTextSent
+            if self.prefix:
+                ex.refText = self.prefix + ex.refText
+            self.examples.append(ex)
+            refTextSent += 1
 
     def handleSentence(self, sentence):
         logger.debug(util.funcName('begin'))
         if self.use_segnum:
-            for childNode in sentence.childNodes:
-                if not childNode.attributes:
-                    continue
-                if childNode.getAttribute("type") == "segnum":
-                    self.ex.refText = xmlutil.getElemText(childNode).strip()
+            for childNode in sentence:
+                if childNode.get("type") == "segnum":
+                    self.ex.refText = xmlutil.getEtreeText(childNode).strip()
                     break
-        words = sentence.getElementsByTagName("word")
-        for childNode in sentence.childNodes:
-            if childNode.attributes is None:
-                continue
-            if childNode.getAttribute("type") == "gls":
-                self.ex.freeTrans = xmlutil.getElemText(childNode)
-        for word in words:
+        for childNode in sentence:
+            if childNode.get("type") == "gls":
+                self.ex.freeTrans = xmlutil.getEtreeText(childNode)
+        for word in sentence.iter("word"):
             self.handleWord(word)
-        if self.prefix:
-            self.ex.refText = self.prefix + self.ex.refText
 
     def handleWord(self, word):
         #logger.debug(util.funcName('begin'))
@@ -385,18 +529,17 @@ class FieldworksXML:
         wordText2 = ""
         punct = None
         is_first_text = True
-        for childNode in word.childNodes:
-            if not childNode.attributes:
-                continue
-            elif childNode.getAttribute("type") == "txt":
-                text = xmlutil.getElemText(childNode)
+        for childNode in word:
+            itemType = childNode.get("type")
+            if itemType == "txt":
+                text = xmlutil.getEtreeText(childNode)
                 if is_first_text:
                     wordText1 = text
                     is_first_text = False
                 else:
                     wordText2 = text
-            elif childNode.getAttribute("type") == "punct":
-                punct = xmlutil.getElemText(childNode)
+            elif itemType == "punct":
+                punct = xmlutil.getEtreeText(childNode)
                 break
         if punct:
             if self.ex.wordList:
@@ -405,8 +548,8 @@ class FieldworksXML:
                 self.ex.appendWord(punct, punct)
             #logger.debug(util.funcName('return', args=punct))
             return
-        morphemes = word.getElementsByTagName("morph")
-        if len(morphemes):
+        morphemes = list(word.iter("morph"))
+        if morphemes:
             self.handleWordMorphemes(morphemes)
         else:
             self.ex.appendMorphObj(singleMorphemeWord(word))
@@ -417,15 +560,12 @@ class FieldworksXML:
         #logger.debug(util.funcName('begin'))
         mergedMorphemes = MergedMorphemes()
         for morpheme in morphemes:
-            items = morpheme.getElementsByTagName("item")
             morph = lingex_structs.LingGramMorph()
             is_first_text = True
-            for item in items:
-                if item.attributes is None:
-                    continue
-                itemType = item.getAttribute("type")
+            for item in morpheme.iter("item"):
+                itemType = item.get("type")
                 if itemType == "txt":
-                    text = xmlutil.getElemText(item)
+                    text = xmlutil.getEtreeText(item)
                     if is_first_text:
                         morph.text1 = text
                         is_first_text = False
@@ -435,21 +575,20 @@ class FieldworksXML:
                     # lex entry, typically same as morph text
                     pass
                 elif itemType == "gls":
-                    morph.gloss = xmlutil.getElemText(item)
+                    morph.gloss = xmlutil.getEtreeText(item)
                 elif itemType == "msa":
-                    morph.pos = xmlutil.getElemText(item)
+                    morph.pos = xmlutil.getEtreeText(item)
 
-            if self.config.separateMorphColumns:
+            if self.settings.separateMorphColumns:
                 ## store each morpheme separately
                 #logger.debug(morph.text)
                 self.ex.appendMorphObj(morph)
             else:
                 #logger.debug(morph.text)
                 mergedMorphemes.add(morph)
-        if not self.config.separateMorphColumns:
+        if not self.settings.separateMorphColumns:
             self.ex.appendMorphObj(
-                mergedMorphemes.getMorph(
-                    self.config.get_showMorphemeBreaks()))
+                mergedMorphemes.getMorph(self.settings.showMorphemeBreaks))
 
 
 class MergedMorphemes(lingex_structs.LingGramMorph):
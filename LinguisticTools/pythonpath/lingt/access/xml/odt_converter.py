@@ -14,11 +14,19 @@
 # 28-Jul-16 JDK  Handle ScopeType.PARASTYLE.
 # 29-Jul-16 JDK  Handle any ScopeType value.
 # 30-Sep-16 JDK  Add conversion functions for internal names.
+# 17-Oct-26 JDK  XML files can be read and changed in memory.
+# 17-Oct-26 JDK  Read without a progress bar when there are no UNO objects.
+# 17-Oct-26 JDK  Read and write XML in one streaming pass instead of a DOM.
+# 17-Oct-26 JDK  Use letters.splitByFontType().
 
 """
 Read and change an ODT file in XML format.
 Call SEC_wrapper to do engine-based conversion.
 
+Files are read with SAX rather than being loaded into a DOM, because
+content.xml of a long document can be very large.  Changes are written
+while parsing the file again.
+
 This module exports:
     OdtReader
     OdtChanger
@@ -28,11 +36,11 @@ import io
 import logging
 import os
 import re
-import xml.dom.minidom
-import xml.parsers.expat
+import xml.sax
+import xml.sax.handler
+from xml.sax.saxutils import XMLGenerator
 
 from lingt.access.common.file_reader import FileReader
-from lingt.access.xml import xmlutil
 from lingt.app import exceptions
 from lingt.app.data.bulkconv_structs import ProcessingStyleItem
 from lingt.app.data.bulkconv_structs import StyleType, ScopeType
@@ -54,16 +62,17 @@ class OdtReader(FileReader):
 
     SUPPORTED_FORMATS = [("xml", "Unzipped Open Document Format (.odt)"),]
 
-    def __init__(self, srcdir, scopeType, unoObjs):
+    def __init__(self, srcdir, scopeType, unoObjs, xmlFiles=None):
         """
         :param srcdir: will read and write the same XML files
         :param scopeType: lingt.app.data.bulkconv_structs.ScopeType
+        :param xmlFiles: dict of file contents keyed by names such as
+            'content.xml', to use instead of files in srcdir
         """
         FileReader.__init__(self, unoObjs)
         self.srcdir = srcdir
+        self.xmlFiles = xmlFiles
         self.defaultStyleItem = None
-        self.stylesDom = None
-        self.contentDom = None
         self.scopeType = scopeType
         self.stylesDict = {}  # keys style name, value ProcessingStyleItem
         self.styleReader = StyleReader(self.stylesDict, scopeType)
@@ -82,77 +91,215 @@ class OdtReader(FileReader):
                 "Searched by %s but did not find anything.", scope_string)
 
     def _read(self):
-        self.stylesDom = self.loadFile(
-            os.path.join(self.srcdir, 'styles.xml'))
-        self.progressBar.updatePercent(30)
-        self.readStylesFile(self.stylesDom)
-        self.progressBar.updatePercent(35)
-
-        self.contentDom = self.loadFile(
-            os.path.join(self.srcdir, 'content.xml'))
-        self.progressBar.updatePercent(45)
-        self.readContentFile(self.contentDom)
-        self.progressBar.updatePercent(50)
-
-    def loadFile(self, filepath):
-        """Returns dom, raises exceptions.FileAccessError."""
+        self._updatePercent(30)
+        self.readStylesFile()
+        self._updatePercent(35)
+        self.readContentFile()
+        self._updatePercent(50)
+
+    def _updatePercent(self, percent):
+        if self.progressBar:
+            self.progressBar.updatePercent(percent)
+
+    def loadXml(self, filename):
+        """Returns the contents of the file, raises exceptions.FileAccessError.
+        Files in srcdir are read into self.xmlFiles the first time.
+        """
+        if self.xmlFiles is None:
+            self.xmlFiles = {}
+        if filename in self.xmlFiles:
+            return self.xmlFiles[filename]
+        if self.srcdir is None:
+            raise exceptions.FileAccessError(
+                "Cannot find file %s", filename)
+        filepath = os.path.join(self.srcdir, filename)
         logger.debug(util.funcName('begin', args=filepath))
         if not os.path.exists(filepath):
             raise exceptions.FileAccessError(
                 "Cannot find file %s", filepath)
-        dom = None
+        with open(filepath, 'rb') as infile:
+            self.xmlFiles[filename] = infile.read()
+        logger.debug(util.funcName('end'))
+        return self.xmlFiles[filename]
+
+    def parseXml(self, filename, handler):
+        """Raises exceptions.FileAccessError."""
+        contents = self.loadXml(filename)
         try:
-            dom = xml.dom.minidom.parse(filepath)
-        except xml.parsers.expat.ExpatError as exc:
+            xml.sax.parseString(contents, handler)
+        except xml.sax.SAXParseException as exc:
             raise exceptions.FileAccessError(
                 "Error reading file %s\n\n%s",
-                filepath, str(exc).capitalize())
-        if dom is None:
-            raise exceptions.FileAccessError(
-                "Error reading file %s", filepath)
-        logger.debug(util.funcName('end'))
-        return dom
+                filename, str(exc).capitalize())
 
-    def readStylesFile(self, dom):
+    def readStylesFile(self):
         """Read in styles.xml which defines named styles."""
         logger.debug(util.funcName('begin'))
-        for style in dom.getElementsByTagName("style:default-style"):
-            if style.getAttribute("style:family") == "paragraph":
+        collector = StyleCollector(("style:default-style", "style:style"))
+        self.parseXml('styles.xml', collector)
+        for style in collector.elements:
+            if (style.tagName == "style:default-style"
+                    and style.getAttribute("style:family") == "paragraph"):
                 self.defaultStyleItem = (
                     self.styleReader.read_default_item(style))
-        for style in dom.getElementsByTagName("style:style"):
-            self.styleReader.add_named_style(style)
+        for style in collector.elements:
+            if style.tagName == "style:style":
+                self.styleReader.add_named_style(style)
         logger.debug(util.funcName('end'))
 
-    def readContentFile(self, dom):
+    def readContentFile(self):
         """Read in content.xml."""
         logger.debug(util.funcName('begin'))
-        # Unlike common styles, automatic styles are not visible to the user.
-        auto_styles = dom.getElementsByTagName("office:automatic-styles")[0]
-        if auto_styles:
-            for style in auto_styles.childNodes:
-                self.styleReader.read_text_props(
-                    style, BasicStyleType.AUTOMATIC)
-        for paragraph in xmlutil.getElementsByTagNames(
-                dom, ["text:h", "text:p"]):
-            xmlStyleName = paragraph.getAttribute("text:style-name")
-            paraStyleItem = self.stylesDict.get(
-                xmlStyleName, self.defaultStyleItem)
-            para_texts = xmlutil.getElemTextList(paragraph)
-            styleItemAppender = StyleItemAppender(
-                self.data, paraStyleItem, self.scopeType)
-            styleItemAppender.add_texts(para_texts)
-            for span in paragraph.getElementsByTagName("text:span"):
-                xmlStyleName = span.getAttribute("text:style-name")
-                spanStyleItem = self.stylesDict.get(
-                    xmlStyleName, paraStyleItem)
-                span_texts = xmlutil.getElemTextList(span)
-                styleItemAppender = StyleItemAppender(
-                    self.data, spanStyleItem, self.scopeType)
-                styleItemAppender.add_texts(span_texts)
+        self.parseXml('content.xml', ContentReadHandler(self))
         logger.debug(util.funcName('end'))
 
 
+class XmlElement:
+    """A small part of an XML file, with enough of the DOM interface to be
+    used by StyleReader.
+    """
+    def __init__(self, tagName, attrs):
+        self.tagName = tagName
+        self.attrs = dict(attrs)
+        self.children = []
+
+    def getAttribute(self, name):
+        """Like the DOM method, returns an empty string if not found."""
+        return self.attrs.get(name, "")
+
+    def getElementsByTagName(self, name):
+        """Like the DOM method, returns descendants in document order."""
+        elems = []
+        for child in self.children:
+            if child.tagName == name:
+                elems.append(child)
+            elems.extend(child.getElementsByTagName(name))
+        return elems
+
+
+class StyleCollector(xml.sax.handler.ContentHandler):
+    """Builds an XmlElement for each element that has one of the given tag
+    names, along with its descendants.  Everything else is skipped.
+    """
+    def __init__(self, tagNames):
+        xml.sax.handler.ContentHandler.__init__(self)
+        self.tagNames = tagNames
+        self.elements = []
+        self.openElements = []
+
+    def startElement(self, name, attrs):
+        if self.openElements:
+            elem = XmlElement(name, attrs)
+            self.openElements[-1].children.append(elem)
+            self.openElements.append(elem)
+        elif name in self.tagNames:
+            elem = XmlElement(name, attrs)
+            self.elements.append(elem)
+            self.openElements.append(elem)
+
+    def endElement(self, name):
+        if self.openElements:
+            self.openElements.pop()
+
+
+class OdtTextHandler(xml.sax.handler.ContentHandler):
+    """Determines the effective style of text in content.xml.
+    Text is handled one text node at a time, where a text node is all of
+    the characters between two tags.
+
+    Text directly in a paragraph has the paragraph style.
+    Text directly in a span has the span style, or if that is not found,
+    the style of the paragraph that contains the span.
+    Other text, for example directly in a link, is not styled.
+    """
+    PARAGRAPH_TAGS = ("text:h", "text:p")
+
+    def __init__(self, stylesDict, defaultStyleItem):
+        xml.sax.handler.ContentHandler.__init__(self)
+        self.stylesDict = stylesDict
+        self.defaultStyleItem = defaultStyleItem
+        self.textStyleItems = []  # for each open element, or None
+        self.paraStyleItems = []  # for each open paragraph
+        self.textChunks = []
+
+    def startElement(self, name, attrs):
+        self.flushText()
+        styleItem = None
+        if name in self.PARAGRAPH_TAGS:
+            styleItem = self.stylesDict.get(
+                attrs.get("text:style-name", ""), self.defaultStyleItem)
+            self.paraStyleItems.append(styleItem)
+        elif name == "text:span" and self.paraStyleItems:
+            styleItem = self.stylesDict.get(
+                attrs.get("text:style-name", ""), self.paraStyleItems[-1])
+        self.textStyleItems.append(styleItem)
+
+    def endElement(self, name):
+        self.flushText()
+        self.textStyleItems.pop()
+        if name in self.PARAGRAPH_TAGS:
+            self.paraStyleItems.pop()
+
+    def characters(self, content):
+        self.textChunks.append(content)
+
+    def flushText(self):
+        if not self.textChunks:
+            return
+        textval = "".join(self.textChunks)
+        self.textChunks = []
+        styleItem = None
+        if self.textStyleItems:
+            styleItem = self.textStyleItems[-1]
+        self.handleText(textval, styleItem)
+
+    def handleText(self, textval, styleItem):
+        """:param styleItem: ProcessingStyleItem, or None if not styled"""
+        raise NotImplementedError()
+
+
+class ContentReadHandler(OdtTextHandler):
+    """Reads content.xml for an OdtReader.
+    Automatic styles come before the body of the document, so they are
+    known by the time the text is read.
+    """
+    def __init__(self, reader):
+        OdtTextHandler.__init__(
+            self, reader.stylesDict, reader.defaultStyleItem)
+        self.reader = reader
+        self.inAutoStyles = False
+        self.openStyles = []  # XmlElement of the current automatic style
+
+    def startElement(self, name, attrs):
+        OdtTextHandler.startElement(self, name, attrs)
+        if name == "office:automatic-styles":
+            self.inAutoStyles = True
+        elif self.inAutoStyles:
+            elem = XmlElement(name, attrs)
+            if self.openStyles:
+                self.openStyles[-1].children.append(elem)
+            self.openStyles.append(elem)
+
+    def endElement(self, name):
+        OdtTextHandler.endElement(self, name)
+        if name == "office:automatic-styles":
+            self.inAutoStyles = False
+        elif self.inAutoStyles:
+            style = self.openStyles.pop()
+            if not self.openStyles:
+                # Unlike common styles, automatic styles are not visible
+                # to the user.
+                self.reader.styleReader.read_text_props(
+                    style, BasicStyleType.AUTOMATIC)
+
+    def handleText(self, textval, styleItem):
+        if styleItem is None:
+            return
+        styleItemAppender = StyleItemAppender(
+            self.reader.data, styleItem, self.reader.scopeType)
+        styleItemAppender.add_texts([textval])
+
+
 def stylename_to_internal(stylename):
     """
     Returns the internal name of named style,
@@ -336,21 +483,9 @@ class StyleItemAppender:
         """
         self.styleItemDict = {}
         for textval in textvals:
-            text_of_one_type = ""
-            curFontType = letters.TYPE_INDETERMINATE
-            for c in textval:
-                nextFontType = letters.getFontType(c, curFontType)
-                if (nextFontType == curFontType
-                        or curFontType == letters.TYPE_INDETERMINATE
-                        or nextFontType == letters.TYPE_INDETERMINATE):
-                    text_of_one_type += c
-                elif text_of_one_type:
-                    self._append_text_of_one_type(
-                        text_of_one_type, curFontType)
-                    text_of_one_type = ""
-                curFontType = nextFontType
-            if text_of_one_type:
-                self._append_text_of_one_type(text_of_one_type, curFontType)
+            for text_of_one_type, fontType in letters.splitByFontType(
+                    textval):
+                self._append_text_of_one_type(text_of_one_type, fontType)
         return list(self.styleItemDict.values())
 
     def _append_text_of_one_type(self, textval, curFontType):
@@ -398,11 +533,13 @@ class StyleItemAppender:
             self.styleItems.append(newItem)
 
 
-def setNodeAttribute(node, xmlattr, newval):
-    """Returns number of changes made."""
-    current_val = node.getAttribute(xmlattr)
+def setAttribute(attrs, xmlattr, newval):
+    """Changes a dict of attributes.
+    Returns number of changes made.
+    """
+    current_val = attrs.get(xmlattr, "")
     if current_val != newval:
-        node.setAttribute(xmlattr, newval)
+        attrs[xmlattr] = newval
         return 1
     return 0
 
@@ -415,95 +552,77 @@ class OdtChanger:
         self.reader = reader
         self.styleChanges = styleChanges
         self.scopeType = reader.scopeType
+        self.effectiveChanges = {}  # keys id of ProcessingStyleItem
 
     def makeChanges(self):
+        """The XML files of the reader are parsed again and written with
+        changes.  If there are any changes, the new files replace the
+        reader's files in memory, and also in its folder if it has one.
+        """
         logger.debug(util.funcName('begin'))
-        num_changes = self.change_text(self.reader.contentDom)
-        num_changes += self.change_styles(
-            self.reader.contentDom, self.reader.stylesDom)
+        newFiles = {}
+        num_changes = 0
+        for filename, styleTag, changeText in (
+                ('content.xml', "style:style", True),
+                ('styles.xml', "style:default-style", False)):
+            outfile = io.BytesIO()
+            writer = ChangeWriter(self, outfile, styleTag, changeText)
+            self.reader.parseXml(filename, writer)
+            num_changes += writer.num_changes
+            newFiles[filename] = outfile.getvalue()
         if num_changes == 0:
             return num_changes
-        with io.open(os.path.join(self.reader.srcdir, 'styles.xml'),
-                     mode="wt", encoding="utf-8") as f:
-            self.reader.stylesDom.writexml(f, encoding="utf-8")
-        with io.open(os.path.join(self.reader.srcdir, 'content.xml'),
-                     mode="wt", encoding="utf-8") as f:
-            self.reader.contentDom.writexml(f, encoding="utf-8")
+        self.reader.xmlFiles.update(newFiles)
+        if self.reader.srcdir is not None:
+            for filename, contents in newFiles.items():
+                with open(os.path.join(self.reader.srcdir, filename),
+                          'wb') as outfile:
+                    outfile.write(contents)
         logger.debug(util.funcName('end'))
         return num_changes
 
-    def change_text(self, dom):
-        """Convert text in content.xml with EncConverters."""
-        logger.debug(util.funcName('begin'))
+    def change_text(self, textval, styleItem):
+        """Convert text with EncConverters.
+        Returns the new value, or None if there is no change.
+        """
+        if styleItem is None:
+            return None
+        key = id(styleItem)
+        if key not in self.effectiveChanges:
+            self.effectiveChanges[key] = self.effective_styleChange(styleItem)
+        styleChange = self.effectiveChanges[key]
+        if styleChange:
+            return styleChange.converted_data.get(textval)
+        return None
+
+    def change_font_face(self, attrs):
+        """Change a style:font-face element.
+        Returns number of changes made.
+        """
         num_changes = 0
-        for paragraph in xmlutil.getElementsByTagNames(
-                dom, ["text:h", "text:p"]):
-            xmlStyleName = paragraph.getAttribute("text:style-name")
-            #logger.debug("para style name %s", xmlStyleName)
-            paraStyleItem = self.reader.stylesDict.get(
-                xmlStyleName, self.reader.defaultStyleItem)
-            paraStyleChange = self.effective_styleChange(paraStyleItem)
-            if paraStyleChange:
-                logger.debug("Change for [%s]", xmlStyleName)
-                for para_child in paragraph.childNodes:
-                    if para_child.nodeType == para_child.TEXT_NODE:
-                        if para_child.data in paraStyleChange.converted_data:
-                            para_child.data = paraStyleChange.converted_data[
-                                para_child.data]
-                            num_changes += 1
-            else:
-                logger.debug("No change for [%s]", xmlStyleName)
-            for span in paragraph.getElementsByTagName("text:span"):
-                xmlStyleName = span.getAttribute("text:style-name")
-                #logger.debug("span style name %s", xmlStyleName)
-                spanStyleItem = self.reader.stylesDict.get(
-                    xmlStyleName, paraStyleItem)
-                spanStyleChange = self.effective_styleChange(spanStyleItem)
-                if spanStyleChange:
-                    for span_child in span.childNodes:
-                        if span_child.nodeType == span_child.TEXT_NODE:
-                            if (span_child.data in
-                                    spanStyleChange.converted_data):
-                                span_child.data = (
-                                    spanStyleChange.converted_data[
-                                        span_child.data])
-                            num_changes += 1
-        logger.debug(util.funcName('end'))
+        fontName = attrs.get("style:name", "")
+        for styleChange in self.styleChanges:
+            if fontName == styleChange.styleItem.fontName:
+                num_changes += setAttribute(
+                    attrs, "style:name", styleChange.fontName)
+                num_changes += setAttribute(
+                    attrs, "svg:font-family", styleChange.fontName)
         return num_changes
 
-    def change_styles(self, contentDom, stylesDom):
-        """Change fonts and named styles."""
+    def change_text_props(self, attrs):
+        """Change fonts and sizes of a style:text-properties element.
+        Returns number of changes made.
+        """
         num_changes = 0
         #TODO: Distinguish between automatic and named styles.
-        for style in (
-                contentDom.getElementsByTagName("style:font-face") +
-                stylesDom.getElementsByTagName("style:font-face")):
-            fontName = style.getAttribute("style:name")
-            for styleChange in self.styleChanges:
-                if fontName == styleChange.styleItem.fontName:
-                    num_changes += setNodeAttribute(
-                        style, "style:name", styleChange.fontName)
-                    num_changes += setNodeAttribute(
-                        style, "svg:font-family", styleChange.fontName)
-        for style in (
-                contentDom.getElementsByTagName("style:style") +
-                stylesDom.getElementsByTagName("style:default-style")):
-            for textprop in style.getElementsByTagName(
-                    "style:text-properties"):
-                fontName = textprop.getAttribute("style:font-name")
-                for styleChange in self.styleChanges:
-                    if fontName == styleChange.styleItem.fontName:
-                        num_changes += setNodeAttribute(
-                            textprop, "style:font-name", styleChange.fontName)
-                        #num_changes += setNodeAttribute(
-                        #   style, "style:parent-style-name",
-                        #   styleChange.fontType)
-                        #fontSize = textprop.getAttribute("fo:font-size")
-                        #if fontSize and styleChange.size.isSpecified():
-                        if styleChange.size.isSpecified():
-                            num_changes += setNodeAttribute(
-                                textprop, "fo:font-size",
-                                str(styleChange.size) + "pt")
+        fontName = attrs.get("style:font-name", "")
+        for styleChange in self.styleChanges:
+            if fontName == styleChange.styleItem.fontName:
+                num_changes += setAttribute(
+                    attrs, "style:font-name", styleChange.fontName)
+                if styleChange.size.isSpecified():
+                    num_changes += setAttribute(
+                        attrs, "fo:font-size", str(styleChange.size) + "pt")
         return num_changes
 
     def effective_styleChange(self, processingStyleItem):
@@ -523,3 +642,59 @@ class OdtChanger:
                 return styleChange
         logger.debug("Did not find processingStyleItem.")
         return None
+
+
+class ChangeWriter(OdtTextHandler):
+    """Writes a copy of an XML file while it is being parsed,
+    with changes made by an OdtChanger.
+    """
+    def __init__(self, changer, outfile, styleTag, changeText):
+        """
+        :param styleTag: change text properties inside these elements
+        :param changeText: whether to change text in paragraphs and spans
+        """
+        OdtTextHandler.__init__(
+            self, changer.reader.stylesDict, changer.reader.defaultStyleItem)
+        self.changer = changer
+        self.generator = XMLGenerator(
+            outfile, encoding="utf-8", short_empty_elements=True)
+        self.styleTag = styleTag
+        self.changeText = changeText
+        self.styleDepth = 0  # number of open elements named styleTag
+        self.num_changes = 0
+
+    def startDocument(self):
+        self.generator.startDocument()
+
+    def endDocument(self):
+        self.generator.endDocument()
+
+    def startElement(self, name, attrs):
+        OdtTextHandler.startElement(self, name, attrs)
+        if name == self.styleTag:
+            self.styleDepth += 1
+        if name == "style:font-face":
+            attrs = dict(attrs)
+            self.num_changes += self.changer.change_font_face(attrs)
+        elif name == "style:text-properties" and self.styleDepth:
+            attrs = dict(attrs)
+            self.num_changes += self.changer.change_text_props(attrs)
+        self.generator.startElement(name, attrs)
+
+    def endElement(self, name):
+        OdtTextHandler.endElement(self, name)
+        if name == self.styleTag:
+            self.styleDepth -= 1
+        self.generator.endElement(name)
+
+    def processingInstruction(self, target, data):
+        self.flushText()
+        self.generator.processingInstruction(target, data)
+
+    def handleText(self, textval, styleItem):
+        if self.changeText:
+            newval = self.changer.change_text(textval, styleItem)
+            if newval is not None:
+                textval = newval
+                self.num_changes += 1
+        self.generator.characters(textval)
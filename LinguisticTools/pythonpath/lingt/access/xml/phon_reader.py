@@ -22,6 +22,7 @@ import re
 import xml.dom.minidom
 import xml.parsers.expat
 
+from lingt.access.common.example_cache import fileSignature
 from lingt.access.common.file_reader import FileReader
 from lingt.access.writer.uservars import PhonologyTags
 from lingt.access.xml import xmlutil
@@ -55,6 +56,25 @@ class PhonReader(FileReader):
     def getDuplicateRefNumbers(self):
         return self.fieldHelper.duplicate_refnums
 
+    def getCacheKey(self):
+        """Returns None if caching should not be used."""
+        if self.generateRefIDs:
+            # Generated IDs depend on what has been read previously.
+            return None
+        signature = fileSignature(self.filepath)
+        if signature is None:
+            return None
+        fieldTags = PhonologyTags(self.userVars).loadUserVars()
+        source = ('phon', signature[0])
+        details = (
+            signature,
+            self.config.phoneticWS,
+            self.config.isLexemePhonetic,
+            self.config.refNumIn,
+            self.userVars.getInt("ExperTrans_Phonemic"),
+            tuple(sorted(fieldTags.items())))
+        return source, details
+
     def _initData(self):
         """Dictionary of examples keyed by lowercase reference number.
         Values are of type lingex_structs.LingPhonExample.
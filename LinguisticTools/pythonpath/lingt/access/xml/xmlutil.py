@@ -10,6 +10,7 @@ Functions to help read XML files.
 """
 import itertools
 import logging
+import xml.etree.ElementTree as ET
 
 logger = logging.getLogger("lingt.access.xmlutil")
 
@@ -70,3 +71,66 @@ def getElementsByTagNames(parent, tag_names):
     for tag_name in tag_names:
         iterables.append(parent.getElementsByTagName(tag_name))
     return itertools.chain.from_iterable(iterables)
+
+
+def getEtreeText(elem):
+    """Like getElemText(), but for xml.etree elements.
+    Text between child elements is stored as the tail of each child.
+    """
+    rc = [elem.text or ""]
+    for child in elem:
+        rc.append(child.tail or "")
+    return "".join(rc)
+
+def getEtreeElementsByTagName(parent, tagname):
+    """Like the DOM method, this returns descendants only, unlike
+    Element.iter() which also includes the parent itself.
+    """
+    return [elem for elem in parent.iter(tagname) if elem is not parent]
+
+def getEtreeTextByTagName(parent, tagname):
+    """Like getTextByTagName(), but for xml.etree elements."""
+    for elem in parent.iter(tagname):
+        if elem is not parent:
+            return getEtreeText(elem)
+    return ""
+
+def peekDocTags(filepath):
+    """Returns the tag names of the document element and of its first child
+    element, reading only as much of the file as needed.
+    The second value is empty if the document element has no children.
+    Raises ET.ParseError or IOError.
+    """
+    docTag = ""
+    with open(filepath, 'rb') as infile:
+        for dummy_event, elem in ET.iterparse(infile, events=("start",)):
+            if docTag:
+                return docTag, elem.tag
+            docTag = elem.tag
+    return docTag, ""
+
+def iterparseTopElements(infile, tagname):
+    """Parse incrementally, yielding each complete element with the given
+    tag name that is not nested inside another element of the same name.
+    After the caller is finished with an element, it is discarded
+    so that memory use stays low even for very large files.
+    Raises ET.ParseError.
+    """
+    parents = []
+    nesting = 0
+    for event, elem in ET.iterparse(infile, events=("start", "end")):
+        if event == "start":
+            parents.append(elem)
+            if elem.tag == tagname:
+                nesting += 1
+            continue
+        parents.pop()
+        if elem.tag != tagname:
+            continue
+        nesting -= 1
+        if nesting:
+            continue
+        yield elem
+        elem.clear()
+        if parents:
+            parents[-1].remove(elem)
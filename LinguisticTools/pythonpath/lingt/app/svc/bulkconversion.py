@@ -8,6 +8,7 @@
 # 24-Jun-16 JDK  FontItemList holds FontItemGroup instead of FontItem.
 # 01-Jul-16 JDK  Samples reads from FontItemGroup instead of FontItem.
 # 15-Jul-16 JDK  Instead of fonts, use StyleItems that depend on scope type.
+# 17-Oct-26 JDK  Read and change files using doc_to_xml.readAll/changeAll.
 
 """
 Bulk Conversion will create multiple SEC call objects,
@@ -22,6 +23,7 @@ import collections
 import logging
 
 from lingt.access.sec_wrapper import ConverterSettings, SEC_wrapper
+from lingt.access.sec_wrapper import theMemo, useSavedMemo
 from lingt.access.writer import doc_to_xml
 from lingt.access.writer import uservars
 from lingt.app import exceptions
@@ -66,11 +68,13 @@ class BulkConversion:
         #progressRange.partSize = 10
         progressRange.partSize = 4
         unique_styles = UniqueStyles(self.scopeType)
-        for fileItemIndex, fileItem in enumerate(self.fileItems):
+        for fileItem in self.fileItems:
             fileItem.fileEditor = doc_to_xml.DocToXml(
                 self.unoObjs, self.msgbox, fileItem, self.outdir,
                 self.scopeType, progressRange)
-            processingStylesFound = fileItem.fileEditor.read()
+        fileEditors = [fileItem.fileEditor for fileItem in self.fileItems]
+        for fileItemIndex, processingStylesFound in enumerate(
+                doc_to_xml.readAll(fileEditors)):
             logger.debug("found %d styles", len(processingStylesFound))
             unique_styles.add(processingStylesFound)
             progressRange.update(fileItemIndex)
@@ -89,7 +93,11 @@ class BulkConversion:
         progressBar = ProgressBar(self.unoObjs, "Converting...")
         progressBar.show()
         progressBar.updateBeginning()
+        saveMemo = useSavedMemo(self.userVars, self.unoObjs)
         self.convert_vals()
+        theMemo.logStats()
+        if saveMemo:
+            theMemo.save()
         progressBar.updatePercent(25)
 
         totalChanges = 0
@@ -99,9 +107,9 @@ class BulkConversion:
         logger.debug(
             repr([change.converter.convName
                   for change in self.getStyleChanges()]))
-        for fileItem in self.fileItems:
-            numChanges = fileItem.fileEditor.makeChanges(
-                self.getStyleChanges())
+        fileEditors = [fileItem.fileEditor for fileItem in self.fileItems]
+        for numChanges in doc_to_xml.changeAll(
+                fileEditors, self.getStyleChanges()):
             if numChanges > 0:
                 totalChanges += numChanges
                 totalFilesChanged += 1
@@ -144,10 +152,12 @@ class BulkConversion:
             self.convPool.cleanup_unused()
             for styleItem in converter_styleItems[converter_settings]:
                 styleChange = styleItem.change
-                for inputText in styleItem.inputData:
-                    if inputText not in styleChange.converted_data:
-                        converted_val = sec_call.convert(inputText)
-                        styleChange.converted_data[inputText] = converted_val
+                inputTexts = [
+                    inputText for inputText in dict.fromkeys(
+                        styleItem.inputData)
+                    if inputText not in styleChange.converted_data]
+                styleChange.converted_data.update(
+                    zip(inputTexts, sec_call.convert_many(inputTexts)))
 
     def getStyleChanges(self):
         """Returns a list of all non-empty StyleChange objects for the list
@@ -24,7 +24,7 @@ This module exports:
 import logging
 from com.sun.star.uno import RuntimeException
 
-from lingt.access.sec_wrapper import SEC_wrapper
+from lingt.access.sec_wrapper import SEC_wrapper, theMemo, useSavedMemo
 from lingt.access.calc.spreadsheet_output import SpreadsheetOutput
 from lingt.access.calc.spreadsheet_reader import SpreadsheetReader
 from lingt.access.draw.shapesearch import ShapeSearch
@@ -65,6 +65,7 @@ class DataConversion:
         self.styleFonts = styleFonts
         self.msgbox = MessageBox(self.unoObjs)
         self.secCall = SEC_wrapper(self.msgbox, userVars)
+        self.saveMemo = useSavedMemo(userVars, self.unoObjs)
         self.config = None
 
     def selectConverter(self):
@@ -211,6 +212,7 @@ class DataConversion:
 
         progressBar.updateFinishing()
         progressBar.close()
+        self.finishMemo()
 
         ## Display results
 
@@ -254,6 +256,7 @@ class DataConversion:
         except exceptions.DocAccessError:
             self.msgbox.display("Error reading spreadsheet.")
             progressBar.close()
+            return
         if len(inputList) == 0:
             self.msgbox.display(
                 "Did not find anything in column %s.", sourceCol)
@@ -264,21 +267,25 @@ class DataConversion:
             progressBar.updatePercent(40)
 
         ## Convert
+        #  Numbers and empty cells are left as they are.
+        #  Repeated values are only converted once.
 
         outList = []
         problems = False
-        numDataChanges = 0
-        for inValue in inputList:
-            try:
-                outValue = self.secCall.convert(inValue)
-                outList.append(outValue)
-                if outValue != inValue:
-                    numDataChanges += 1
-            except exceptions.MessageError as exc:
-                self.msgbox.displayExc(exc)
-                problems = True
-                outList.append("")
-                break
+        uniqueStrings = [
+            inValue for inValue in dict.fromkeys(inputList)
+            if isinstance(inValue, str) and inValue]
+        try:
+            convertedValues = dict(zip(
+                uniqueStrings, self.secCall.convert_many(uniqueStrings)))
+            outList = [convertedValues.get(inValue, inValue)
+                       for inValue in inputList]
+        except exceptions.MessageError as exc:
+            self.msgbox.displayExc(exc)
+            problems = True
+        numDataChanges = sum(
+            1 for inValue, outValue in zip(inputList, outList)
+            if outValue != inValue)
 
         ## Output results
 
@@ -290,6 +297,7 @@ class DataConversion:
 
         progressBar.updateFinishing()
         progressBar.close()
+        self.finishMemo()
 
         ## Display results
 
@@ -299,6 +307,11 @@ class DataConversion:
             else:
                 self.msgbox.display("Successfully finished conversion.")
 
+    def finishMemo(self):
+        theMemo.logStats()
+        if self.saveMemo:
+            theMemo.save()
+
     def doConversions_draw(self):
         """For converting data in a Draw doc."""
         logger.debug(util.funcName('begin'))
@@ -347,6 +360,7 @@ class DataConversion:
 
         progressBar.updateFinishing()
         progressBar.close()
+        self.finishMemo()
 
         ## Display results
 
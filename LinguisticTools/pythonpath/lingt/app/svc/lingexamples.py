@@ -25,6 +25,7 @@ This module exports:
 """
 import logging
 
+from lingt.access.common.example_cache import ExampleCache
 from lingt.access.writer import outputmanager
 from lingt.access.writer import search
 from lingt.access.writer import styles
@@ -184,17 +185,10 @@ class ExRepeater:
         self.messagesDisplayed = []  # don't keep displaying for updating all
 
     def replaceAll(self):
-        startFromBeginning = True
         self.prevRefUpdated = ""
         self.repeatedCount = 0
         self.replacementsCount = 0
-        while True:
-            self.operations.doSearch(
-                self.replacingRefs, startFromBeginning, True)
-            refnumFound = self.operations.getFoundString()
-            if not refnumFound:
-                break
-            startFromBeginning = False
+        for refnumFound in self._foundRefs():
             try:
                 self.replaceAndAsk(refnumFound)
             except exceptions.UserInterrupt:
@@ -213,6 +207,27 @@ class ExRepeater:
             self.msgbox.display(
                 "Updated %d example%s.", self.replacementsCount, plural)
 
+    def _foundRefs(self):
+        """Yields each ref to replace or update, after selecting it."""
+        if self.replacingRefs:
+            # Find all ref numbers at once, and then insert examples from
+            # the end of the document backwards, so that the ranges that
+            # are still to be replaced do not move.
+            foundRanges = self.operations.findAllRefNumbers()
+            for foundRange in reversed(foundRanges):
+                yield self.operations.selectFound(foundRange)
+            return
+        # Updating moves old examples to the comparison document in order,
+        # and each update starts from where the previous one finished.
+        startFromBeginning = True
+        while True:
+            refnumFound = self.operations.doSearch(
+                self.replacingRefs, startFromBeginning, True)
+            if not refnumFound:
+                return
+            startFromBeginning = False
+            yield refnumFound
+
     def replaceAndAsk(self, refnumFound):
         if self.replacingRefs:
             self.operations.insertEx(refnumFound, True, False)
@@ -281,6 +296,14 @@ class ExOperations:
     def getFoundString(self):
         return self.search.getFoundString()
 
+    def findAllRefNumbers(self):
+        return self.search.findAllRefNumbers()
+
+    def selectFound(self, foundRange):
+        """Returns the string of the selected range."""
+        self.search.selectFound(foundRange)
+        return self.getFoundString()
+
     def readData(self, force_read=False):
         """Read examples from data files."""
         if force_read:
@@ -294,9 +317,9 @@ class ExOperations:
             else:
                 fileReader = InterlinReader(
                     self.unoObjs, self.userVars, self.settings.getInconfig())
-            self.examplesDict = fileReader.read()
-            self.suggestions = fileReader.getSuggestions()
-            self.duplicate_refnums = fileReader.getDuplicateRefNumbers()
+            cache = ExampleCache(fileReader)
+            self.examplesDict, self.suggestions, self.duplicate_refnums = (
+                cache.read())
 
     def insertEx(self, refTextRough, deleteRefNum, updatingEx):
         """Set updatingEx to True if updating the example."""
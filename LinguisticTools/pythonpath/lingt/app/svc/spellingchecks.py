@@ -44,6 +44,9 @@ logger = logging.getLogger("lingt.app.spellingchecks")
 
 DEFAULT_NORM_FORM = 'NFD'
 
+# Number of added words to hold before writing to the spreadsheet.
+DEFAULT_FLUSH_INTERVAL = 10
+
 class CheckerSettings:
     """Settings for SpellingChecker class."""
 
@@ -123,6 +126,7 @@ class SpellingChecker:
         self.msgbox = MessageBox(self.unoObjs)
         self.userVars = userVars
         self.goodList = GoodList(self.msgbox)
+        self.goodList.load_userVars(userVars)
         self.wordAsker = WordAsker(self.unoObjs, self.goodList)
         self.config = None
         self.numChanges = 0
@@ -162,8 +166,16 @@ class SpellingChecker:
         except exceptions.RangeError as exc:
             self.msgbox.displayExc(exc)
         finally:
+            self.flushGoodList()
             self.wordAsker.cleanup()
 
+    def flushGoodList(self):
+        """Write any words that were added but not yet written."""
+        try:
+            self.goodList.flush()
+        except exceptions.DocAccessError:
+            self.msgbox.display("Error writing to spreadsheet.")
+
     def changeTextRange(self, txtRange):
         rangeJumper = RangeJumper(self.unoObjs)
         rangeJumper.setTextRange(txtRange)
@@ -278,14 +290,26 @@ class GoodList:
     def __init__(self, msgbox):
         self.suggestions = SpellingSuggestions(msgbox)
         self.wordList = []
-        self.insensitiveList = []  # case insensitive (unless matchCase)
+        self.insensitiveWords = set()  # case insensitive (unless matchCase)
         self.matchCase = False
         self.normForm = DEFAULT_NORM_FORM
         self.columnLetter = ""
         self.calcUnoObjs = None
+        self.rowsWritten = 0  # number of words in the spreadsheet column
+        self.flushInterval = DEFAULT_FLUSH_INTERVAL
         # used instead of a good list if applying corrections
         self.changeDict = {}
 
+    def load_userVars(self, userVars):
+        """This hidden user variable must be set manually."""
+        varname = 'GoodListFlushInterval'
+        if userVars.isEmpty(varname):
+            self.flushInterval = DEFAULT_FLUSH_INTERVAL
+            userVars.store(varname, str(DEFAULT_FLUSH_INTERVAL))
+        else:
+            self.flushInterval = max(1, userVars.getInt(varname))
+            logger.debug("Flush interval %d", self.flushInterval)
+
     def setCalcUnoObjs(self, calcUnoObjs):
         self.calcUnoObjs = calcUnoObjs
 
@@ -295,26 +319,37 @@ class GoodList:
         self.matchCase = matchCase
         self.normForm = normForm
         self.columnLetter = columnLetter
+        self.rowsWritten = len(self.wordList)
         self.suggestions.setList(self.wordList)
-        self.loadInsensitiveList()
+        self.loadInsensitiveWords()
 
     def add(self, wordSimplified):
+        """Added words are written to the spreadsheet a few at a time.
+        Call flush() when finished to write any that remain.
+        """
         self.wordList.append(wordSimplified)
-        self.suggestions.setList(self.wordList)
-        self.loadInsensitiveList()
+        self.suggestions.addWord(wordSimplified)
+        self.insensitiveWords.add(self.firstLower(wordSimplified))
+        if len(self.wordList) - self.rowsWritten >= self.flushInterval:
+            self.flush()
+
+    def flush(self):
+        """Append words that have not yet been written below the existing
+        rows, rather than writing the whole column again.
+        """
+        newWords = self.wordList[self.rowsWritten:]
+        if not newWords:
+            return
+        logger.debug("Writing %d words.", len(newWords))
         spreadsheetOutput = SpreadsheetOutput(self.calcUnoObjs)
-        spreadsheetOutput.outputToColumn(
-            self.columnLetter, self.wordList)
+        # The first row is a heading, so data starts on the second row.
+        spreadsheetOutput.outputRows(
+            self.columnLetter, newWords, self.rowsWritten + 2)
+        self.rowsWritten = len(self.wordList)
 
-    def loadInsensitiveList(self):
-        if self.matchCase:
-            self.insensitiveList = self.wordList
-            return
-        self.insensitiveList = self.wordList[:]
-        for i, word in enumerate(self.wordList):
-            wordLower = self.firstLower(word)
-            if wordLower != word:
-                self.insensitiveList[i] = wordLower
+    def loadInsensitiveWords(self):
+        self.insensitiveWords = set(
+            self.firstLower(word) for word in self.wordList)
 
     def firstLower(self, wordText):
         """
@@ -324,11 +359,9 @@ class GoodList:
         if self.matchCase or not wordText:
             return wordText
         c = wordText[0]
-        if c in letters.CASE_CAPITALS:
+        if c in letters.LOWER_OF_CAPITAL:
             # change first letter
-            i = letters.CASE_CAPITALS.index(c)
-            wordText = letters.CASE_LOWER[i] + wordText[1:]
-            return wordText
+            wordText = letters.LOWER_OF_CAPITAL[c] + wordText[1:]
         return wordText
 
     def normalizeList(self, wordList):
@@ -337,7 +370,7 @@ class GoodList:
             for word in wordList]
 
     def __contains__(self, word):
-        return normalize(self.normForm, word) in self.insensitiveList
+        return normalize(self.normForm, word) in self.insensitiveWords
 
 
 def getContext(tokens, wordTokenNum):
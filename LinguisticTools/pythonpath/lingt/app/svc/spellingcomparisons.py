@@ -5,6 +5,7 @@
 # 23-Feb-13 JDK  Fixed several basic suggestions problems.
 # 28-Feb-13 JDK  Handle exception if Calc spreadsheet gets closed.
 # 16-Jul-15 JDK  Use constructors instead of static factory functions.
+# 17-Oct-26 JDK  Search farther for suggestions until enough are found.
 
 """
 Logic for spelling comparisons.
@@ -13,6 +14,8 @@ This module exports:
     SpellingCharClasses
     SpellingSuggestions
 """
+import bisect
+import heapq
 import logging
 import os
 from operator import itemgetter
@@ -26,8 +29,17 @@ from lingt.utils import letters
 from lingt.utils import unicode_data
 from lingt.utils import util
 
+try:
+    from rapidfuzz.distance import Levenshtein as nativeLevenshtein
+except ImportError:
+    nativeLevenshtein = None
+
 logger = logging.getLogger("lingt.app.spellingcomparisons")
 
+# Character sets in word patterns are marked with characters from
+# Supplementary Private Use Area-A.
+PATTERN_MARKER_START = 0xF0000
+
 def wordsFromStrings(stringList):
     """Create a list of WordInList objects from strings."""
     words = []
@@ -123,16 +135,9 @@ class SpellingCharClasses:
             return
         words = wordsFromStrings(wordStrings)
 
-        charSetList = []
-        for charlist in self.charsComp:
-            if len(charlist) < 2:
-                # only useful to have at least two characters to compare
-                continue
-            charset = CharSet(charlist)
-            # treat each similarity set as if it were an individual character
-            wordChar = WordChar(charset, isCharset=True)
-            charSetList.append(wordChar)
-
+        # only useful to have at least two characters to compare
+        charSetList = [
+            charlist for charlist in self.charsComp if len(charlist) >= 2]
         numSimilarWords = compareAllWords(words, charSetList)
 
         similarWordsStrings = [word.similarWords_str() for word in words]
@@ -152,46 +157,71 @@ class SpellingCharClasses:
         logger.debug(util.funcName('end'))
 
 
-def subSuperString(s1, s2):
-    """Return true if word is either a substring or a superstring.
-    Two-letter words don't count, because for example "am" is a substring
-    of "hamster" and "madam" and lots of other words.
-    """
-    if len(s1) > len(s2):
-        # swap
-        s1, s2 = s2, s1
-    if len(s1) <= 2:
-        return False
-    return s1.lower() in s2.lower()
+def levenshteinDistance(s1, s2, maxDistance=None):
+    """Returns the edit distance of two strings, ignoring case.
+    If maxDistance is given, then the calculation stops early once the
+    distance is known to be greater, and maxDistance + 1 is returned.
 
-def levenshteinDistance(s1, s2):
-    """Returns the edit distance of two strings.
-    From http://rosettacode.org/wiki/Levenshtein_distance.
+    Uses the bit-parallel algorithm of Myers (1999) as described by
+    Hyyr (2001), which handles a whole column of the dynamic programming
+    table at once.  The rapidfuzz library is used instead if available.
     """
+    s1 = s1.lower()
+    s2 = s2.lower()
     if len(s1) > len(s2):
         s1, s2 = s2, s1
-    distances = range(len(s1) + 1)
-    for index2, char2 in enumerate(s2):
-        newDistances = [index2+1]
-        for index1, char1 in enumerate(s1):
-            if char1.lower() == char2.lower():
-                newDistances.append(distances[index1])
-            else:
-                newDistances.append(
-                    1 + min((distances[index1],
-                             distances[index1+1],
-                             newDistances[-1])))
-        distances = newDistances
-    return distances[-1]
+    if maxDistance is not None and len(s2) - len(s1) > maxDistance:
+        return maxDistance + 1
+    if nativeLevenshtein is not None:
+        return nativeLevenshtein.distance(s1, s2, score_cutoff=maxDistance)
+    if not s1:
+        return len(s2)
+    ## Bit vectors of where each character occurs in s1.
+    matchMasks = {}
+    bit = 1
+    for char1 in s1:
+        matchMasks[char1] = matchMasks.get(char1, 0) | bit
+        bit <<= 1
+    allBits = bit - 1
+    lastBit = bit >> 1
+    plusVec = allBits  # vertical differences of +1
+    minusVec = 0  # vertical differences of -1
+    distance = len(s1)
+    charsLeft = len(s2)
+    for char2 in s2:
+        matches = matchMasks.get(char2, 0)
+        diagVec = matches | minusVec
+        horizVec = (((matches & plusVec) + plusVec) ^ plusVec) | matches
+        plusHoriz = minusVec | (~(horizVec | plusVec) & allBits)
+        minusHoriz = plusVec & horizVec
+        if plusHoriz & lastBit:
+            distance += 1
+        elif minusHoriz & lastBit:
+            distance -= 1
+        plusHoriz = ((plusHoriz << 1) | 1) & allBits
+        minusHoriz = (minusHoriz << 1) & allBits
+        plusVec = minusHoriz | (~(diagVec | plusHoriz) & allBits)
+        minusVec = plusHoriz & diagVec
+        charsLeft -= 1
+        # Each remaining character can lower the distance by at most one.
+        if maxDistance is not None and distance - charsLeft > maxDistance:
+            return maxDistance + 1
+    return distance
 
 class SpellingSuggestions:
     """Logic to find similar words based on edit distance."""
 
+    # Search this far at first, and then farther until enough words have
+    # been found.  Words that are as different as the length of the word
+    # to find are not suggested, unless they are sub or super strings.
+    START_EDIT_DISTANCE = 1
+
     def __init__(self, msgbox, limit=20):
         self.limit = limit
         self.msgbox = msgbox
         self.listSorted = []  # sorted by word
-        self.listByLength = []  # sorted by length
+        self.listLower = []  # lowercase of each word in listSorted
+        self.index = None  # type BKTree, built when first needed
         self.wordToFind = ""
 
     def setList(self, datalist):
@@ -203,116 +233,155 @@ class SpellingSuggestions:
             self.msgbox.display("Error reading the list.")
             self.listSorted = []
         self.listSorted.sort()
-        self.listByLength = sorted(self.listSorted, key=len)
+        self.listLower = [word.lower() for word in self.listSorted]
+        if self.index is not None:
+            # Usually only a few words have changed.
+            self.index.update(self.listSorted)
+
+    def addWord(self, word):
+        """Add one word without sorting the whole list again."""
+        if word.strip() == "":
+            return
+        pos = bisect.bisect_right(self.listSorted, word)
+        self.listSorted.insert(pos, word)
+        self.listLower.insert(pos, word.lower())
+        if self.index is not None:
+            self.index.add(word)
+
+    def getIndex(self):
+        if self.index is None:
+            logger.debug("Building index of %d words.", len(self.listSorted))
+            self.index = BKTree(levenshteinDistance)
+            self.index.update(self.listSorted)
+        return self.index
 
     def getSuggestions(self, wordToFind):
         """The main function to get similar words.
         Returns a list.
         """
         self.wordToFind = wordToFind
-
-        ## Sort list by most likely first.
-
-        rank = {}
-        self._compareBySameBeginning(rank)
-        self._compareBySimilarLength(rank)
-        rankings = [rank[word]
-                    for word in self.listSorted]
-        rankedList = sorted(zip(self.listSorted, rankings), key=itemgetter(1))
-
-        ## Check edit distance starting with most likely candidates.
-
-        superStrings, similarStrings = self._checkEditDistance(rankedList)
+        superStrings = self._findSuperStrings()
+        logger.debug("Found %d sub/super strings.", len(superStrings))
+        farthest = max(len(wordToFind) - 1, self.START_EDIT_DISTANCE)
+        maxDistance = self.START_EDIT_DISTANCE
+        while True:
+            similarStrings = self.getIndex().findClosest(
+                wordToFind, self.limit, maxDistance)
+            if len(similarStrings) >= self.limit or maxDistance >= farthest:
+                break
+            maxDistance = min(maxDistance * 2, farthest)
+        similarStrings.sort(
+            key=lambda rec: (rec[1],) + self._likeliness(rec[0]))
         suggestions = superStrings[:]
         for word, dummy in similarStrings:
             if word not in suggestions:
                 suggestions.append(word)
         return suggestions[:self.limit]
 
-    def _compareBySameBeginning(self, rank):
-        """Words with same beginning are likely to be misspellings.
-        Set rank values accordingly.
+    def _findSuperStrings(self):
+        """Words that are either a substring or a superstring.
+        Two-letter words don't count, because for example "am" is a
+        substring of "hamster" and "madam" and lots of other words.
         """
-        bestMatchingCount = 0
-        firstMatchingIndex = 0
-        lastMatchingIndex = 0
-        for list_i, wordSorted in enumerate(self.listSorted):
-            matchingCount = 0
-            for list_j, char in enumerate(self.wordToFind.lower()):
-                if (len(wordSorted) > list_j and
-                        wordSorted[list_j].lower() == char):
-                    matchingCount += 1
-                else:
-                    break
-            if matchingCount > bestMatchingCount:
-                firstMatchingIndex = list_i
-                lastMatchingIndex = list_i
-                bestMatchingCount = matchingCount
-            elif matchingCount == bestMatchingCount:
-                lastMatchingIndex = list_i
-            elif matchingCount < bestMatchingCount:
-                break
-        median_i = (firstMatchingIndex +
-                    (lastMatchingIndex - firstMatchingIndex) // 2)
-        for list_i, wordSorted in enumerate(self.listSorted):
-            rank[wordSorted] = abs(list_i - median_i)
-
-    def _compareBySimilarLength(self, rank):
-        """Words with same length are likely to be misspellings.
-        Adjust rank values accordingly.
+        findLower = self.wordToFind.lower()
+        superStrings = [
+            word for word, wordLower in zip(self.listSorted, self.listLower)
+            if (findLower in wordLower if len(findLower) <= len(wordLower)
+                else wordLower in findLower)
+            and min(len(findLower), len(wordLower)) > 2]
+        superStrings.sort(key=self._likeliness)
+        return superStrings[:self.limit // 2 + 1]
+
+    def _likeliness(self, word):
+        """Words with the same beginning or a similar length are likely to
+        be misspellings.
+        :returns: a sort key with the most likely words first
         """
-        bestDiff = 1000  # an arbitrary big number
-        firstBestIndex = 0
-        lastBestIndex = 0
-        for list_i, wordByLength in enumerate(self.listByLength):
-            diff = abs(len(self.wordToFind) - len(wordByLength))
-            if diff < bestDiff:
-                firstBestIndex = list_i
-                lastBestIndex = list_i
-                bestDiff = diff
-            elif diff == bestDiff:
-                lastBestIndex = list_i
-            elif diff > bestDiff:
+        findLower = self.wordToFind.lower()
+        wordLower = word.lower()
+        matchingCount = 0
+        for char1, char2 in zip(findLower, wordLower):
+            if char1 != char2:
                 break
-        median_i = firstBestIndex + (lastBestIndex - firstBestIndex) // 2
-        for list_i, wordByLength in enumerate(self.listByLength):
-            rank[wordByLength] += abs(list_i - median_i)
+            matchingCount += 1
+        return -matchingCount, abs(len(findLower) - len(wordLower)), word
 
-    def _checkEditDistance(self, rankedList):
-        """Check edit distance by the order of the given list.
-        Don't go through the whole list unless needed.
+
+class BKTree:
+    """Burkhard-Keller tree to quickly find words within a certain edit
+    distance, without comparing against every word in the list.
+    Each node is a tuple (word, children), where children is a dict with
+    keys of edit distance from the node's word.
+    """
+    def __init__(self, distanceFunc):
+        """:param distanceFunc: function(s1, s2, maxDistance) that may stop
+        early and return maxDistance + 1 if the distance is greater
         """
-        superStrings = []
-        for rec in rankedList:
-            wordRanked = rec[0]
-            if subSuperString(self.wordToFind, wordRanked):
-                superStrings.append(wordRanked)
-            if len(superStrings) > self.limit // 2:
-                break
-        logger.debug("Found %d sub/super strings.", len(superStrings))
-        similarStrings = []
-        FAR_ENOUGH = 1000  # There's no need to check the whole list,
-                           # since the most likely are towards the front.
-        for list_i, rec in enumerate(rankedList):
-            wordRanked = rec[0]
-            editDistance = levenshteinDistance(self.wordToFind, wordRanked)
-            isBetterMatch = False
-            similarStrings_i = 0
-            for similarStrings_i, rec2 in enumerate(similarStrings):
-                dummy, dist = rec2
-                if editDistance < dist:
-                    isBetterMatch = True
-                    break
-            if isBetterMatch:
-                similarStrings.insert(similarStrings_i,
-                                      (wordRanked, editDistance))
-                if len(similarStrings) > self.limit:
-                    similarStrings.pop()
-            elif len(similarStrings) < self.limit:
-                similarStrings.append((wordRanked, editDistance))
-            if list_i > FAR_ENOUGH:
-                break
-        return superStrings, similarStrings
+        self.distanceFunc = distanceFunc
+        self.root = None
+        self.words = set()  # words that can be found
+        self.wordsInTree = set()  # also includes removed words
+
+    def update(self, wordList):
+        """Change the tree to contain exactly the words in the list.
+        Removed words stay in the tree but are no longer found.
+        """
+        newWords = set(wordList)
+        if len(self.wordsInTree - newWords) > len(newWords):
+            logger.debug("Rebuilding tree.")
+            self.root = None
+            self.wordsInTree = set()
+        for word in wordList:
+            if word not in self.wordsInTree:
+                self.add(word)
+        self.words = newWords
+
+    def add(self, word):
+        self.words.add(word)
+        if word in self.wordsInTree:
+            return
+        self.wordsInTree.add(word)
+        if self.root is None:
+            self.root = (word, {})
+            return
+        nodeWord, children = self.root
+        while True:
+            distance = self.distanceFunc(word, nodeWord)
+            if distance not in children:
+                children[distance] = (word, {})
+                return
+            nodeWord, children = children[distance]
+
+    def findClosest(self, wordToFind, limit, maxDistance):
+        """Find the closest words no farther than maxDistance.
+        The search distance shrinks once enough words have been found.
+        :returns: list of (word, distance), at least limit in size if
+                  possible; there may be more if some are equally close.
+        """
+        if self.root is None:
+            return []
+        found = []
+        bestDistances = []  # negative values as a heap of the closest
+        radius = maxDistance
+        nodesToCheck = [self.root]
+        while nodesToCheck:
+            nodeWord, children = nodesToCheck.pop()
+            # Beyond this distance, none of the children could be close
+            # enough, so the exact distance is not needed.
+            distanceNeeded = radius + max(children, default=0)
+            distance = self.distanceFunc(
+                wordToFind, nodeWord, distanceNeeded)
+            if distance <= radius and nodeWord in self.words:
+                found.append((nodeWord, distance))
+                heapq.heappush(bestDistances, -distance)
+                if len(bestDistances) > limit:
+                    heapq.heappop(bestDistances)
+                if len(bestDistances) == limit:
+                    radius = -bestDistances[0]
+            for childDistance, child in children.items():
+                if abs(childDistance - distance) <= radius:
+                    nodesToCheck.append(child)
+        return [rec for rec in found if rec[1] <= radius]
 
 
 def compareAllWords(wordList, charSetList):
@@ -324,94 +393,53 @@ def compareAllWords(wordList, charSetList):
     """
     wordPatternHash, wordPatterns = getPatterns(wordList, charSetList)
     numSimilarWords = 0
-    for word in wordList:
-        if word in wordPatterns:
-            for pattern in wordPatterns[word]:
-                hashKey = pattern.getHashKey()
-                for similarWord in wordPatternHash[hashKey]:
-                    if similarWord.text != word.text:
-                        word.similarWords.append(similarWord.text)
-                        numSimilarWords += 1
+    for word, patterns in zip(wordList, wordPatterns):
+        for pattern in patterns:
+            for similarWord in wordPatternHash[pattern]:
+                if similarWord.text != word.text:
+                    word.similarWords.append(similarWord.text)
+                    numSimilarWords += 1
     return numSimilarWords
 
 def getPatterns(wordList, charSetList):
-    """Reduce each word to its basic pattern by merging similar characters."""
-    wordPatternHash = dict()  # keys are patterns, values are list of
-                              # WordInList.  This lets us quickly
-                              # match up identical patterns.
-    wordPatterns = dict()  # keys are words, values are patterns.
-                           # This is to remember what
-                           # the patterns for that word were.
+    """Reduce each word to its basic patterns by merging similar characters.
+    Each pattern is the text of the word with one occurrence of a
+    character set member replaced by a marker character for that set.
+
+    :returns: a dict whose keys are patterns and values are lists of
+        WordInList, which lets us quickly match up identical patterns,
+        and a list of the patterns for each word in wordList
+    """
+    charTable = getCharTable(charSetList)
+    wordPatternHash = dict()
+    wordPatterns = []
     for word in wordList:
-        for word_i in range(len(word.text)):
-            for charsetWordChar in charSetList:
-                for char2 in charsetWordChar.val.charList:
-                    list_j = word_i + len(char2)
-                    if word.text[word_i:list_j] == char2:
-                        newPattern = WordPattern(word.text)
-                        newPattern.replace(word_i, list_j, charsetWordChar)
-                        if word not in wordPatterns:
-                            wordPatterns[word] = list()
-                        wordPatterns[word].append(newPattern)
-                        hashKey = newPattern.getHashKey()
-                        if hashKey not in wordPatternHash:
-                            wordPatternHash[hashKey] = list()
-                        wordPatternHash[hashKey].append(word)
+        text = word.text
+        patterns = []
+        for word_i, char in enumerate(text):
+            if char not in charTable:
+                continue
+            for member, marker in charTable[char]:
+                list_j = word_i + len(member)
+                if len(member) == 1 or text.startswith(member, word_i):
+                    pattern = text[:word_i] + marker + text[list_j:]
+                    patterns.append(pattern)
+                    wordPatternHash.setdefault(pattern, []).append(word)
+        wordPatterns.append(patterns)
     return wordPatternHash, wordPatterns
 
-class WordPattern:
-    """The pattern rather than the actual text of the word."""
-
-    def __init__(self, text):
-        self.charList = [WordChar(char) for char in text]
-
-    def replace(self, list_i, list_j, newWordChar):
-        if list_j == list_i + 1:
-            self.charList[list_i] = newWordChar
-        else:
-            self.charList = (
-                self.charList[:list_i] + newWordChar + self.charList[list_j:])
-
-    def getHashKey(self):
-        """
-        Returns a value that can be used as a dictionary key, and will be
-        unique if and only if the WordChar list it contains is unique.
-        """
-        return "".join(wordChar.getHashKey() for wordChar in self.charList)
-
-
-
-class WordChar:
-    """Either a character in a string, or a CharSet in place of the
-    character.
+def getCharTable(charSetList):
+    """Returns a dict to look up the character sets that may start with a
+    given character.
+    Keys are the first character of a member of a set, and values are
+    lists of (member, marker) tuples.
+    Markers are Unicode private use characters, one for each set, so they
+    cannot be confused with characters in the words.
     """
-    LITERAL = 0
-    CHARSET = 1
-
-    def __init__(self, newVal, isCharset=False):
-        if isCharset:
-            self.charType = self.CHARSET
-        else:
-            self.charType = self.LITERAL
-        self.val = newVal
-
-    def getHashKey(self):
-        """TESTME: What happens if there is a literal value "1" or "2"?  Does
-        it overwrite the charset with that ID?
-        """
-        if self.charType == self.CHARSET:
-            return str(self.val.charsetID)
-        elif self.charType == self.LITERAL:
-            return self.val
-        return "0"
-
-
-class CharSet:
-    """Uniquely label a character list."""
-
-    instanceCount = 0
-
-    def __init__(self, newCharList):
-        self.charList = newCharList
-        CharSet.instanceCount += 1
-        self.charsetID = CharSet.instanceCount  # unique ID
+    charTable = dict()
+    for setIndex, charlist in enumerate(charSetList):
+        marker = chr(PATTERN_MARKER_START + setIndex)
+        for member in charlist:
+            if member:
+                charTable.setdefault(member[0], []).append((member, marker))
+    return charTable
@@ -8,12 +8,14 @@
 # 18-Feb-16 JDK  Add getFontType().
 # 22-Feb-16 JDK  Add Blocks class.  Move SCRIPT_LETTERS to its own module.
 # 23-Feb-16 JDK  Fixed bug: Constants list did not compile when assimilated.
+# 17-Oct-26 JDK  Look up font types with bisect.  Add splitByFontType().
 
 """
 Information about Unicode characters, scripts and fonts.
 Part of this file is generated by scripts in build/generating_code,
 as described below.
 """
+import bisect
 import string
 from lingt.utils import unicode_data
 
@@ -329,6 +331,9 @@ CASE_LOWER = [
     u"\uA737", u"\uA739", u"\uA73D", u"\uA74F", u"\uA761", u"\uA769",
     u"\uA76B", u"\uA76D", u"\uA76F", u"\uA78C"]
 
+# For quickly finding the lowercase equivalent of a capital letter.
+LOWER_OF_CAPITAL = dict(zip(CASE_CAPITALS, CASE_LOWER))
+
 
 # Blocks are either Standard ("Western"), Complex Text Layout (CTL),
 # or Chinese/Japanese/Korean (CJK also known as "Asian").
@@ -344,18 +349,37 @@ def getFontType(c, adjacentCharType=None):
     :param c: the character to check
     :param adjacentCharType: type of surrounding characters
 
-    Note: Looking up all strings in a document might be slow,
-    but it is O(n) running time, so hopefully it shouldn't take too long.
+    The block is found with a binary search of FONT_TYPE_STARTS.
     """
     if c.isspace() or c.isdigit() or c in string.punctuation:
         if adjacentCharType:
             return adjacentCharType
         else:
             return TYPE_INDETERMINATE
-    for startChar, endChar, fontType in FONT_TYPE_BLOCKS:
-        if startChar < c < endChar:
-            return fontType
-    return TYPE_STANDARD
+    return FONT_TYPE_VALUES[bisect.bisect(FONT_TYPE_STARTS, ord(c)) - 1]
+
+def splitByFontType(textval):
+    """Split text into runs of characters that have the same font type.
+    Returns a list of tuples (text of one type, font type).
+
+    Characters such as spaces and punctuation belong to the run before them,
+    or at the beginning of the text, to the first run.
+    The type is TYPE_INDETERMINATE only if there are no other characters.
+    """
+    runs = []
+    runStart = 0
+    runType = TYPE_INDETERMINATE
+    for charIndex, c in enumerate(textval):
+        fontType = getFontType(c)
+        if fontType == TYPE_INDETERMINATE or fontType == runType:
+            continue
+        if runType != TYPE_INDETERMINATE:
+            runs.append((textval[runStart:charIndex], runType))
+            runStart = charIndex
+        runType = fontType
+    if textval:
+        runs.append((textval[runStart:], runType))
+    return runs
 
 # These code points are manually derived from the Unicode database file
 # Blocks.txt, and the types are a best guess.
@@ -521,3 +545,23 @@ FONT_TYPE_BLOCKS = [
     (u"\uFF00", u"\uFFEF", TYPE_STANDARD), # Halfwidth and Fullwidth Forms
     (u"\uFFF0", u"\uFFFF", TYPE_STANDARD), # Specials
     ]
+
+def makeFontTypeTable():
+    """Returns two lists for looking up font types with bisect:
+    the code points where each range of FONT_TYPE_BLOCKS begins and ends,
+    and the font type for each range.
+    As with the original comparisons, the first and last code point of
+    each block are not considered part of the block.
+    """
+    starts = [0]
+    values = [TYPE_STANDARD]
+    for startChar, endChar, fontType in FONT_TYPE_BLOCKS:
+        if ord(endChar) - ord(startChar) < 2:
+            continue
+        starts.append(ord(startChar) + 1)
+        values.append(fontType)
+        starts.append(ord(endChar))
+        values.append(TYPE_STANDARD)
+    return starts, values
+
+FONT_TYPE_STARTS, FONT_TYPE_VALUES = makeFontTypeTable()
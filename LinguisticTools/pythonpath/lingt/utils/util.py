@@ -27,6 +27,7 @@
 # 28-Jul-18 JDK  Uno objects for Draw.
 # 20-Sep-19 JDK  Added natural_sort().
 # 18-Nov-19 JDK  Fixed compile error: Variables were not declared for linux.
+# 17-Oct-26 JDK  Added getUserFolder().
 
 """
 This module is used by most LingTools modules:
@@ -41,6 +42,8 @@ be configured as needed.
 This module exports:
     UnoObjs - Manage UNO context and document objects.
     createProp() - Creates an UNO property.
+    getUserFolder() - Folder in the user profile for files kept by LingTools.
+    isOwnedByUser() - Whether only the current user can write to a path.
     uniqueList() - Return a list with duplicates removed and order preserved.
 
     funcName() - Returns name of calling function.
@@ -56,9 +59,11 @@ import logging
 import os
 import platform
 import re
+import stat
 import uno
 
 from com.sun.star.beans import PropertyValue
+from com.sun.star.container import NoSuchElementException
 from com.sun.star.lang import IllegalArgumentException
 from com.sun.star.uno import RuntimeException
 
@@ -109,6 +114,7 @@ def setupLogging():
     #    configLogger.setLevel(logging.WARN)
 
 setupLogging()
+logger = logging.getLogger("lingt.utils.util")
 
 
 class UnoObjs:
@@ -237,6 +243,44 @@ def createProp(name, value):
     return prop
 
 
+def getUserFolder(unoObjs, folderName):
+    """Returns the path of a folder in the LibreOffice user profile,
+    creating it if needed.  Unlike the shared temporary folder, other users
+    cannot put files there.
+    Returns None if the folder cannot be used.
+    """
+    try:
+        pathSubst = unoObjs.smgr.createInstanceWithContext(
+            "com.sun.star.util.PathSubstitution", unoObjs.ctx)
+        userUrl = pathSubst.substituteVariables("$(user)", True)
+        folder = os.path.join(uno.fileUrlToSystemPath(userUrl), folderName)
+        os.makedirs(folder, mode=0o700, exist_ok=True)
+    except (RuntimeException, NoSuchElementException, OSError) as exc:
+        logger.warning(
+            "Could not use user folder %s: %s", folderName, exc)
+        return None
+    if not isOwnedByUser(folder):
+        logger.warning(
+            "Folder is not owned by the current user: %s", folder)
+        return None
+    return folder
+
+
+def isOwnedByUser(path):
+    """Returns False if the path is owned by another user or if others
+    can write to it.
+    """
+    if not hasattr(os, 'getuid'):
+        # Windows, where files in the user profile are private.
+        return os.path.exists(path)
+    try:
+        pathStat = os.stat(path)
+    except OSError:
+        return False
+    return (pathStat.st_uid == os.getuid() and
+            not pathStat.st_mode & (stat.S_IWGRP | stat.S_IWOTH))
+
+
 def uniqueList(seq):
     """Return a list with duplicates removed and order preserved.
     Taken from http://www.peterbe.com/plog/uniqifiers-benchmark
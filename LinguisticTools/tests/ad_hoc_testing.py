@@ -61,6 +61,43 @@ def timeGoRight():
     time2 = time.time()
     msgbox.display("Elapsed time: %2.1f seconds" % (time2 - time1))
     
+def timeLevenshtein():
+    """Compare against the full-table algorithm that was used before."""
+    from lingt.app.svc.spellingcomparisons import levenshteinDistance
+
+    def fullTableDistance(s1, s2):
+        s1 = s1.lower()
+        s2 = s2.lower()
+        prevRow = list(range(len(s2) + 1))
+        for i, c1 in enumerate(s1):
+            curRow = [i + 1]
+            for j, c2 in enumerate(s2):
+                curRow.append(min(
+                    prevRow[j + 1] + 1, curRow[j] + 1,
+                    prevRow[j] + (c1 != c2)))
+            prevRow = curRow
+        return prevRow[-1]
+
+    words = ["jumped", "hamster", "receive", "Saturday", "apparently",
+             "kitten", "sitting", "doorknob", "believe", "separate"]
+    pairs = [(w1, w2) for w1 in words for w2 in words]
+    REPS = 500
+    time1 = time.time()
+    for rep in range(0, REPS):
+        for w1, w2 in pairs:
+            fullTableDistance(w1, w2)
+    time2 = time.time()
+    msgbox.display("Full table: %2.2f seconds" % (time2 - time1))
+    for maxDistance in (None, 2):
+        time1 = time.time()
+        for rep in range(0, REPS):
+            for w1, w2 in pairs:
+                levenshteinDistance(w1, w2, maxDistance)
+        time2 = time.time()
+        msgbox.display(
+            "Bit-parallel, max distance %s: %2.2f seconds" %
+            (maxDistance, time2 - time1))
+
 def testChangingRanges():
     oVC = unoObjs.viewcursor
     textCursor = unoObjs.text.createTextCursorByRange(oVC.getStart())
@@ -0,0 +1,201 @@
+# -*- coding: Latin-1 -*-
+#
+# This file created Oct 17 2026
+
+"""
+Read and change several .odt files with readAll() and changeAll(),
+both in this process and using worker results.
+"""
+import concurrent.futures
+import logging
+import os
+import shutil
+import unittest
+from unittest import mock
+import zipfile
+
+from lingttest.utils import testutil
+from lingttest.access.odt_converter_test import getStyleChanges, REPLACED_VAL
+
+from lingt.access.common import workers
+from lingt.access.writer import doc_to_xml
+from lingt.app.data.bulkconv_structs import ScopeType
+from lingt.app.svc.bulkconversion import UniqueStyles
+from lingt.utils import util
+
+logger = logging.getLogger("lingttest.doc_to_xml_test")
+
+NUM_FILES = doc_to_xml.PARALLEL_MIN_FILES
+
+
+def getSuite():
+    suite = unittest.TestSuite()
+    for method_name in (
+            'test1_readAll',
+            'test2_changeAll',
+            'test3_workerFailed',
+            'test4_noWorkers',
+            'test5_workerProcesses',
+        ):
+        suite.addTest(DocToXmlTestCase(method_name))
+    return suite
+
+
+class DocToXmlTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.unoObjs = testutil.unoObjsForCurrentDoc()
+        self.outdir = testutil.output_path("doc_to_xml")
+        if os.path.exists(self.outdir):
+            shutil.rmtree(self.outdir)
+        os.makedirs(self.outdir)
+        srcdir = os.path.join(util.TESTDATA_FOLDER, "all_scope_types")
+        self.filepaths = []
+        for fileNum in range(NUM_FILES):
+            filepath = os.path.join(self.outdir, "file%d.odt" % fileNum)
+            with zipfile.ZipFile(filepath, 'w') as zipper:
+                zipper.writestr(
+                    "mimetype", "application/vnd.oasis.opendocument.text")
+                for filename in doc_to_xml.XML_FILENAMES:
+                    zipper.write(
+                        os.path.join(srcdir, filename), filename,
+                        zipfile.ZIP_DEFLATED)
+            self.filepaths.append(filepath)
+
+    def _fileEditors(self):
+        return [
+            doc_to_xml.DocToXml(
+                self.unoObjs, None, FileConfig(filepath), self.outdir,
+                ScopeType.WHOLE_DOC, ProgressRange())
+            for filepath in self.filepaths]
+
+    def _readAndChange(self, fileEditors):
+        """Returns the number of changes and the number of replaced values
+        found in each resulting file.
+        """
+        uniqueStyles = UniqueStyles(ScopeType.WHOLE_DOC)
+        for data in doc_to_xml.readAll(fileEditors):
+            uniqueStyles.add(data)
+        styleChanges = getStyleChanges(
+            uniqueStyles.get_values(), "Whole Document")
+        changeCounts = list(doc_to_xml.changeAll(fileEditors, styleChanges))
+        replacedCounts = []
+        for filepath in self.filepaths:
+            basename, extension = os.path.splitext(filepath)
+            with zipfile.ZipFile(basename + "_001" + extension) as zipper:
+                content = zipper.read("content.xml").decode("utf-8")
+            replacedCounts.append(content.count(REPLACED_VAL))
+        return changeCounts, replacedCounts
+
+    def _serialResults(self):
+        with mock.patch.object(
+                doc_to_xml, 'canUseWorkers', return_value=False):
+            results = self._readAndChange(self._fileEditors())
+        for filepath in self.filepaths:
+            basename, extension = os.path.splitext(filepath)
+            os.remove(basename + "_001" + extension)
+        return results
+
+    def test1_readAll(self):
+        fileEditors = self._fileEditors()
+        with mock.patch.object(
+                doc_to_xml, 'canUseWorkers', return_value=False):
+            serialData = [
+                [str(item) for item in data]
+                for data in doc_to_xml.readAll(fileEditors)]
+        self.assertEqual(len(serialData), NUM_FILES)
+        self.assertGreater(len(serialData[0]), 0)
+        with mock.patch.object(
+                doc_to_xml, 'canUseWorkers', return_value=True), \
+                mock.patch.object(
+                    workers, 'startWorkers', side_effect=startInProcess):
+            workerData = [
+                [str(item) for item in data]
+                for data in doc_to_xml.readAll(self._fileEditors())]
+        self.assertEqual(workerData, serialData)
+
+    def test2_changeAll(self):
+        serialResults = self._serialResults()
+        changeCounts, replacedCounts = serialResults
+        self.assertEqual(len(changeCounts), NUM_FILES)
+        self.assertGreater(changeCounts[0], 0)
+        self.assertGreater(replacedCounts[0], 0)
+        with mock.patch.object(
+                doc_to_xml, 'canUseWorkers', return_value=True), \
+                mock.patch.object(
+                    workers, 'startWorkers', side_effect=startInProcess):
+            workerResults = self._readAndChange(self._fileEditors())
+        self.assertEqual(workerResults, serialResults)
+
+    def test3_workerFailed(self):
+        """Files that fail in a worker should be done in this process."""
+        serialResults = self._serialResults()
+        with mock.patch.object(
+                doc_to_xml, 'canUseWorkers', return_value=True), \
+                mock.patch.object(
+                    workers, 'startWorkers', side_effect=startFailing):
+            workerResults = self._readAndChange(self._fileEditors())
+        self.assertEqual(workerResults, serialResults)
+
+    def test4_noWorkers(self):
+        """If workers could not be started, do everything in this process.
+        """
+        serialResults = self._serialResults()
+        with mock.patch.object(
+                doc_to_xml, 'canUseWorkers', return_value=True), \
+                mock.patch.object(
+                    workers, 'startWorkers', return_value=None):
+            workerResults = self._readAndChange(self._fileEditors())
+        self.assertEqual(workerResults, serialResults)
+
+    def test5_workerProcesses(self):
+        """Use actual worker processes if there is an interpreter."""
+        if workers.pythonInterpreter() is None:
+            self.skipTest("No python interpreter for worker processes.")
+        serialResults = self._serialResults()
+        with mock.patch.object(
+                doc_to_xml, 'canUseWorkers', return_value=True):
+            workerResults = self._readAndChange(self._fileEditors())
+        self.assertEqual(workerResults, serialResults)
+
+
+def startInProcess(func, argsList, initializer=None, initargs=()):
+    """Same interface as workers.startWorkers(), but calls func in this
+    process, so that it works even without a python interpreter.
+    """
+    if initializer:
+        initializer(*initargs)
+    futures = []
+    for args in argsList:
+        future = concurrent.futures.Future()
+        future.set_result(func(*args))
+        futures.append(future)
+    return futures
+
+
+def startFailing(dummy_func, argsList, **dummy_kwargs):
+    """Every other worker raises an exception."""
+    futures = []
+    for argNum in range(len(argsList)):
+        future = concurrent.futures.Future()
+        if argNum % 2 == 0:
+            future.set_exception(RuntimeError("Worker failed"))
+        else:
+            future.set_result(None)
+        futures.append(future)
+    return futures
+
+
+class FileConfig:
+    """Has the attribute of fileitemlist.BulkFileItem that DocToXml uses."""
+    def __init__(self, filepath):
+        self.filepath = filepath
+
+
+class ProgressRange:
+    def updatePart(self, dummy_partNum):
+        pass
+
+
+if __name__ == '__main__':
+    testutil.run_suite(getSuite())
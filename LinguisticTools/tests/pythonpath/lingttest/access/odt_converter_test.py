@@ -28,6 +28,7 @@ REPLACED_VAL = "__REPLACED_VAL__"
 def getSuite():
     suite = unittest.TestSuite()
     suite.addTest(BulkReaderTestCase('testReader'))
+    suite.addTest(BulkReaderTestCase('testReadMemory'))
     suite.addTest(BulkWriterTestCase('testWriter'))
     return suite
 
@@ -56,6 +57,25 @@ class BulkReaderTestCase(unittest.TestCase):
                 len(processingStylesFound), num_expected,
                 msg=ScopeType.TO_STRING[scopeType])
 
+    def testReadMemory(self):
+        xmlFiles = {}
+        for filename in ("content.xml", "styles.xml"):
+            with open(os.path.join(self.srcdir, filename), 'rb') as infile:
+                xmlFiles[filename] = infile.read()
+        scopeType = ScopeType.WHOLE_DOC
+        reader = odt_converter.OdtReader(
+            None, scopeType, self.unoObjs, xmlFiles)
+        self.assertEqual(
+            len(reader.read()), len(self.read_files(scopeType)))
+        unique_styles = UniqueStyles(scopeType)
+        unique_styles.add(reader.data)
+        styleChanges = getStyleChanges(
+            unique_styles.get_values(), "Whole Document")
+        changer = odt_converter.OdtChanger(reader, styleChanges)
+        self.assertGreater(changer.makeChanges(), 0)
+        self.assertIn(
+            REPLACED_VAL.encode("utf-8"), xmlFiles["content.xml"])
+
 
 class BulkWriterTestCase(unittest.TestCase):
 
@@ -18,6 +18,7 @@ import unittest
 
 from lingttest.utils import testutil
 
+from lingt.access.writer import search
 from lingt.access.writer.doc_reader import DocReader
 from lingt.access.writer.textsearch import TextSearch
 from lingt.app.data import fileitemlist
@@ -32,6 +33,8 @@ def getSuite():
     for method_name in (
             'test1_selection',
             'test2_wholeDoc',
+            'test3_countWords',
+            'test4_formattedSections',
         ):
         suite.addTest(SearchTestCase(method_name))
     return suite
@@ -71,6 +74,35 @@ class SearchTestCase(unittest.TestCase):
         self.assertEqual(len(self.textSearch.getRanges()), 20)
         #self.displayRanges()  # uncomment for debugging
 
+    def test3_countWords(self):
+        """Counts should match a findAll() for each string."""
+        searchStrings = [
+            "a", "the", "table", "frame", "nested", "TEXT", "cell", "xyz"]
+        counter = search.WholeWordCounter(searchStrings)
+        for parString in search.documentStrings(self.unoObjs):
+            counter.countIn(parString)
+        for searchString, count in zip(searchStrings, counter.getCounts()):
+            searchDesc = self.unoObjs.document.createSearchDescriptor()
+            searchDesc.SearchString = searchString
+            searchDesc.SearchCaseSensitive = False
+            searchDesc.SearchWords = True
+            selectionsFound = self.unoObjs.document.findAll(searchDesc)
+            self.assertEqual(
+                count, selectionsFound.getCount(), msg=searchString)
+
+    def test4_formattedSections(self):
+        """Bulk-read formatting should match the text portion properties."""
+        self.textSearch = TextSearch(self.unoObjs, self.progressBar)
+        sections = self.textSearch.docEnum.formattedSections()
+        self.assertGreater(len(sections), 0)
+        for section in sections:
+            textPortion = section.textRange
+            self.assertEqual(
+                section.charStyleName, textPortion.CharStyleName)
+            self.assertEqual(
+                section.fontNameComplex, textPortion.CharFontNameComplex)
+            self.assertIn(textPortion.CharLocale.Language, section.languages)
+
     def displayRanges(self):
         """Show where each range is located in the document.
         Do not use for automated testing because it will add more ranges,
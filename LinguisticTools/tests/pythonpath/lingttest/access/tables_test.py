@@ -12,6 +12,7 @@ from lingttest.utils.testutil import PARAGRAPH_BREAK
 
 from lingt.access.writer import styles
 from lingt.access.writer import tables
+from lingt.access.writer import textwidth
 from lingt.access.writer.uservars import UserVars
 from lingt.app.data import lingex_structs
 
@@ -21,7 +22,9 @@ def getSuite():
     suite = unittest.TestSuite()
     for method_name in (
             'test1_testOuterTable',
-            'test2_testHasWrappingText'):
+            'test2_testHasWrappingText',
+            'test3_wordLayout',
+            'test4_textWidths'):
         suite.addTest(TablesTestCase(method_name))
     return suite
 
@@ -101,6 +104,46 @@ class TablesTestCase(unittest.TestCase):
         oCell.insertString(oCellCursor, "a" * 500, False)
         self.assertTrue(self.tableHasWrappingText(oTable))
 
+    def test3_wordLayout(self):
+        self.config.showWordLine1 = True
+        self.config.showWordLine2 = False
+        self.config.showMorphLine1 = True
+        self.config.showMorphLine2 = False
+        self.config.showPartOfSpeech = True
+        self.config.POS_aboveGloss = True
+        word = lingex_structs.LingGramWord()
+        word.text1 = "dogs"
+        for text1, gloss, pos in (("dog", "dog", "n"), ("-s", "PL", "sfx")):
+            morph = lingex_structs.LingGramMorph()
+            morph.text1 = text1
+            morph.gloss = gloss
+            morph.pos = pos
+            word.morphList.append(morph)
+        layout = tables.WordLayout(word, self.config)
+        self.assertEqual(layout.wordStrings, ["dogs"])
+        self.assertEqual(
+            layout.morphStrings, [["dog", "n", "dog"], ["-s", "sfx", "PL"]])
+        self.assertEqual(layout.numMorphs(), 2)
+        self.assertEqual(tables.wordRowKeys(self.config), ['word1'])
+        self.assertEqual(
+            tables.morphRowKeys(self.config), ['morph1', 'pos', 'gloss'])
+
+        self.config.showPartOfSpeech = False
+        layout = tables.WordLayout(
+            lingex_structs.LingGramWord(), self.config)
+        self.assertEqual(layout.morphStrings, [["", ""]])
+
+    def test4_textWidths(self):
+        textWidths = textwidth.TextWidths(self.unoObjs, self.styles)
+        shortWidth = textWidths.getWidth('numP', "a" * 5)
+        longWidth = textWidths.getWidth('numP', "a" * 50)
+        self.assertGreater(shortWidth, 0)
+        self.assertAlmostEqual(longWidth / shortWidth, 10, delta=1)
+        self.assertEqual(textWidths.getWidth('numP', ""), 0)
+        pageWidth = textwidth.pageTextWidth(
+            self.unoObjs, self.unoObjs.text.createTextCursor())
+        self.assertGreater(pageWidth, longWidth)
+
     def tableHasWrappingText(self, oTable):
         return tables.hasWrappingText(oTable, self.unoObjs, self.styles)
 
@@ -21,7 +21,8 @@ def getSuite():
     for method_name in (
             'testWriter',
             'testCalc',
-            'testDraw'):
+            'testDraw',
+            'testSharedValues'):
         suite.addTest(UserVarsTestCase(method_name))
     return suite
 
@@ -76,6 +77,25 @@ class UserVarsTestCase(unittest.TestCase):
         result = userVars.get("TestVar_3")
         self.assertEqual(result, "")
 
+    def testSharedValues(self):
+        testutil.blankWriterDoc()
+        self.unoObjs = testutil.unoObjsForCurrentDoc()
+        USERVAR_PREFIX = "Test_"
+        userVars1 = UserVars(USERVAR_PREFIX, self.unoObjs.document, logger)
+        userVars2 = UserVars(USERVAR_PREFIX, self.unoObjs.document, logger)
+        userVars1.store("TestVar_1", "15")
+        self.assertEqual(userVars2.getInt("TestVar_1"), 15)
+        userVars2.store("TestVar_1", "")
+        self.assertTrue(userVars1.isEmpty("TestVar_1"))
+
+        # changed outside of UserVars
+        userVars1.userProps.setPropertyValue("Test_TestVar_1", "manual")
+        userVars3 = UserVars(USERVAR_PREFIX, self.unoObjs.document, logger)
+        self.assertEqual(userVars3.get("TestVar_1"), "manual")
+        self.assertEqual(userVars1.get("TestVar_1"), "manual")
+        self.assertTrue(userVars3.delete("TestVar_1"))
+        self.assertFalse(userVars1.delete("TestVar_1"))
+
     def tearDown(self):
         self.unoObjs.document.close(True)
         testutil.blankWriterDoc()
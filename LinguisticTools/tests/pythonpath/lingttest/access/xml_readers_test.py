@@ -7,12 +7,16 @@
 # 09-Dec-15 JDK  Use .lower() instead of str.lower() for python 2.
 # 01-Mar-17 JDK  Word Line 1 and 2 instead of Orthographic and Text.
 
+import json
 import os
 import logging
+import shutil
+import tempfile
 import unittest
 
 from lingttest.utils import testutil
 
+from lingt.access.common.example_cache import ExampleCache
 from lingt.access.xml import interlin_reader
 from lingt.access.xml import phon_reader
 from lingt.access.writer.uservars import UserVars
@@ -35,6 +39,12 @@ def getSuite():
             'testFw',
             'testFlexText'):
         suite.addTest(GramTestCase(method_name))
+    for method_name in (
+            'testCacheReused',
+            'testCacheInvalidated',
+            'testCacheCorrupt',
+            'testCacheWarnings'):
+        suite.addTest(CacheTestCase(method_name))
     for method_name in (
             'testPhonFieldHelper',
             'testMergedMorphemes'):
@@ -153,7 +163,7 @@ class GramTestCase(unittest.TestCase):
             self.unoObjs, self.userVars, config)
         exampleDict = xmlReader.read()
         self.assertEqual(
-            xmlReader.get_filetype(filepath, xmlReader.dom), "toolbox")
+            xmlReader.get_filetype(filepath), "toolbox")
 
         self.assertTrue("Hunt06".lower() in exampleDict)
         gramEx = exampleDict["Hunt06".lower()]
@@ -229,7 +239,7 @@ class GramTestCase(unittest.TestCase):
             self.unoObjs, self.userVars, config)
         exampleDict = xmlReader.read()
         self.assertEqual(
-            xmlReader.get_filetype(filepath, xmlReader.dom), "fieldworks")
+            xmlReader.get_filetype(filepath), "fieldworks")
 
         self.assertTrue("Prefix-1.1".lower() in exampleDict)
         self.assertTrue(not "Prefix-1".lower() in exampleDict)
@@ -270,7 +280,7 @@ class GramTestCase(unittest.TestCase):
             self.unoObjs, self.userVars, config)
         exampleDict = xmlReader.read()
         self.assertEqual(
-            xmlReader.get_filetype(filepath, xmlReader.dom), "fieldworks")
+            xmlReader.get_filetype(filepath), "fieldworks")
 
         self.assertTrue("ABC 1.1".lower() in exampleDict)
         self.assertTrue("ABC 1.2".lower() in exampleDict)
@@ -294,6 +304,80 @@ class GramTestCase(unittest.TestCase):
         self.assertEqual(morph2.text2, "")
 
 
+class CacheTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.unoObjs = testutil.unoObjsForCurrentDoc()
+        USERVAR_PREFIX = "LTp_"  # LinguisticTools Phonology variables
+        self.userVars = UserVars(
+            USERVAR_PREFIX, self.unoObjs.document, logger)
+        self.tempDir = tempfile.mkdtemp()
+        self.cacheDir = os.path.join(self.tempDir, "cache")
+        self.filepath = os.path.join(self.tempDir, "TbxPhonCorpus.xml")
+        shutil.copy(
+            os.path.join(util.TESTDATA_FOLDER, "TbxPhonCorpus.xml"),
+            self.filepath)
+
+    def tearDown(self):
+        shutil.rmtree(self.tempDir, ignore_errors=True)
+
+    def _makeCache(self):
+        config = lingex_structs.PhonInputSettings(None)
+        config.filepath = self.filepath
+        config.phoneticWS = ""
+        config.isLexemePhonetic = False
+        xmlReader = phon_reader.PhonReader(
+            self.unoObjs, self.userVars, config)
+        return ExampleCache(xmlReader, self.cacheDir)
+
+    def testCacheReused(self):
+        exampleDict, suggestions, dummy_dups = self._makeCache().read()
+        self.assertTrue("JPDN21.5".lower() in exampleDict)
+        cache = self._makeCache()
+        self.assertTrue(os.path.exists(cache.getCacheFilepath()))
+
+        def readNotExpected():
+            self.fail("File should not be parsed again.")
+        cache.fileReader.read = readNotExpected
+        cachedDict, cachedSuggestions, dummy_dups = cache.read()
+        self.assertEqual(len(cachedDict), len(exampleDict))
+        phonEx = cachedDict["JPDN21.5".lower()]
+        self.assertEqual(phonEx.gloss, "elder sister")
+        self.assertEqual(cachedSuggestions, suggestions)
+
+    def testCacheInvalidated(self):
+        exampleDict, dummy_sugg, dummy_dups = self._makeCache().read()
+        self.assertTrue("JPDN21.5".lower() in exampleDict)
+        with open(self.filepath, 'r', encoding='utf-8') as infile:
+            contents = infile.read()
+        with open(self.filepath, 'w', encoding='utf-8') as outfile:
+            outfile.write(contents.replace("JPDN21.5", "JPDN21.5x"))
+        exampleDict, dummy_sugg, dummy_dups = self._makeCache().read()
+        self.assertTrue("JPDN21.5x".lower() in exampleDict)
+        self.assertTrue("JPDN21.5".lower() not in exampleDict)
+
+    def testCacheCorrupt(self):
+        cache = self._makeCache()
+        cache.read()
+        with open(cache.getCacheFilepath(), 'wb') as outfile:
+            outfile.write(b"not a cache file")
+        exampleDict, dummy_sugg, dummy_dups = self._makeCache().read()
+        self.assertTrue("JPDN21.5".lower() in exampleDict)
+
+    def testCacheWarnings(self):
+        warning = ("Could not find any words in '%s'.", ("wordGroup",))
+        cache = self._makeCache()
+        cache.fileReader.getWarnings = lambda: [warning]
+        cache.read()
+        with open(cache.getCacheFilepath(), 'r', encoding='utf-8') as infile:
+            self.assertIn("examples", json.load(infile))
+        shownWarnings = []
+        cache = self._makeCache()
+        cache.fileReader.showWarnings = shownWarnings.extend
+        cache.read()
+        self.assertEqual(shownWarnings, [warning])
+
+
 class TestHelpersTestCase(unittest.TestCase):
 
     def testPhonFieldHelper(self):
@@ -14,14 +14,18 @@ Tests ConvPool and Samples.  Also tests BulkConversion.convert_vals().
 """
 from __future__ import unicode_literals
 import logging
+import os
 import platform
+import tempfile
 import unittest
 
 from lingttest.utils import testutil
 from lingttest.topdown import dataconv_test
 
+from lingt.access.sec_wrapper import ConversionMemo
 from lingt.access.sec_wrapper import ConverterSettings
 from lingt.access.sec_wrapper import SEC_wrapper
+from lingt.access.sec_wrapper import theMemo
 from lingt.access.writer.uservars import UserVars
 from lingt.app.svc.bulkconversion import ConvPool
 from lingt.ui.common.messagebox import MessageBox
@@ -37,6 +41,10 @@ def getSuite():
     for method_name in (
             'test1_single',
             'test2_double',
+            'test3_many',
+            'test4_memo',
+            'test5_batching',
+            'test6_mappingChanged',
         ):
         suite.addTest(ConvPoolTestCase(method_name))
     return suite
@@ -149,6 +157,112 @@ class ConvPoolTestCase(unittest.TestCase):
         self.assertEqual(sec_call1.convert("f"), "F")
         self.assertEqual(sec_call2.convert("G"), "g")
 
+    def test3_many(self):
+        """Test converting a list of strings at once."""
+        self.addConverter(CONV_NAME)
+        convPool = ConvPool(self.userVars, self.msgbox)
+        conv_settings = ConverterSettings(self.userVars)
+        conv_settings.convName = CONV_NAME
+        conv_settings.forward = True
+        SelectSettingsCache.converter = conv_settings
+        dummy_fontChange = convPool.selectConverter(conv_settings)
+        sec_call = convPool[CONV_NAME]
+        inputList = ["abCde", "", "f", "line1\nline2", "g" * 20000]
+        convertedList = sec_call.convert_many(inputList)
+        self.assertEqual(
+            convertedList,
+            ["ABCDE", "", "F", "LINE1\nLINE2", "G" * 20000])
+        self.assertEqual(sec_call.convert_many([]), [])
+
+    def test4_memo(self):
+        """Test that repeated strings are only converted once."""
+        self.addConverter(CONV_NAME)
+        convPool = ConvPool(self.userVars, self.msgbox)
+        conv_settings = ConverterSettings(self.userVars)
+        conv_settings.convName = CONV_NAME
+        conv_settings.forward = True
+        sec_call = convPool.loadConverter(conv_settings)
+        theMemo.clear()
+        self.assertEqual(sec_call.convert("abc"), "ABC")
+        self.assertEqual((theMemo.hits, theMemo.misses), (0, 1))
+        self.assertEqual(sec_call.convert("abc"), "ABC")
+        self.assertEqual((theMemo.hits, theMemo.misses), (1, 1))
+        self.assertEqual(
+            sec_call.convert_many(["abc", "de", "abc", "de"]),
+            ["ABC", "DE", "ABC", "DE"])
+        self.assertEqual((theMemo.hits, theMemo.misses), (2, 2))
+
+        conv_settings = ConverterSettings(self.userVars)
+        conv_settings.convName = CONV_NAME
+        conv_settings.forward = False
+        sec_call = convPool.loadConverter(conv_settings)
+        self.assertEqual(sec_call.convert("ABC"), "abc")
+        self.assertEqual((theMemo.hits, theMemo.misses), (2, 3))
+
+    def test5_batching(self):
+        """Strings should only be converted together if that gives the
+        same results as converting them separately.
+        """
+        self.addConverter(CONV_NAME)
+        convPool = ConvPool(self.userVars, self.msgbox)
+        conv_settings = ConverterSettings(self.userVars)
+        conv_settings.convName = CONV_NAME
+        sec_call = convPool.loadConverter(conv_settings)
+        inputList = ["ab", "cd", "ef"]
+        for convertFunc, expectedList, expectedCanBatch in (
+                (str.upper, ["AB", "CD", "EF"], True),
+                # Looks across line breaks.
+                (str.capitalize, ["Ab", "Cd", "Ef"], False),
+            ):
+            theMemo.clear()
+            sec_call.setConverter()
+            calls = []
+            def fakeConvertString(dummy_c_convName, sInput):
+                calls.append(sInput)
+                return convertFunc(sInput)
+            sec_call._convertString = fakeConvertString
+            self.assertEqual(sec_call.convert_many(inputList), expectedList)
+            self.assertEqual(sec_call.canBatch, expectedCanBatch)
+            theMemo.clear()
+            del calls[:]
+            self.assertEqual(sec_call.convert_many(inputList), expectedList)
+            self.assertEqual(
+                len(calls), 1 if expectedCanBatch else len(inputList))
+        del sec_call._convertString
+
+    def test6_mappingChanged(self):
+        """Results should not be reused after the mapping changes,
+        and should only be saved if the mapping can be identified.
+        """
+        self.addConverter(CONV_NAME)
+        convPool = ConvPool(self.userVars, self.msgbox)
+        conv_settings = ConverterSettings(self.userVars)
+        conv_settings.convName = CONV_NAME
+        sec_call = convPool.loadConverter(conv_settings)
+        theMemo.clear()
+        sec_call.mappingSignature = ("capsTest.tec", 100, 1)
+        self.assertEqual(sec_call.convert("abc"), "ABC")
+        self.assertEqual(sec_call.convert("abc"), "ABC")
+        self.assertEqual((theMemo.hits, theMemo.misses), (1, 1))
+        sec_call.mappingSignature = ("capsTest.tec", 100, 2)
+        self.assertEqual(sec_call.convert("abc"), "ABC")
+        self.assertEqual((theMemo.hits, theMemo.misses), (1, 2))
+        sec_call.mappingSignature = None
+        self.assertEqual(sec_call.convert("de"), "DE")
+
+        with tempfile.TemporaryDirectory() as folder:
+            savedMemo = ConversionMemo()
+            savedMemo.load(os.path.join(folder, "memo.json"))
+            savedMemo.results = theMemo.results
+            savedMemo.save()
+            loadedMemo = ConversionMemo()
+            loadedMemo.load(os.path.join(folder, "memo.json"))
+        self.assertEqual(len(loadedMemo.results), 2)
+        sec_call.mappingSignature = ("capsTest.tec", 100, 2)
+        self.assertEqual(loadedMemo.get(sec_call.memoKey(), "abc"), "ABC")
+        sec_call.mappingSignature = None
+        self.assertIsNone(loadedMemo.get(sec_call.memoKey(), "de"))
+
     def addConverter(self, convName):
         dataconv_test.addConverter(
             convName, self.msgbox, self.userVars)
@@ -0,0 +1,133 @@
+# -*- coding: Latin-1 -*-
+#
+# This file created Oct 17 2026
+
+"""
+Test finding spelling suggestions from a word list.
+"""
+import logging
+import unittest
+
+from lingttest.utils import testutil
+
+from lingt.app.svc.spellingcomparisons import BKTree
+from lingt.app.svc.spellingcomparisons import SpellingSuggestions
+from lingt.app.svc.spellingcomparisons import compareAllWords
+from lingt.app.svc.spellingcomparisons import wordsFromStrings
+from lingt.app.svc.spellingcomparisons import levenshteinDistance
+
+logger = logging.getLogger("lingttest.spellingcomparisons_test")
+
+
+def getSuite():
+    suite = unittest.TestSuite()
+    for method_name in (
+            'testSuggestions',
+            'testChangedList',
+            'testAddWord',
+            'testTree',
+            'testDistance',
+            'testSimilarWords',
+        ):
+        suite.addTest(SpellingComparisonsTestCase(method_name))
+    return suite
+
+
+class SpellingComparisonsTestCase(unittest.TestCase):
+
+    WORDS = [
+        "jump", "jumped", "jumper", "bump", "lump", "dog", "dot", "dig",
+        "hamster", "ham", "am", "running", "cunning", "Apple"]
+
+    def testSuggestions(self):
+        suggestions = SpellingSuggestions(None)
+        suggestions.setList(self.WORDS)
+        results = suggestions.getSuggestions("jumpd")
+        self.assertEqual(results[:3], ["jump", "jumped", "jumper"])
+        self.assertIn("bump", results)
+        self.assertNotIn("dog", results)
+        results = suggestions.getSuggestions("dpt")
+        self.assertEqual(results[0], "dot")
+        self.assertNotIn("hamster", results)
+        results = suggestions.getSuggestions("hamsters")
+        self.assertEqual(results[:2], ["hamster", "ham"])
+        results = suggestions.getSuggestions("apple")
+        self.assertEqual(results[0], "Apple")
+        # Farther than the first search distance.
+        results = suggestions.getSuggestions("lmuped")
+        self.assertEqual(results[0], "jumped")
+        self.assertEqual(suggestions.getSuggestions("xyzzyx"), [])
+
+    def testChangedList(self):
+        suggestions = SpellingSuggestions(None)
+        suggestions.setList(self.WORDS)
+        self.assertIn("cunning", suggestions.getSuggestions("runing"))
+        suggestions.setList(self.WORDS[:-2] + ["", "gunning"])
+        results = suggestions.getSuggestions("runing")
+        self.assertNotIn("cunning", results)
+        self.assertIn("gunning", results)
+
+    def testAddWord(self):
+        suggestions = SpellingSuggestions(None)
+        suggestions.setList(self.WORDS)
+        self.assertNotIn("gunning", suggestions.getSuggestions("runing"))
+        suggestions.addWord("gunning")
+        suggestions.addWord(" ")
+        self.assertEqual(
+            suggestions.listSorted, sorted(self.WORDS + ["gunning"]))
+        self.assertEqual(
+            suggestions.listLower,
+            [word.lower() for word in suggestions.listSorted])
+        self.assertIn("gunning", suggestions.getSuggestions("runing"))
+
+    def testTree(self):
+        tree = BKTree(levenshteinDistance)
+        tree.update(self.WORDS)
+        closest = tree.findClosest("lumpy", limit=2, maxDistance=3)
+        self.assertEqual(sorted(closest), [("bump", 2), ("jump", 2),
+                                           ("lump", 1)])
+        self.assertEqual(tree.findClosest("xyzzyx", 5, maxDistance=2), [])
+        tree.update(["dog"])
+        self.assertEqual(tree.findClosest("dot", 5, maxDistance=3),
+                         [("dog", 1)])
+
+    def testDistance(self):
+        for s1, s2, distanceExpected in (
+                ("", "", 0),
+                ("", "abc", 3),
+                ("kitten", "sitting", 3),
+                ("Saturday", "sunday", 3),
+                ("recieve", "receive", 2),
+                ("abc", "ABC", 0),
+                ("flaw", "lawn", 2),
+                ("gumbo", "gambol", 2),
+                ("a" * 70 + "b", "a" * 70 + "c", 1),
+            ):
+            self.assertEqual(
+                levenshteinDistance(s1, s2), distanceExpected, (s1, s2))
+            self.assertEqual(
+                levenshteinDistance(s2, s1), distanceExpected, (s2, s1))
+            for maxDistance in range(4):
+                self.assertEqual(
+                    levenshteinDistance(s1, s2, maxDistance),
+                    min(distanceExpected, maxDistance + 1),
+                    (s1, s2, maxDistance))
+
+    def testSimilarWords(self):
+        words = wordsFromStrings(
+            ["bad", "pad", "pat", "bat", "abba", "aba", "dog", "2ad", "bad"])
+        charSetList = [["b", "p"], ["d", "t"], ["b", "bb"]]
+        numSimilarWords = compareAllWords(words, charSetList)
+        similarWords = {word.text: word.similarWords for word in words}
+        self.assertEqual(similarWords["bad"], ["pad", "bat"])
+        self.assertEqual(similarWords["pad"], ["bad", "bad", "pat"])
+        self.assertEqual(similarWords["pat"], ["bat", "pad"])
+        self.assertEqual(similarWords["abba"], ["aba"])
+        self.assertEqual(similarWords["aba"], ["abba"])
+        self.assertEqual(similarWords["dog"], [])
+        self.assertEqual(similarWords["2ad"], [])
+        self.assertEqual(numSimilarWords, 14)
+
+
+if __name__ == '__main__':
+    testutil.run_suite(getSuite())
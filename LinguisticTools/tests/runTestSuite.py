@@ -8,6 +8,7 @@
 # 15-Sep-15 JDK  Output file encoded for unicode.
 # 28-Sep-15 JDK  Load tests from modules rather than classes.
 # 23-May-16 JDK  Added functions to run individual modules.
+# 17-Oct-26 JDK  Added doc_to_xml_test.
 
 """
 This file runs a suite of automated tests all together.
@@ -24,6 +25,7 @@ import uno
 
 from lingttest.utils import testutil
 
+from lingttest.access import doc_to_xml_test
 from lingttest.access import ex_updater_test
 from lingttest.access import search_test
 from lingttest.access import tables_test
@@ -32,6 +34,7 @@ from lingttest.access import uservars_test
 from lingttest.access import xml_readers_test
 from lingttest.app import fileitemlist_test
 from lingttest.app import spellingchecks_test
+from lingttest.app import spellingcomparisons_test
 from lingttest.app import convpool_test
 from lingttest.app import visual_test_grammar
 from lingttest.app import visual_test_phonology
@@ -52,6 +55,7 @@ def get_master_suite():
     masterSuite = unittest.TestSuite()
     for module in (
             ex_updater_test,
+            doc_to_xml_test,
             tables_test,
             search_test,
             textchanges_test,
@@ -60,6 +64,7 @@ def get_master_suite():
 
             fileitemlist_test,
             spellingchecks_test,
+            spellingcomparisons_test,
             convpool_test,
 
             messagebox_test,
@@ -140,6 +145,9 @@ def run_module_suite(module):
     run_to_outfile(module.getSuite())
 
 
+def run_doc_to_xml_test():
+    run_module_suite(doc_to_xml_test)
+
 def run_ex_updater_test():
     run_module_suite(ex_updater_test)
 
@@ -164,6 +172,9 @@ def run_fileitemlist_test():
 def run_spellingchecks_test():
     run_module_suite(spellingchecks_test)
 
+def run_spellingcomparisons_test():
+    run_module_suite(spellingcomparisons_test)
+
 def run_convpool_test():
     run_module_suite(convpool_test)
 
@@ -204,6 +215,7 @@ def run_wordlistfile_test():
 # Functions that can be called from Tools -> Macros -> Run Macro.
 g_exportedScripts = (
     aaa_run_all_tests,
+    run_doc_to_xml_test,
     run_ex_updater_test,
     run_search_test,
     run_tables_test,
@@ -212,6 +224,7 @@ g_exportedScripts = (
     run_xml_readers_test,
     run_fileitemlist_test,
     run_spellingchecks_test,
+    run_spellingcomparisons_test,
     run_convpool_test,
     run_visual_test_grammar,
     run_visual_test_phonology,